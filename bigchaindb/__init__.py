@@ -13,12 +13,15 @@ config = {
         'bind': os.environ.get('BIGCHAINDB_SERVER_BIND') or 'localhost:9984',
         'workers': None,  # if none, the value will be cpu_count * 2 + 1
         'threads': None,  # if none, the value will be cpu_count * 2 + 1
+        # the maximum number of transactions of a batch posted to the API
+        'max_batch_size': 1000,
     },
     'database': {
         'backend': os.environ.get('BIGCHAINDB_DATABASE_BACKEND', 'rethinkdb'),
         'host': os.environ.get('BIGCHAINDB_DATABASE_HOST', 'localhost'),
         'port': int(os.environ.get('BIGCHAINDB_DATABASE_PORT', 28015)),
         'name': 'bigchain',
+        'transactions_table': False,
     },
     'keypair': {
         'public': None,
@@ -30,7 +33,21 @@ config = {
         'port': 8125,
         'rate': 0.01,
     },
-    'backlog_reassign_delay': 120
+    'backlog_reassign_delay': 120,
+    'block_validation_processes': 0,
+    'block': {
+        'max_transactions': 1000,
+        'max_bytes': 10 * 2**20,
+        'timeout': 1.0,
+        'target_latency': 0.0,
+        'batch_size': 1,
+        'batch_timeout': 0.05,
+        'committed_txids_capacity': 10 ** 7,
+    },
+    'vote': {
+        'batch_size': 1,
+        'batch_timeout': 0.05,
+    },
 }
 
 # We need to maintain a backup copy of the original config dict in case
@@ -1,5 +1,6 @@
 """Changefeed interfaces for backends."""
 
+import time
 from functools import singledispatch
 
 from multipipes import Node
@@ -18,13 +19,20 @@ class ChangeFeed(Node):
     is volatile. This class is a helper to create changefeeds. Moreover,
     it provides a way to specify a ``prefeed`` of iterable data to output
     before the actual changefeed.
+
+    A changefeed can also output its data in batches: lists of
+    ``batch_size`` elements, or of the elements received within
+    ``batch_timeout`` seconds, whichever comes first. This saves the
+    pickling of one message per element between the processes of a
+    pipeline.
     """
 
     INSERT = 1
     DELETE = 2
     UPDATE = 4
 
-    def __init__(self, table, operation, *, prefeed=None, connection=None):
+    def __init__(self, table, operation, *, prefeed=None, connection=None,
+                 batch_size=None, batch_timeout=None):
         """Create a new ChangeFeed.
 
         Args:
@@ -38,6 +46,10 @@ class ChangeFeed(Node):
             connection (:class:`~bigchaindb.backend.connection.Connection`, optional):  # noqa
                 A connection to the database. If no connection is provided a
                 default connection will be created.
+            batch_size (int, optional): the maximum number of elements of a
+                batch. If not provided, the elements are output one by one.
+            batch_timeout (float, optional): the maximum number of seconds
+                the first element of a batch waits for the next ones.
         """
 
         super().__init__(name='changefeed')
@@ -49,6 +61,10 @@ class ChangeFeed(Node):
         else:
             self.connection = bigchaindb.backend.connect(
                 **bigchaindb.config['database'])
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.batch = []
+        self.batch_started = None
 
     def run_forever(self):
         """Main loop of the ``multipipes.Node``
@@ -59,6 +75,39 @@ class ChangeFeed(Node):
         """
         raise NotImplementedError
 
+    def emit(self, element):
+        """Output an element to the outqueue, or add it to the current batch.
+
+        The batch is output if it is full or if its time window elapsed.
+
+        Args:
+            element: the element to output.
+        """
+        if not self.batch_size:
+            self.outqueue.put(element)
+            return
+
+        if not self.batch:
+            self.batch_started = time.time()
+        self.batch.append(element)
+        if len(self.batch) >= self.batch_size or self.batch_wait() == 0:
+            self.flush()
+
+    def flush(self):
+        """Output the current batch, if any."""
+        if self.batch:
+            self.outqueue.put(self.batch)
+            self.batch = []
+
+    def batch_wait(self):
+        """Return the number of seconds left before the current batch has to
+        be output, or ``None`` if there is no pending batch or no time
+        window."""
+        if not self.batch or self.batch_timeout is None:
+            return None
+        elapsed = time.time() - self.batch_started
+        return max(0, self.batch_timeout - elapsed)
+
     def run_changefeed(self):
         """Backend specific method to run the changefeed.
 
@@ -67,13 +116,14 @@ class ChangeFeed(Node):
         results.
 
         This method should also filter each result based on the ``operation``
-        and put all matching results on the outqueue of ``multipipes.Node``.
+        and :meth:`emit` all matching results.
         """
         raise NotImplementedError
 
 
 @singledispatch
-def get_changefeed(connection, table, operation, *, prefeed=None):
+def get_changefeed(connection, table, operation, *, prefeed=None,
+                   batch_size=None, batch_timeout=None):
     """Return a ChangeFeed.
 
     Args:
@@ -86,5 +136,9 @@ def get_changefeed(connection, table, operation, *, prefeed=None):
             (e.g. ``ChangeFeed.INSERT | ChangeFeed.UPDATE``)
         prefeed (iterable): whatever set of data you want to be published
             first.
+        batch_size (int): the maximum number of elements of a batch, if the
+            data has to be published in batches.
+        batch_timeout (float): the maximum number of seconds the first
+            element of a batch waits for the next ones.
     """
     raise NotImplementedError
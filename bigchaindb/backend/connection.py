@@ -14,7 +14,8 @@ BACKENDS = {
 logger = logging.getLogger(__name__)
 
 
-def connect(backend=None, host=None, port=None, name=None):
+def connect(backend=None, host=None, port=None, name=None,
+            transactions_table=None):
     """Create a new connection to the database backend.
 
     All arguments default to the current configuration's values if not
@@ -25,6 +26,9 @@ def connect(backend=None, host=None, port=None, name=None):
         host (str): the host to connect to.
         port (int): the port to connect to.
         name (str): the name of the database to use.
+        transactions_table (bool): whether the transactions of the blocks
+            are also stored in, and looked up from, the ``transactions``
+            table.
 
     Returns:
         An instance of :class:`~bigchaindb.backend.connection.Connection`
@@ -39,6 +43,8 @@ def connect(backend=None, host=None, port=None, name=None):
     host = host or bigchaindb.config['database']['host']
     port = port or bigchaindb.config['database']['port']
     dbname = name or bigchaindb.config['database']['name']
+    if transactions_table is None:
+        transactions_table = bigchaindb.config['database']['transactions_table']
 
     try:
         module_name, _, class_name = BACKENDS[backend].rpartition('.')
@@ -50,7 +56,9 @@ def connect(backend=None, host=None, port=None, name=None):
         raise ConfigurationError('Error loading backend `{}`'.format(backend)) from exc
 
     logger.debug('Connection: {}'.format(Class))
-    return Class(host, port, dbname)
+    connection = Class(host, port, dbname)
+    connection.transactions_table = transactions_table
+    return connection
 
 
 class Connection:
@@ -58,8 +66,17 @@ class Connection:
 
     All backend implementations should provide a connection class that
     from and implements this class.
+
+    Attributes:
+        transactions_table (bool): whether :func:`~.query.write_block`
+            also writes each transaction of a block, along with the id and
+            the voters of the block, to the ``transactions`` table, and the
+            transaction lookups read single documents from it instead of
+            going through the transactions of whole blocks.
     """
 
+    transactions_table = False
+
     def __init__(self, host=None, port=None, dbname=None, *args, **kwargs):
         """Create a new :class:`~.Connection` instance.
 
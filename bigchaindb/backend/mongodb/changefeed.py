@@ -23,11 +23,13 @@ class MongoDBChangeFeed(ChangeFeed):
 
     def run_forever(self):
         for element in self.prefeed:
-            self.outqueue.put(element)
+            self.emit(element)
+        self.flush()
 
         while True:
             try:
                 self.run_changefeed()
+                self.flush()
                 break
             except (errors.ConnectionFailure, errors.OperationFailure,
                     errors.AutoReconnect,
@@ -52,11 +54,16 @@ class MongoDBChangeFeed(ChangeFeed):
             {'ns': namespace, 'ts': {'$gt': last_ts}},
             cursor_type=pymongo.CursorType.TAILABLE_AWAIT
         )
+        if self.batch_size and self.batch_timeout is not None:
+            # return from the await in time to output the pending batch
+            cursor.max_await_time_ms(max(1, int(self.batch_timeout * 1000)))
 
         while cursor.alive:
             try:
                 record = cursor.next()
             except StopIteration:
+                # no new record for a while, the pending batch won't grow
+                self.flush()
                 continue
 
             is_insert = record['op'] == 'i'
@@ -69,10 +76,10 @@ class MongoDBChangeFeed(ChangeFeed):
             # See https://github.com/bigchaindb/bigchaindb/issues/992
             if is_insert and (self.operation & ChangeFeed.INSERT):
                 record['o'].pop('_id', None)
-                self.outqueue.put(record['o'])
+                self.emit(record['o'])
             elif is_delete and (self.operation & ChangeFeed.DELETE):
                 # on delete it only returns the id of the document
-                self.outqueue.put(record['o'])
+                self.emit(record['o'])
             elif is_update and (self.operation & ChangeFeed.UPDATE):
                 # the oplog entry for updates only returns the update
                 # operations to apply to the document and not the
@@ -82,11 +89,12 @@ class MongoDBChangeFeed(ChangeFeed):
                     {'_id': record['o2']},
                     {'_id': False}
                 )
-                self.outqueue.put(doc)
+                self.emit(doc)
 
 
 @register_changefeed(MongoDBConnection)
-def get_changefeed(connection, table, operation, *, prefeed=None):
+def get_changefeed(connection, table, operation, *, prefeed=None,
+                   batch_size=None, batch_timeout=None):
     """Return a MongoDB changefeed.
 
     Returns:
@@ -95,4 +103,5 @@ def get_changefeed(connection, table, operation, *, prefeed=None):
     """
 
     return MongoDBChangeFeed(table, operation, prefeed=prefeed,
-                             connection=connection)
+                             connection=connection, batch_size=batch_size,
+                             batch_timeout=batch_timeout)
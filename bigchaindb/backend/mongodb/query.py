@@ -1,19 +1,23 @@
 """Query implementation for MongoDB"""
 
+from collections import OrderedDict
 from time import time
 from itertools import chain
 
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 from pymongo import errors
 
 from bigchaindb import backend
 from bigchaindb.common.exceptions import CyclicBlockchainError
 from bigchaindb.backend.utils import module_dispatch_registrar
 from bigchaindb.backend.mongodb.connection import MongoDBConnection
+from bigchaindb.backend.mongodb.schema import OUTPUT_PUBLIC_KEY_FIELDS
 
 
 register_query = module_dispatch_registrar(backend.query)
 
+DUPLICATE_KEY_ERROR = 11000
+
 
 @register_query(MongoDBConnection)
 def write_transaction(conn, signed_transaction):
@@ -23,6 +27,20 @@ def write_transaction(conn, signed_transaction):
         return
 
 
+@register_query(MongoDBConnection)
+def write_transactions(conn, signed_transactions):
+    try:
+        return conn.db['backlog'].insert_many(signed_transactions,
+                                              ordered=False)
+    except errors.BulkWriteError as exc:
+        # the other transactions were inserted regardless of the ones
+        # already in the backlog
+        if any(error['code'] != DUPLICATE_KEY_ERROR
+               for error in exc.details['writeErrors']):
+            raise
+        return exc.details
+
+
 @register_query(MongoDBConnection)
 def update_transaction(conn, transaction_id, doc):
     # with mongodb we need to add update operators to the doc
@@ -47,6 +65,12 @@ def get_stale_transactions(conn, reassign_delay):
 
 @register_query(MongoDBConnection)
 def get_transaction_from_block(conn, transaction_id, block_id):
+    if conn.transactions_table:
+        doc = conn.db['transactions']\
+                  .find_one({'id': transaction_id, 'blocks.id': block_id},
+                            projection={'_id': False, 'transaction': True})
+        return doc['transaction'] if doc else None
+
     try:
         return conn.db['bigchain'].aggregate([
             {'$match': {'id': block_id}},
@@ -76,8 +100,38 @@ def get_transaction_from_backlog(conn, transaction_id):
                                      'assignment_timestamp': False})
 
 
+@register_query(MongoDBConnection)
+def get_transactions_from_backlog(conn, transaction_ids):
+    return conn.db['backlog']\
+               .find({'id': {'$in': list(transaction_ids)}},
+                     projection={'_id': False, 'assignee': False,
+                                 'assignment_timestamp': False})
+
+
+@register_query(MongoDBConnection)
+def get_transactions(conn, transaction_ids):
+    if conn.transactions_table:
+        # the transaction id is the key of the documents
+        return _transactions_of_blocks(
+            conn, {'id': {'$in': list(transaction_ids)}})
+
+    return _transactions_of_blocks(
+        conn, {'block.transactions.id': {'$in': list(transaction_ids)}})
+
+
 @register_query(MongoDBConnection)
 def get_blocks_status_from_transaction(conn, transaction_id):
+    if conn.transactions_table:
+        return conn.db['transactions'].aggregate([
+            {'$match': {'id': transaction_id}},
+            {'$unwind': '$blocks'},
+            {'$project': {
+                '_id': False,
+                'id': '$blocks.id',
+                'block.voters': '$blocks.voters',
+            }}
+        ])
+
     return conn.db['bigchain']\
             .find({'block.transactions.id': transaction_id},
                   projection=['id', 'block.voters'])
@@ -85,6 +139,15 @@ def get_blocks_status_from_transaction(conn, transaction_id):
 
 @register_query(MongoDBConnection)
 def get_txids_by_asset_id(conn, asset_id):
+    if conn.transactions_table:
+        # the create transaction has the id of the asset, the transfer
+        # transactions link to it
+        cursor = conn.db['transactions'].find(
+            {'$or': [{'id': asset_id, 'transaction.operation': 'CREATE'},
+                     {'transaction.asset.id': asset_id}]},
+            projection=['id'])
+        return (elem['id'] for elem in cursor)
+
     # get the txid of the create transaction for asset_id
     cursor = conn.db['bigchain'].aggregate([
         {'$match': {
@@ -116,8 +179,96 @@ def get_txids_by_asset_id(conn, asset_id):
     return chain(create_tx_txids, transfer_tx_ids)
 
 
+@register_query(MongoDBConnection)
+def get_transactions_by_asset_id(conn, asset_id, after=None, limit=None):
+    if conn.transactions_table:
+        collection = 'transactions'
+        pipeline = [
+            {'$match': _of_asset(asset_id, after, 'id', 'transaction.asset.id')},
+            {'$project': {'_id': '$id', 'transaction': True, 'blocks': True}},
+        ]
+    else:
+        # the blocks containing the create transaction, or transfers of the
+        # asset, are selected through the indexes, then the transactions are
+        # grouped by id along with the blocks containing them. The `after`
+        # cursor is applied before the grouping, so that a page doesn't go
+        # through the whole history of the asset.
+        collection = 'bigchain'
+        if after:
+            # the create transaction is always on the first page
+            blocks_of_asset = {'block.transactions.asset.id': asset_id}
+        else:
+            blocks_of_asset = _of_asset(asset_id, None,
+                                        'block.transactions.id',
+                                        'block.transactions.asset.id')
+        pipeline = [
+            {'$match': blocks_of_asset},
+            {'$unwind': '$block.transactions'},
+            {'$match': _of_asset(asset_id, after, 'block.transactions.id',
+                                 'block.transactions.asset.id')},
+            {'$group': {
+                '_id': '$block.transactions.id',
+                'transaction': {'$first': '$block.transactions'},
+                'blocks': {'$push': {'id': '$id', 'voters': '$block.voters'}},
+            }},
+        ]
+
+    # the create transaction comes first, then the transfers by id
+    pipeline.append({'$project': {
+        'transaction': True,
+        'blocks': True,
+        'transfer': {'$ne': ['$_id', asset_id]},
+    }})
+    pipeline.append({'$sort': OrderedDict([('transfer', ASCENDING),
+                                           ('_id', ASCENDING)])})
+    if limit:
+        pipeline.append({'$limit': limit})
+    pipeline.append({'$project': {
+        '_id': False,
+        'id': '$_id',
+        'transaction': True,
+        'blocks': True,
+    }})
+    return conn.db[collection].aggregate(pipeline)
+
+
+def _of_asset(asset_id, after, id_field, asset_id_field):
+    # the condition on the transactions of an asset following the `after`
+    # cursor: the create transaction is always on the first page, then the
+    # transfers come by id
+    if not after:
+        return {'$or': [{id_field: asset_id}, {asset_id_field: asset_id}]}
+    if after == asset_id:
+        return {asset_id_field: asset_id}
+    return {asset_id_field: asset_id, id_field: {'$gt': after}}
+
+
+@register_query(MongoDBConnection)
+def get_txids_in_blocks(conn, txids=None):
+    if conn.transactions_table:
+        condition = {} if txids is None else {'id': {'$in': list(txids)}}
+        cursor = conn.db['transactions'].find(condition, projection=['id'])
+        return (elem['id'] for elem in cursor)
+
+    condition = ({} if txids is None else
+                 {'block.transactions.id': {'$in': list(txids)}})
+    cursor = conn.db['bigchain'].find(condition,
+                                      projection=['block.transactions.id'])
+    txids = set(txids) if txids is not None else None
+    # the blocks containing one of the transactions also contain others
+    return (tx['id'] for elem in cursor
+            for tx in elem['block']['transactions']
+            if txids is None or tx['id'] in txids)
+
+
 @register_query(MongoDBConnection)
 def get_asset_by_id(conn, asset_id):
+    if conn.transactions_table:
+        cursor = conn.db['transactions'].find(
+            {'id': asset_id, 'transaction.operation': 'CREATE'},
+            projection={'_id': False, 'transaction.asset': True})
+        return (elem['transaction'] for elem in cursor)
+
     cursor = conn.db['bigchain'].aggregate([
         {'$match': {
             'block.transactions.id': asset_id,
@@ -137,31 +288,78 @@ def get_asset_by_id(conn, asset_id):
 
 @register_query(MongoDBConnection)
 def get_spent(conn, transaction_id, output):
-    cursor = conn.db['bigchain'].aggregate([
-        {'$unwind': '$block.transactions'},
-        {'$match': {
-            'block.transactions.inputs.fulfills.txid': transaction_id,
-            'block.transactions.inputs.fulfills.output': output
-        }}
-    ])
+    spends_output = {
+        _transaction_field(conn, 'inputs'): {
+            '$elemMatch': {
+                'fulfills.txid': transaction_id,
+                'fulfills.output': output
+            }
+        }
+    }
+    # the blocks (or transactions) are selected through the `inputs` index
+    cursor = _transactions_of_blocks(conn, spends_output)
     # we need to access some nested fields before returning so lets use a
     # generator to avoid having to read all records on the cursor at this point
-    return (elem['block']['transactions'] for elem in cursor)
+    return (elem['transaction'] for elem in cursor)
 
 
 @register_query(MongoDBConnection)
 def get_owned_ids(conn, owner):
-    cursor = conn.db['bigchain'].aggregate([
-        {'$unwind': '$block.transactions'},
-        {'$match': {
-            'block.transactions.outputs.public_keys': {
-                '$elemMatch': {'$eq': owner}
+    # each nesting level of the public keys has its own index, mongodb uses
+    # all of them to resolve the `$or`
+    owned_by = {'$or': [{_transaction_field(conn, field): owner}
+                        for field in OUTPUT_PUBLIC_KEY_FIELDS]}
+    return _transactions_of_blocks(conn, owned_by)
+
+
+@register_query(MongoDBConnection)
+def get_spending_transactions(conn, inputs):
+    spends_inputs = {'$or': [
+        {_transaction_field(conn, 'inputs'): {
+            '$elemMatch': {
+                'fulfills.txid': input_['txid'],
+                'fulfills.output': input_['output']
             }
+        }} for input_ in inputs
+    ]}
+    return _transactions_of_blocks(conn, spends_inputs)
+
+
+def _transaction_field(conn, field):
+    # the path of a field of the transactions looked up by
+    # `_transactions_of_blocks`
+    if conn.transactions_table:
+        return 'transaction.' + field
+    return 'block.transactions.' + field
+
+
+def _transactions_of_blocks(conn, condition):
+    # the transactions matching `condition`, along with the id and voters of
+    # the block containing them to determine its status
+    if conn.transactions_table:
+        # one document per transaction, listing the blocks containing it
+        return conn.db['transactions'].aggregate([
+            {'$match': condition},
+            {'$unwind': '$blocks'},
+            {'$project': {
+                '_id': False,
+                'id': '$blocks.id',
+                'block.voters': '$blocks.voters',
+                'transaction': True,
+            }}
+        ])
+
+    return conn.db['bigchain'].aggregate([
+        {'$match': condition},
+        {'$unwind': '$block.transactions'},
+        {'$match': condition},
+        {'$project': {
+            '_id': False,
+            'id': True,
+            'block.voters': True,
+            'transaction': '$block.transactions',
         }}
     ])
-    # we need to access some nested fields before returning so lets use a
-    # generator to avoid having to read all records on the cursor at this point
-    return (elem['block']['transactions'] for elem in cursor)
 
 
 @register_query(MongoDBConnection)
@@ -171,6 +369,13 @@ def get_votes_by_block_id(conn, block_id):
                   projection={'_id': False})
 
 
+@register_query(MongoDBConnection)
+def get_votes_by_block_ids(conn, block_ids):
+    return conn.db['votes']\
+            .find({'vote.voting_for_block': {'$in': list(block_ids)}},
+                  projection={'_id': False})
+
+
 @register_query(MongoDBConnection)
 def get_votes_by_block_id_and_voter(conn, block_id, node_pubkey):
     return conn.db['votes']\
@@ -181,7 +386,38 @@ def get_votes_by_block_id_and_voter(conn, block_id, node_pubkey):
 
 @register_query(MongoDBConnection)
 def write_block(conn, block):
-    return conn.db['bigchain'].insert_one(block.to_dict())
+    block_dict = block.to_dict()
+    # the block is written first: a transaction must never refer to a block
+    # that is not in the bigchain, e.g. if the node stops in between
+    response = conn.db['bigchain'].insert_one(block_dict)
+
+    if conn.transactions_table:
+        write_block_transactions(conn, block_dict)
+
+    return response
+
+
+@register_query(MongoDBConnection)
+def write_block_transactions(conn, block):
+    # a transaction already written with another block gets the new block
+    # added to its blocks
+    block_ref = {'id': block['id'], 'voters': block['block']['voters']}
+    return conn.db['transactions'].bulk_write([
+        UpdateOne({'id': tx['id']},
+                  {'$setOnInsert': {'transaction': tx},
+                   '$addToSet': {'blocks': block_ref}},
+                  upsert=True)
+        for tx in block['block']['transactions']
+    ], ordered=False)
+
+
+@register_query(MongoDBConnection)
+def get_last_blocks(conn, node_pubkey, limit):
+    return conn.db['bigchain']\
+            .find({'block.node_pubkey': node_pubkey},
+                  projection={'_id': False})\
+            .sort('block.timestamp', DESCENDING)\
+            .limit(limit)
 
 
 @register_query(MongoDBConnection)
@@ -192,6 +428,10 @@ def get_block(conn, block_id):
 
 @register_query(MongoDBConnection)
 def has_transaction(conn, transaction_id):
+    if conn.transactions_table:
+        return bool(conn.db['transactions']
+                    .find_one({'id': transaction_id}))
+
     return bool(conn.db['bigchain']
                 .find_one({'block.transactions.id': transaction_id}))
 
@@ -211,6 +451,28 @@ def write_vote(conn, vote):
     return conn.db['votes'].insert_one(vote)
 
 
+@register_query(MongoDBConnection)
+def write_votes(conn, votes):
+    # the votes of a node are chained to each other: they are written in
+    # order, and a failed insert prevents the next ones
+    return conn.db['votes'].insert_many(votes, ordered=True)
+
+
+@register_query(MongoDBConnection)
+def write_block_decision(conn, decision):
+    try:
+        return conn.db['decisions'].insert_one(decision)
+    except errors.DuplicateKeyError:
+        return
+
+
+@register_query(MongoDBConnection)
+def get_block_decisions(conn, block_ids):
+    return conn.db['decisions']\
+        .find({'block_id': {'$in': list(block_ids)}},
+              projection={'_id': False})
+
+
 @register_query(MongoDBConnection)
 def get_genesis_block(conn):
     return conn.db['bigchain'].find_one(
@@ -15,6 +15,12 @@ from bigchaindb.backend.mongodb.connection import MongoDBConnection
 logger = logging.getLogger(__name__)
 register_schema = module_dispatch_registrar(backend.schema)
 
+# the fields holding the public keys of the outputs of a transaction, nested
+# in threshold conditions up to `MAX_INDEXED_SUBFULFILLMENT_DEPTH`
+OUTPUT_PUBLIC_KEY_FIELDS = tuple(
+    'outputs.condition.details{}.public_key'.format('.subfulfillments' * depth)
+    for depth in range(backend.schema.MAX_INDEXED_SUBFULFILLMENT_DEPTH + 1))
+
 
 @register_schema(MongoDBConnection)
 def create_database(conn, dbname):
@@ -32,7 +38,8 @@ def create_database(conn, dbname):
 
 @register_schema(MongoDBConnection)
 def create_tables(conn, dbname):
-    for table_name in ['bigchain', 'backlog', 'votes']:
+    for table_name in ['bigchain', 'backlog', 'votes', 'decisions',
+                       'transactions']:
         logger.info('Create `%s` table.', table_name)
         # create the table
         # TODO: read and write concerns can be declared here
@@ -44,6 +51,8 @@ def create_indexes(conn, dbname):
     create_bigchain_secondary_index(conn, dbname)
     create_backlog_secondary_index(conn, dbname)
     create_votes_secondary_index(conn, dbname)
+    create_decisions_secondary_index(conn, dbname)
+    create_transactions_secondary_index(conn, dbname)
 
 
 @register_schema(MongoDBConnection)
@@ -63,11 +72,27 @@ def create_bigchain_secondary_index(conn, dbname):
     conn.conn[dbname]['bigchain'].create_index('block.transactions.id',
                                                name='transaction_id')
 
-    # secondary index for asset uuid, this field is unique
+    # secondary index for asset links (in TRANSFER transactions)
     conn.conn[dbname]['bigchain']\
-        .create_index('block.transactions.transaction.asset.id',
+        .create_index('block.transactions.asset.id',
                       name='asset_id')
 
+    # compound multikey index on the outputs spent by the transactions of a
+    # block, to look up double spends
+    conn.conn[dbname]['bigchain']\
+        .create_index([('block.transactions.inputs.fulfills.txid',
+                        ASCENDING),
+                       ('block.transactions.inputs.fulfills.output',
+                        ASCENDING)],
+                      name='inputs')
+
+    # one multikey index per nesting level of the public keys of the outputs
+    # of the transactions of a block, to look up the outputs owned by a key
+    for depth, field in enumerate(OUTPUT_PUBLIC_KEY_FIELDS):
+        conn.conn[dbname]['bigchain']\
+            .create_index('block.transactions.' + field,
+                          name='outputs_{}'.format(depth))
+
 
 def create_backlog_secondary_index(conn, dbname):
     logger.info('Create `backlog` secondary index.')
@@ -97,6 +122,44 @@ def create_votes_secondary_index(conn, dbname):
                                             name='block_and_voter')
 
 
+def create_decisions_secondary_index(conn, dbname):
+    logger.info('Create `decisions` secondary index.')
+
+    # secondary index on the block id with a uniqueness constraint, there is
+    # at most one decision per block
+    conn.conn[dbname]['decisions'].create_index('block_id',
+                                                name='block_id',
+                                                unique=True)
+
+
+def create_transactions_secondary_index(conn, dbname):
+    logger.info('Create `transactions` secondary index.')
+
+    # secondary index on the transaction id with a uniqueness constraint,
+    # each transaction has a single document listing the blocks containing it
+    conn.conn[dbname]['transactions'].create_index('id',
+                                                   name='transaction_id',
+                                                   unique=True)
+
+    # secondary index for asset links (in TRANSFER transactions)
+    conn.conn[dbname]['transactions'].create_index('transaction.asset.id',
+                                                   name='asset_id')
+
+    # compound multikey index on the outputs spent by a transaction, to look
+    # up double spends
+    conn.conn[dbname]['transactions']\
+        .create_index([('transaction.inputs.fulfills.txid', ASCENDING),
+                       ('transaction.inputs.fulfills.output', ASCENDING)],
+                      name='inputs')
+
+    # one multikey index per nesting level of the public keys of the outputs
+    # of a transaction, to look up the outputs owned by a key
+    for depth, field in enumerate(OUTPUT_PUBLIC_KEY_FIELDS):
+        conn.conn[dbname]['transactions']\
+            .create_index('transaction.' + field,
+                          name='outputs_{}'.format(depth))
+
+
 def initialize_replica_set(conn):
     """Initialize a replica set. If already initialized skip."""
     replica_set_name = _get_replica_set_name(conn)
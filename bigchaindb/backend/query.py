@@ -17,6 +17,22 @@ def write_transaction(connection, signed_transaction):
     raise NotImplementedError
 
 
+@singledispatch
+def write_transactions(connection, signed_transactions):
+    """Write several transactions to the backlog table, in one request.
+
+    The transactions already in the backlog are left as they are.
+
+    Args:
+        signed_transactions (list): the signed transactions.
+
+    Returns:
+        The result of the operation.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def update_transaction(connection, transaction_id, doc):
     """Update a transaction in the backlog table.
@@ -92,6 +108,35 @@ def get_transaction_from_backlog(connection, transaction_id):
     raise NotImplementedError
 
 
+@singledispatch
+def get_transactions_from_backlog(connection, transaction_ids):
+    """Get several transactions from backlog at once.
+
+    Args:
+        transaction_ids (list): the ids of the transactions.
+
+    Returns:
+        An iterable of the transactions found.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_transactions(connection, transaction_ids):
+    """Get several transactions from the bigchain table at once.
+
+    Args:
+        transaction_ids (list): the ids of the transactions.
+
+    Returns:
+        An iterable of the matching transactions, one document per block
+        containing them, in the same format as :func:`get_owned_ids`.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_blocks_status_from_transaction(connection, transaction_id):
     """Retrieve block election information given a secondary index and value.
@@ -126,6 +171,44 @@ def get_txids_by_asset_id(connection, asset_id):
     raise NotImplementedError
 
 
+@singledispatch
+def get_transactions_by_asset_id(connection, asset_id, after=None,
+                                 limit=None):
+    """Get the transactions of an asset, a page at a time.
+
+    The ``CREATE`` transaction of the asset comes first, followed by the
+    ``TRANSFER`` transactions, ordered by id.
+
+    Args:
+        asset_id (str): the id of the asset.
+        after (str): the id of the last transaction of the previous page, if
+            any.
+        limit (int): the maximum number of transactions to return, if any.
+
+    Returns:
+        An iterator of documents holding a ``transaction``, its ``id``, and
+        the ``id`` and ``voters`` of each of the ``blocks`` containing it.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_txids_in_blocks(connection, txids=None):
+    """Get the ids of the transactions of all the blocks.
+
+    Args:
+        txids (list, optional): only look for these transaction ids, in a
+            single query.
+
+    Returns:
+        An iterator of transaction ids. The id of a transaction appearing in
+        several blocks may be repeated.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_asset_by_id(conneciton, asset_id):
     """Returns the asset associated with an asset_id.
@@ -161,13 +244,35 @@ def get_spent(connection, transaction_id, condition_id):
 
 @singledispatch
 def get_owned_ids(connection, owner):
-    """Retrieve a list of `txids` that can we used has inputs.
+    """Retrieve the transactions with outputs that `owner` can use as inputs.
+
+    The lookup goes through an index on the public keys of the outputs,
+    including the ones nested in threshold conditions up to
+    :data:`~bigchaindb.backend.schema.MAX_INDEXED_SUBFULFILLMENT_DEPTH`.
 
     Args:
         owner (str): base58 encoded public key.
 
     Returns:
-        A cursor for the matching transactions.
+        An iterable of the matching transactions, one document per block
+        containing them, e.g.
+        ``{'id': block_id, 'block': {'voters': [...]}, 'transaction': tx}``.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_spending_transactions(connection, inputs):
+    """Retrieve the transactions spending any of the given outputs.
+
+    Args:
+        inputs (list): the outputs to look up, as ``{'txid': ..., 'output':
+            ...}`` dicts.
+
+    Returns:
+        An iterable of the matching transactions, one document per block
+        containing them, in the same format as :func:`get_owned_ids`.
     """
 
     raise NotImplementedError
@@ -187,6 +292,21 @@ def get_votes_by_block_id(connection, block_id):
     raise NotImplementedError
 
 
+@singledispatch
+def get_votes_by_block_ids(connection, block_ids):
+    """Get all the votes casted for several blocks at once.
+
+    Args:
+        block_ids (list): the ids of the blocks.
+
+    Returns:
+        A cursor for the matching votes, or an empty iterator if there is no
+        block id.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_votes_by_block_id_and_voter(connection, block_id, node_pubkey):
     """Get all the votes casted for a specific block by a specific voter.
@@ -206,6 +326,11 @@ def get_votes_by_block_id_and_voter(connection, block_id, node_pubkey):
 def write_block(connection, block):
     """Write a block to the bigchain table.
 
+    If the connection has a ``transactions_table``, each transaction of the
+    block is then written to the transactions table, along with the id and
+    the voters of the block. The block is written first, so that the
+    transactions table never refers to a block missing from the bigchain.
+
     Args:
         block (dict): the block to write.
 
@@ -216,6 +341,38 @@ def write_block(connection, block):
     raise NotImplementedError
 
 
+@singledispatch
+def write_block_transactions(connection, block):
+    """Write the transactions of a block already in the bigchain table to
+    the transactions table, along with the id and the voters of the block.
+
+    Writing the transactions of a block again doesn't change anything.
+
+    Args:
+        block (dict): the block, as stored in the bigchain table.
+
+    Returns:
+        The database response.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_last_blocks(connection, node_pubkey, limit):
+    """Get the last blocks created by a node.
+
+    Args:
+        node_pubkey (str): the public key of the node.
+        limit (int): the maximum number of blocks to return.
+
+    Returns:
+        An iterator of blocks, the most recent first.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_block(connection, block_id):
     """Get a block from the bigchain table.
@@ -280,6 +437,57 @@ def write_vote(connection, vote):
     raise NotImplementedError
 
 
+@singledispatch
+def write_votes(connection, votes):
+    """Write several votes to the votes table, in one request.
+
+    Whether the votes are written in order, and whether a failed write
+    prevents the writes of the next votes, depends on the backend: MongoDB
+    does both, RethinkDB neither.
+
+    Args:
+        votes (list): the votes to write.
+
+    Returns:
+        The database response.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def write_block_decision(connection, decision):
+    """Write the decision on a block to the decisions table.
+
+    The first decision written for a block is kept, writing it again has no
+    effect.
+
+    Args:
+        decision (dict): the decision to write, with the ``block_id``,
+            ``status``, ``decided_at`` and ``tally`` of the election.
+
+    Returns:
+        The database response.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_block_decisions(connection, block_ids):
+    """Get the decisions recorded for the given blocks.
+
+    Args:
+        block_ids (list): the ids of the blocks.
+
+    Returns:
+        An iterable of the decisions found, blocks that are not decided
+        yet have none.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_genesis_block(connection):
     """Get the genesis block.
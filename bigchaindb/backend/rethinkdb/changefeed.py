@@ -17,32 +17,52 @@ class RethinkDBChangeFeed(ChangeFeed):
 
     def run_forever(self):
         for element in self.prefeed:
-            self.outqueue.put(element)
+            self.emit(element)
+        self.flush()
 
         while True:
             try:
                 self.run_changefeed()
+                self.flush()
                 break
             except (r.ReqlDriverError, r.ReqlOpFailedError) as exc:
                 logger.exception(exc)
                 time.sleep(1)
 
     def run_changefeed(self):
-        for change in self.connection.run(r.table(self.table).changes()):
+        cursor = self.connection.run(r.table(self.table).changes())
+        for change in self._changes(cursor):
             is_insert = change['old_val'] is None
             is_delete = change['new_val'] is None
             is_update = not is_insert and not is_delete
 
             if is_insert and (self.operation & ChangeFeed.INSERT):
-                self.outqueue.put(change['new_val'])
+                self.emit(change['new_val'])
             elif is_delete and (self.operation & ChangeFeed.DELETE):
-                self.outqueue.put(change['old_val'])
+                self.emit(change['old_val'])
             elif is_update and (self.operation & ChangeFeed.UPDATE):
-                self.outqueue.put(change['new_val'])
+                self.emit(change['new_val'])
+
+    def _changes(self, cursor):
+        """Iterate over the changes of a cursor, outputting the current batch
+        when its time window elapses without a new change."""
+        if not self.batch_size:
+            yield from cursor
+            return
+
+        while True:
+            wait = self.batch_wait()
+            try:
+                yield cursor.next(wait=True if wait is None else wait)
+            except r.ReqlTimeoutError:
+                self.flush()
+            except r.ReqlCursorEmpty:
+                return
 
 
 @register_changefeed(RethinkDBConnection)
-def get_changefeed(connection, table, operation, *, prefeed=None):
+def get_changefeed(connection, table, operation, *, prefeed=None,
+                   batch_size=None, batch_timeout=None):
     """Return a RethinkDB changefeed.
 
     Returns:
@@ -51,4 +71,5 @@ def get_changefeed(connection, table, operation, *, prefeed=None):
     """
 
     return RethinkDBChangeFeed(table, operation, prefeed=prefeed,
-                               connection=connection)
+                               connection=connection, batch_size=batch_size,
+                               batch_timeout=batch_timeout)
@@ -7,6 +7,7 @@ from bigchaindb import backend, utils
 from bigchaindb.common import exceptions
 from bigchaindb.backend.utils import module_dispatch_registrar
 from bigchaindb.backend.rethinkdb.connection import RethinkDBConnection
+from bigchaindb.backend.rethinkdb.schema import outputs_public_keys
 
 
 READ_MODE = 'majority'
@@ -22,6 +23,15 @@ def write_transaction(connection, signed_transaction):
             .insert(signed_transaction, durability=WRITE_DURABILITY))
 
 
+@register_query(RethinkDBConnection)
+def write_transactions(connection, signed_transactions):
+    # the transactions conflicting with the ones in the backlog are reported
+    # as errors in the response, the others are inserted
+    return connection.run(
+            r.table('backlog')
+            .insert(signed_transactions, durability=WRITE_DURABILITY))
+
+
 @register_query(RethinkDBConnection)
 def update_transaction(connection, transaction_id, doc):
     return connection.run(
@@ -47,6 +57,14 @@ def get_stale_transactions(connection, reassign_delay):
 
 @register_query(RethinkDBConnection)
 def get_transaction_from_block(connection, transaction_id, block_id):
+    if connection.transactions_table:
+        doc = connection.run(
+                r.table('transactions', read_mode=READ_MODE)
+                .get(transaction_id))
+        if doc and block_id in (block['id'] for block in doc['blocks']):
+            return doc['transaction']
+        return
+
     return connection.run(
             r.table('bigchain', read_mode=READ_MODE)
             .get(block_id)
@@ -64,8 +82,38 @@ def get_transaction_from_backlog(connection, transaction_id):
             .default(None))
 
 
+@register_query(RethinkDBConnection)
+def get_transactions_from_backlog(connection, transaction_ids):
+    return connection.run(
+            r.table('backlog')
+            .get_all(*transaction_ids)
+            .without('assignee', 'assignment_timestamp'))
+
+
+@register_query(RethinkDBConnection)
+def get_transactions(connection, transaction_ids):
+    if connection.transactions_table:
+        return connection.run(_blocks_of_transactions(
+                r.table('transactions', read_mode=READ_MODE)
+                .get_all(*transaction_ids)))
+
+    return connection.run(
+            r.table('bigchain', read_mode=READ_MODE)
+            .get_all(*transaction_ids, index='transaction_id')
+            .distinct()
+            .concat_map(lambda doc: _transactions_of_block(
+                doc, lambda tx: r.expr(transaction_ids).contains(tx['id']))))
+
+
 @register_query(RethinkDBConnection)
 def get_blocks_status_from_transaction(connection, transaction_id):
+    if connection.transactions_table:
+        return connection.run(
+                _blocks_of_transactions(
+                    r.table('transactions', read_mode=READ_MODE)
+                    .get_all(transaction_id))
+                .without('transaction'))
+
     return connection.run(
             r.table('bigchain', read_mode=READ_MODE)
             .get_all(transaction_id, index='transaction_id')
@@ -79,25 +127,115 @@ def get_txids_by_asset_id(connection, asset_id):
 
     # First find the asset's CREATE transaction
     create_tx_cursor = connection.run(
-        _get_asset_create_tx_query(asset_id).get_field('id'))
+        _get_asset_create_tx_query(connection, asset_id).get_field('id'))
 
     # Then find any TRANSFER transactions related to the asset
-    transfer_tx_cursor = connection.run(
-        r.table('bigchain')
-         .get_all(asset_id, index='asset_id')
-         .concat_map(lambda block: block['block']['transactions'])
-         .filter(lambda transaction: transaction['asset']['id'] == asset_id)
-         .get_field('id'))
+    if connection.transactions_table:
+        transfer_tx_cursor = connection.run(
+            r.table('transactions', read_mode=READ_MODE)
+             .get_all(asset_id, index='asset_id')
+             .get_field('id'))
+    else:
+        transfer_tx_cursor = connection.run(
+            r.table('bigchain')
+             .get_all(asset_id, index='asset_id')
+             .concat_map(lambda block: block['block']['transactions'])
+             .filter(lambda transaction: transaction['asset']['id'] == asset_id)
+             .get_field('id'))
 
     return chain(create_tx_cursor, transfer_tx_cursor)
 
 
+@register_query(RethinkDBConnection)
+def get_transactions_by_asset_id(connection, asset_id, after=None, limit=None):
+    # the create transaction is always on the first page, then the transfers
+    # come by id
+    if after == asset_id:
+        def of_asset(tx):
+            return tx['asset']['id'].default(None) == asset_id
+    elif after:
+        def of_asset(tx):
+            return ((tx['asset']['id'].default(None) == asset_id) &
+                    (tx['id'] > after))
+    else:
+        def of_asset(tx):
+            return ((tx['id'] == asset_id) |
+                    (tx['asset']['id'].default(None) == asset_id))
+
+    if connection.transactions_table:
+        docs = (r.table('transactions', read_mode=READ_MODE)
+                .get_all(asset_id)
+                .union(r.table('transactions', read_mode=READ_MODE)
+                       .get_all(asset_id, index='asset_id'))
+                .filter(lambda doc: of_asset(doc['transaction'])))
+    else:
+        # the blocks containing the create transaction, or transfers of the
+        # asset, are selected through the indexes, then the transactions
+        # following the `after` cursor are grouped by id along with the
+        # blocks containing them
+        docs = (r.table('bigchain', read_mode=READ_MODE)
+                .get_all(asset_id, index='transaction_id')
+                .union(r.table('bigchain', read_mode=READ_MODE)
+                       .get_all(asset_id, index='asset_id'))
+                .distinct()
+                .concat_map(lambda block: _transactions_of_block(block, of_asset))
+                .group(lambda doc: doc['transaction']['id'])
+                .ungroup()
+                .map(lambda group: {
+                    'id': group['group'],
+                    'transaction': group['reduction'][0]['transaction'],
+                    'blocks': group['reduction'].map(
+                        lambda doc: {'id': doc['id'],
+                                     'voters': doc['block']['voters']}),
+                }))
+
+    docs = docs.order_by(lambda doc: [doc['id'] != asset_id, doc['id']])
+    if limit:
+        docs = docs.limit(limit)
+    return connection.run(docs.pluck('id', 'transaction', 'blocks'))
+
+
+@register_query(RethinkDBConnection)
+def get_txids_in_blocks(connection, txids=None):
+    if txids is not None:
+        if not txids:
+            return iter([])
+
+        if connection.transactions_table:
+            return connection.run(
+                    r.table('transactions', read_mode=READ_MODE)
+                    .get_all(*txids)
+                    .get_field('id'))
+
+        # the blocks containing one of the transactions also contain others
+        return connection.run(
+                r.table('bigchain', read_mode=READ_MODE)
+                .get_all(*txids, index='transaction_id')
+                .concat_map(lambda block: block['block']['transactions']['id'])
+                .filter(lambda txid: r.expr(txids).contains(txid)))
+
+    if connection.transactions_table:
+        return connection.run(
+                r.table('transactions', read_mode=READ_MODE)
+                .get_field('id'))
+
+    return connection.run(
+            r.table('bigchain', read_mode=READ_MODE)
+            .concat_map(lambda block: block['block']['transactions']['id']))
+
+
 @register_query(RethinkDBConnection)
 def get_asset_by_id(connection, asset_id):
-    return connection.run(_get_asset_create_tx_query(asset_id).pluck('asset'))
+    return connection.run(
+        _get_asset_create_tx_query(connection, asset_id).pluck('asset'))
 
 
-def _get_asset_create_tx_query(asset_id):
+def _get_asset_create_tx_query(connection, asset_id):
+    if connection.transactions_table:
+        return r.table('transactions', read_mode=READ_MODE) \
+                .get_all(asset_id) \
+                .get_field('transaction')
+
     return r.table('bigchain', read_mode=READ_MODE) \
             .get_all(asset_id, index='transaction_id') \
             .concat_map(lambda block: block['block']['transactions']) \
@@ -106,9 +244,16 @@ def _get_asset_create_tx_query(asset_id):
 
 @register_query(RethinkDBConnection)
 def get_spent(connection, transaction_id, output):
-    # TODO: use index!
+    if connection.transactions_table:
+        return connection.run(
+                _blocks_of_transactions(
+                    r.table('transactions', read_mode=READ_MODE)
+                    .get_all([transaction_id, output], index='inputs'))
+                .get_field('transaction'))
+
     return connection.run(
             r.table('bigchain', read_mode=READ_MODE)
+            .get_all([transaction_id, output], index='inputs')
             .concat_map(lambda doc: doc['block']['transactions'])
             .filter(lambda transaction: transaction['inputs'].contains(
                 lambda input: input['fulfills'] == {'txid': transaction_id, 'output': output})))
@@ -116,12 +261,56 @@ def get_spent(connection, transaction_id, output):
 
 @register_query(RethinkDBConnection)
 def get_owned_ids(connection, owner):
-    # TODO: use index!
+    if connection.transactions_table:
+        return connection.run(_blocks_of_transactions(
+                r.table('transactions', read_mode=READ_MODE)
+                .get_all(owner, index='outputs')))
+
     return connection.run(
             r.table('bigchain', read_mode=READ_MODE)
-            .concat_map(lambda doc: doc['block']['transactions'])
-            .filter(lambda tx: tx['outputs'].contains(
-                lambda c: c['public_keys'].contains(owner))))
+            .get_all(owner, index='outputs')
+            .concat_map(lambda doc: _transactions_of_block(
+                doc, lambda tx: outputs_public_keys(tx['outputs'])
+                .contains(owner))))
+
+
+@register_query(RethinkDBConnection)
+def get_spending_transactions(connection, inputs):
+    keys = [[input_['txid'], input_['output']] for input_ in inputs]
+    if connection.transactions_table:
+        return connection.run(_blocks_of_transactions(
+                r.table('transactions', read_mode=READ_MODE)
+                .get_all(*keys, index='inputs')
+                .distinct()))
+
+    return connection.run(
+            r.table('bigchain', read_mode=READ_MODE)
+            .get_all(*keys, index='inputs')
+            .distinct()
+            .concat_map(lambda doc: _transactions_of_block(
+                doc, lambda tx: tx['inputs'].contains(
+                    lambda input_: r.expr(inputs).contains(input_['fulfills'])))))
+
+
+def _transactions_of_block(block, predicate):
+    # the transactions of `block` matching `predicate`, along with the id and
+    # voters of the block to determine its status
+    return (block['block']['transactions']
+            .filter(predicate)
+            .map(lambda tx: {'id': block['id'],
+                             'block': {'voters': block['block']['voters']},
+                             'transaction': tx}))
+
+
+def _blocks_of_transactions(docs):
+    # the same as `_transactions_of_block`, for documents of the
+    # `transactions` table: each transaction along with the id and voters of
+    # each block containing it
+    return docs.concat_map(
+        lambda doc: doc['blocks'].map(
+            lambda block: {'id': block['id'],
+                           'block': {'voters': block['voters']},
+                           'transaction': doc['transaction']}))
 
 
 @register_query(RethinkDBConnection)
@@ -132,6 +321,19 @@ def get_votes_by_block_id(connection, block_id):
             .without('id'))
 
 
+@register_query(RethinkDBConnection)
+def get_votes_by_block_ids(connection, block_ids):
+    block_ids = list(block_ids)
+    if not block_ids:
+        return iter([])
+
+    # the votes for each block are a range of the `block_and_voter` index
+    ranges = [r.table('votes', read_mode=READ_MODE)
+              .between([block_id, r.minval], [block_id, r.maxval], index='block_and_voter')
+              for block_id in block_ids]
+    return connection.run(ranges[0].union(*ranges[1:]).without('id'))
+
+
 @register_query(RethinkDBConnection)
 def get_votes_by_block_id_and_voter(connection, block_id, node_pubkey):
     return connection.run(
@@ -142,10 +344,40 @@ def get_votes_by_block_id_and_voter(connection, block_id, node_pubkey):
 
 @register_query(RethinkDBConnection)
 def write_block(connection, block):
-    return connection.run(
+    # the block is written first: a transaction must never refer to a block
+    # that is not in the bigchain, e.g. if the node stops in between
+    response = connection.run(
             r.table('bigchain')
             .insert(r.json(block.to_str()), durability=WRITE_DURABILITY))
 
+    if connection.transactions_table:
+        write_block_transactions(connection, block.to_dict())
+
+    return response
+
+
+@register_query(RethinkDBConnection)
+def write_block_transactions(connection, block):
+    block_ref = {'id': block['id'], 'voters': block['block']['voters']}
+    return connection.run(
+            r.table('transactions')
+            .insert([{'id': tx['id'], 'transaction': tx, 'blocks': [block_ref]}
+                     for tx in block['block']['transactions']],
+                    # a transaction already written with another block
+                    # gets the new block added to its blocks
+                    conflict=lambda id_, old, new: old.merge(
+                        {'blocks': old['blocks'].set_union(new['blocks'])}),
+                    durability=WRITE_DURABILITY))
+
+
+@register_query(RethinkDBConnection)
+def get_last_blocks(connection, node_pubkey, limit):
+    return connection.run(
+            r.table('bigchain', read_mode=READ_MODE)
+            .order_by(index=r.desc('block_timestamp'))
+            .filter(r.row['block']['node_pubkey'] == node_pubkey)
+            .limit(limit))
+
 
 @register_query(RethinkDBConnection)
 def get_block(connection, block_id):
@@ -154,6 +386,11 @@ def get_block(connection, block_id):
 
 @register_query(RethinkDBConnection)
 def has_transaction(connection, transaction_id):
+    if connection.transactions_table:
+        return bool(connection.run(
+                r.table('transactions', read_mode=READ_MODE)
+                .get(transaction_id)))
+
     return bool(connection.run(
             r.table('bigchain', read_mode=READ_MODE)
             .get_all(transaction_id, index='transaction_id').count()))
@@ -180,6 +417,28 @@ def write_vote(connection, vote):
             .insert(vote))
 
 
+@register_query(RethinkDBConnection)
+def write_votes(connection, votes):
+    return connection.run(
+            r.table('votes')
+            .insert(votes))
+
+
+@register_query(RethinkDBConnection)
+def write_block_decision(connection, decision):
+    # an insert conflicting with an existing decision leaves it as it is
+    return connection.run(
+            r.table('decisions')
+            .insert(decision, durability=WRITE_DURABILITY))
+
+
+@register_query(RethinkDBConnection)
+def get_block_decisions(connection, block_ids):
+    return connection.run(
+            r.table('decisions', read_mode=READ_MODE)
+            .get_all(*block_ids))
+
+
 @register_query(RethinkDBConnection)
 def get_genesis_block(connection):
     return connection.run(
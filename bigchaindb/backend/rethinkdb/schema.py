@@ -23,16 +23,21 @@ def create_database(connection, dbname):
 
 @register_schema(RethinkDBConnection)
 def create_tables(connection, dbname):
-    for table_name in ['bigchain', 'backlog', 'votes']:
+    for table_name in ['bigchain', 'backlog', 'votes', 'transactions']:
         logger.info('Create `%s` table.', table_name)
         connection.run(r.db(dbname).table_create(table_name))
 
+    # there is at most one decision per block
+    logger.info('Create `decisions` table.')
+    connection.run(r.db(dbname).table_create('decisions', primary_key='block_id'))
+
 
 @register_schema(RethinkDBConnection)
 def create_indexes(connection, dbname):
     create_bigchain_secondary_index(connection, dbname)
     create_backlog_secondary_index(connection, dbname)
     create_votes_secondary_index(connection, dbname)
+    create_transactions_secondary_index(connection, dbname)
 
 
 @register_schema(RethinkDBConnection)
@@ -66,6 +71,20 @@ def create_bigchain_secondary_index(connection, dbname):
         .table('bigchain')
         .index_create('asset_id', r.row['block']['transactions']['asset']['id'], multi=True))
 
+    # secondary index on the outputs spent by the transactions of a block,
+    # keyed by `[fulfills.txid, fulfills.output]`, to look up double spends
+    connection.run(
+        r.db(dbname)
+        .table('bigchain')
+        .index_create('inputs', spent_outputs, multi=True))
+
+    # secondary index on the public keys of the outputs of the transactions
+    # of a block, to look up the outputs owned by a key
+    connection.run(
+        r.db(dbname)
+        .table('bigchain')
+        .index_create('outputs', output_public_keys, multi=True))
+
     # wait for rethinkdb to finish creating secondary indexes
     connection.run(
         r.db(dbname)
@@ -73,6 +92,52 @@ def create_bigchain_secondary_index(connection, dbname):
         .index_wait())
 
 
+def spent_outputs(block):
+    """Index function mapping a block to the outputs its transactions spend."""
+    return fulfilled_outputs(
+        block['block']['transactions']
+        .concat_map(lambda transaction: transaction['inputs']))
+
+
+def fulfilled_outputs(inputs):
+    """The distinct outputs fulfilled by a sequence of inputs, as
+    ``[txid, output]`` pairs.
+
+    The inputs of ``CREATE`` and ``GENESIS`` transactions do not fulfill any
+    output and are left out.
+    """
+    return (inputs
+            .filter(lambda input_: input_['fulfills'].ne(None))
+            .map(lambda input_: [input_['fulfills']['txid'],
+                                 input_['fulfills']['output']])
+            .distinct())
+
+
+def output_public_keys(block):
+    """Index function mapping a block to the public keys of its outputs."""
+    return outputs_public_keys(
+        block['block']['transactions']
+        .concat_map(lambda transaction: transaction['outputs']))
+
+
+def outputs_public_keys(outputs):
+    """The distinct public keys of a sequence of outputs.
+
+    Besides the public keys of simple signature conditions, this includes
+    the ones nested in threshold conditions up to
+    :data:`~bigchaindb.backend.schema.MAX_INDEXED_SUBFULFILLMENT_DEPTH`.
+    """
+    details = outputs.map(lambda output: output['condition']['details'])
+    levels = [details]
+    for _ in range(backend.schema.MAX_INDEXED_SUBFULFILLMENT_DEPTH):
+        levels.append(levels[-1].concat_map(
+            lambda details: details['subfulfillments'].default([])))
+    return (levels[0].union(*levels[1:])
+            .filter(lambda details: details.has_fields('public_key'))
+            .map(lambda details: details['public_key'])
+            .distinct())
+
+
 def create_backlog_secondary_index(connection, dbname):
     logger.info('Create `backlog` secondary index.')
 
@@ -103,3 +168,37 @@ def create_votes_secondary_index(connection, dbname):
         r.db(dbname)
         .table('votes')
         .index_wait())
+
+
+def create_transactions_secondary_index(connection, dbname):
+    logger.info('Create `transactions` secondary index.')
+
+    # secondary index for asset links (in TRANSFER transactions)
+    connection.run(
+        r.db(dbname)
+        .table('transactions')
+        .index_create('asset_id', r.row['transaction']['asset']['id']))
+
+    # secondary index on the outputs spent by a transaction, keyed by
+    # `[fulfills.txid, fulfills.output]`, to look up double spends
+    connection.run(
+        r.db(dbname)
+        .table('transactions')
+        .index_create('inputs',
+                      lambda doc: fulfilled_outputs(doc['transaction']['inputs']),
+                      multi=True))
+
+    # secondary index on the public keys of the outputs of a transaction, to
+    # look up the outputs owned by a key
+    connection.run(
+        r.db(dbname)
+        .table('transactions')
+        .index_create('outputs',
+                      lambda doc: outputs_public_keys(doc['transaction']['outputs']),
+                      multi=True))
+
+    # wait for rethinkdb to finish creating secondary indexes
+    connection.run(
+        r.db(dbname)
+        .table('transactions')
+        .index_wait())
@@ -1,13 +1,22 @@
 """Database creation and schema-providing interfaces for backends.
 
 Attributes:
-    TABLES (tuple): The three standard tables BigchainDB relies on:
+    TABLES (tuple): The five standard tables BigchainDB relies on:
 
         * ``backlog`` for incoming transactions awaiting to be put into
           a block.
         * ``bigchain`` for blocks.
         * ``votes`` to store votes for each block by each federation
           node.
+        * ``decisions`` to store the outcome of the election of each
+          decided block.
+        * ``transactions`` to store each transaction of the blocks, keyed
+          by its id, if the ``database.transactions_table`` setting is
+          enabled.
+
+    MAX_INDEXED_SUBFULFILLMENT_DEPTH (int): Depth up to which the public
+        keys nested in the subfulfillments of threshold conditions are
+        indexed to look up the outputs owned by a key.
 
 """
 
@@ -19,7 +28,8 @@ from bigchaindb.backend.connection import connect
 
 logger = logging.getLogger(__name__)
 
-TABLES = ('bigchain', 'backlog', 'votes')
+TABLES = ('bigchain', 'backlog', 'votes', 'decisions', 'transactions')
+MAX_INDEXED_SUBFULFILLMENT_DEPTH = 2
 
 
 @singledispatch
@@ -210,19 +210,28 @@ def run_start(args):
     processes.start()
 
 
+# Number of transactions `_run_load` creates and signs at once
+LOAD_BATCH_SIZE = 100
+
+
 def _run_load(tx_left, stats):
     logstats.thread.start(stats)
     b = bigchaindb.Bigchain()
 
     while True:
-        tx = Transaction.create([b.me], [([b.me], 1)])
-        tx = tx.sign([b.me_private])
-        b.write_transaction(tx)
+        batch_size = LOAD_BATCH_SIZE
+        if tx_left is not None:
+            batch_size = min(batch_size, tx_left)
+
+        txs = [Transaction.create([b.me], [([b.me], 1)])
+               for _ in range(batch_size)]
+        for tx in Transaction.sign_many(txs, [b.me_private]):
+            b.write_transaction(tx)
 
-        stats['transactions'] += 1
+            stats['transactions'] += 1
 
         if tx_left is not None:
-            tx_left -= 1
+            tx_left -= batch_size
             if tx_left == 0:
                 break
 
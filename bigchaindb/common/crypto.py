@@ -3,12 +3,47 @@
 import sha3
 from cryptoconditions import crypto
 
+from bigchaindb.common.utils import serialize_into
+
 
 def hash_data(data):
     """Hash the provided data using SHA3-256"""
     return sha3.sha3_256(data.encode()).hexdigest()
 
 
+class _HashingStream(object):
+    """Feeds the chunks written to it into a SHA3-256 hash and, optionally,
+    a buffer."""
+
+    def __init__(self, buffer=None):
+        self.hash = sha3.sha3_256()
+        self.buffer = buffer
+
+    def write(self, chunk):
+        self.hash.update(chunk)
+        if self.buffer is not None:
+            self.buffer.write(chunk)
+
+
+def serialize_and_hash(data, buffer=None):
+    """Serialize a dict and hash it using SHA3-256, without building the
+    serialization as one large string.
+
+    The result is the same as ``hash_data(serialize(data))``.
+
+    Args:
+        data (dict): dict to serialize and hash.
+        buffer (optional): A binary stream (e.g. :class:`io.BytesIO`) that
+            receives the UTF-8 encoded serialization as well.
+
+    Returns:
+        str: The hex digest of the serialization.
+    """
+    stream = _HashingStream(buffer)
+    serialize_into(data, stream)
+    return stream.hash.hexdigest()
+
+
 def generate_key_pair():
     # TODO FOR CC: Adjust interface so that this function becomes unnecessary
     private_key, public_key = crypto.ed25519_generate_key_pair()
@@ -28,23 +28,37 @@ def _load_schema(name):
     return path, schema
 
 
+def _build_validator(schema):
+    """ Check a schema against its meta-schema and build a validator for it.
+
+    ``jsonschema.validate`` does both on every call, so the validators are
+    built once, at import time, and reused for every body.
+    """
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
 TX_SCHEMA_PATH, TX_SCHEMA = _load_schema('transaction')
 VOTE_SCHEMA_PATH, VOTE_SCHEMA = _load_schema('vote')
 
+TX_SCHEMA_VALIDATOR = _build_validator(TX_SCHEMA)
+VOTE_SCHEMA_VALIDATOR = _build_validator(VOTE_SCHEMA)
+
 
-def _validate_schema(schema, body):
-    """ Validate data against a schema """
+def _validate_schema(validator, body):
+    """ Validate data against a prebuilt schema validator """
     try:
-        jsonschema.validate(body, schema)
+        validator.validate(body)
     except jsonschema.ValidationError as exc:
         raise SchemaValidationError(str(exc)) from exc
 
 
 def validate_transaction_schema(tx):
     """ Validate a transaction dict """
-    _validate_schema(TX_SCHEMA, tx)
+    _validate_schema(TX_SCHEMA_VALIDATOR, tx)
 
 
 def validate_vote_schema(vote):
     """ Validate a vote dict """
-    _validate_schema(VOTE_SCHEMA, vote)
+    _validate_schema(VOTE_SCHEMA_VALIDATOR, vote)
@@ -13,6 +13,44 @@ from bigchaindb.common.utils import serialize, gen_timestamp
 import bigchaindb.version
 
 
+# the number of Transactions signed at once by a worker of the pool passed to
+# `Transaction.sign_many`, which derives the key pairs once per chunk
+SIGN_MANY_CHUNK_SIZE = 100
+
+
+def _key_pairs(private_keys):
+    """Derives the public keys of private keys.
+
+        Args:
+            private_keys (:obj:`list` of :obj:`str`): Base58 encoded private
+                keys.
+
+        Returns:
+            dict: The :class:`~bigchaindb.common.crypto.PrivateKey` of each
+            base58 encoded public key.
+    """
+    key_pairs = {}
+    for private_key in private_keys:
+        private_key = PrivateKey(private_key)
+        # TODO FOR CC: Adjust interface so that this function becomes
+        #              unnecessary
+
+        # cc now provides a single method `encode` to return the key
+        # in several different encodings.
+        public_key = private_key.get_verifying_key().encode()
+        # Returned values from cc are always bytestrings so here we need
+        # to decode to convert the bytestring into a python str
+        key_pairs[public_key.decode()] = private_key
+    return key_pairs
+
+
+def _sign_chunk(txs_and_private_keys):
+    """Signs copies of Transactions, deriving the key pairs only once."""
+    txs, private_keys = txs_and_private_keys
+    key_pairs = _key_pairs(private_keys)
+    return [deepcopy(tx)._sign_with_key_pairs(key_pairs) for tx in txs]
+
+
 class Input(object):
     """A Input is used to spend assets locked by an Output.
 
@@ -28,6 +66,9 @@ class Input(object):
                 Transaction.
     """
 
+    __slots__ = ('_fulfillment', '_fulfillment_uri', 'fulfills',
+                 'owners_before')
+
     def __init__(self, fulfillment, owners_before, fulfills=None):
         """Create an instance of an :class:`~.Input`.
 
@@ -49,6 +90,17 @@ class Input(object):
         self.fulfills = fulfills
         self.owners_before = owners_before
 
+    @property
+    def fulfillment(self):
+        return self._fulfillment
+
+    @fulfillment.setter
+    def fulfillment(self, fulfillment):
+        # NOTE: The URI of a fulfillment is only kept if the fulfillment was
+        #       parsed from it in `Input.from_dict`.
+        self._fulfillment = fulfillment
+        self._fulfillment_uri = None
+
     def __eq__(self, other):
         # TODO: If `other !== Fulfillment` return `False`
         return self.to_dict() == other.to_dict()
@@ -64,7 +116,8 @@ class Input(object):
                 dict: The Input as an alternative serialization format.
         """
         try:
-            fulfillment = self.fulfillment.serialize_uri()
+            fulfillment = (self._fulfillment_uri or
+                           self.fulfillment.serialize_uri())
         except (TypeError, AttributeError):
             # NOTE: When a non-signed transaction is casted to a dict,
             #       `self.inputs` value is lost, as in the node's
@@ -114,8 +167,13 @@ class Input(object):
             Raises:
                 InvalidSignature: If an Input's URI couldn't be parsed.
         """
+        fulfillment_uri = None
         try:
             fulfillment = Fulfillment.from_uri(data['fulfillment'])
+            # NOTE: `Fulfillment.from_uri` returns a Fulfillment passed
+            #       instead of a URI as is.
+            if isinstance(data['fulfillment'], str):
+                fulfillment_uri = data['fulfillment']
         except ValueError:
             # TODO FOR CC: Throw an `InvalidSignature` error in this case.
             raise InvalidSignature("Fulfillment URI couldn't been parsed")
@@ -124,7 +182,11 @@ class Input(object):
             #       `Input.to_dict`
             fulfillment = Fulfillment.from_dict(data['fulfillment'])
         fulfills = TransactionLink.from_dict(data['fulfills'])
-        return cls(fulfillment, data['owners_before'], fulfills)
+        input_ = cls(fulfillment, data['owners_before'], fulfills)
+        # NOTE: Keeping the URI spares serializing the fulfillment again in
+        #       `to_dict` and parsing it again when validating the Input.
+        input_._fulfillment_uri = fulfillment_uri
+        return input_
 
 
 class TransactionLink(object):
@@ -136,6 +198,8 @@ class TransactionLink(object):
             `txid`.
     """
 
+    __slots__ = ('txid', 'output')
+
     def __init__(self, txid=None, output=None):
         """Create an instance of a :class:`~.TransactionLink`.
 
@@ -209,6 +273,8 @@ class Output(object):
                 owners before a Transaction was confirmed.
     """
 
+    __slots__ = ('fulfillment', 'public_keys', 'amount')
+
     def __init__(self, fulfillment, public_keys=None, amount=1):
         """Create an instance of a :class:`~.Output`.
 
@@ -412,6 +478,9 @@ class Transaction(object):
     ALLOWED_OPERATIONS = (CREATE, TRANSFER, GENESIS)
     VERSION = bigchaindb.version.__version__
 
+    __slots__ = ('operation', 'asset', 'inputs', 'outputs', 'metadata',
+                 'version', '_id')
+
     def __init__(self, operation, asset, inputs=None, outputs=None,
                  metadata=None, version=None):
         """The constructor allows to create a customizable Transaction.
@@ -465,6 +534,34 @@ class Transaction(object):
         self.outputs = outputs or []
         self.metadata = metadata
 
+    def __setattr__(self, name, value):
+        # NOTE: Reassigning any of the Transaction's public attributes changes
+        #       its body, so the memoized id is dropped.
+        if not name.startswith('_'):
+            self._invalidate_cache()
+        super().__setattr__(name, value)
+
+    def _invalidate_cache(self):
+        """Drops the memoized id.
+
+            Note:
+                The cache is only invalidated automatically when an attribute
+                of the Transaction is reassigned or when :meth:`add_input`,
+                :meth:`add_output` or :meth:`sign` are called. Callers that
+                mutate nested structures in place (e.g. `tx.asset['id']`) need
+                to call this method themselves.
+        """
+        self._id = None
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in Transaction.__slots__}
+
+    def __setstate__(self, state):
+        # NOTE: Restoring the attributes with `__setattr__` would drop the
+        #       memoized id, which is still valid.
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     @classmethod
     def create(cls, tx_signers, recipients, metadata=None, asset=None):
         """A simple way to generate a `CREATE` transaction.
@@ -630,6 +727,7 @@ class Transaction(object):
         if not isinstance(input_, Input):
             raise TypeError('`input_` must be a Input instance')
         self.inputs.append(input_)
+        self._invalidate_cache()
 
     def add_output(self, output):
         """Adds an output to a Transaction's list of outputs.
@@ -642,6 +740,7 @@ class Transaction(object):
         if not isinstance(output, Output):
             raise TypeError('`output` must be an Output instance or None')
         self.outputs.append(output)
+        self._invalidate_cache()
 
     def sign(self, private_keys):
         """Fulfills a previous Transaction's Output by signing Inputs.
@@ -672,34 +771,89 @@ class Transaction(object):
         #       dictionary:
         #                   key:     public_key
         #                   value:   private_key
-        def gen_public_key(private_key):
-            # TODO FOR CC: Adjust interface so that this function becomes
-            #              unnecessary
-
-            # cc now provides a single method `encode` to return the key
-            # in several different encodings.
-            public_key = private_key.get_verifying_key().encode()
-            # Returned values from cc are always bytestrings so here we need
-            # to decode to convert the bytestring into a python str
-            return public_key.decode()
-
-        key_pairs = {gen_public_key(PrivateKey(private_key)):
-                     PrivateKey(private_key) for private_key in private_keys}
-
-        for index, input_ in enumerate(self.inputs):
-            # NOTE: We clone the current transaction but only add the output
-            #       and input we're currently working on plus all
-            #       previously signed ones.
-            tx_partial = Transaction(self.operation, self.asset, [input_],
-                                     self.outputs, self.metadata,
-                                     self.version)
-
-            tx_partial_dict = tx_partial.to_dict()
-            tx_partial_dict = Transaction._remove_signatures(tx_partial_dict)
-            tx_serialized = Transaction._to_str(tx_partial_dict)
+        return self._sign_with_key_pairs(_key_pairs(private_keys))
+
+    def _sign_with_key_pairs(self, key_pairs):
+        """Signs the Inputs with key pairs derived by :func:`_key_pairs`."""
+        tx_messages = zip(self.inputs, self._partial_tx_messages())
+        for index, (input_, tx_serialized) in enumerate(tx_messages):
             self._sign_input(input_, index, tx_serialized, key_pairs)
+        self._invalidate_cache()
         return self
 
+    def _partial_tx_messages(self):
+        """Generates the messages the Inputs of the Transaction are signed
+        with.
+
+            Note:
+                Each Input is signed with a partial Transaction that contains
+                only this very Input, without its signature. All other parts
+                of the partial Transactions are identical, so they are only
+                transformed to dictionaries once.
+
+            Returns:
+                generator of str: One serialized partial Transaction per
+                Input, in the order of `self.inputs`.
+        """
+        tx_template = {
+            'outputs': [output.to_dict() for output in self.outputs],
+            'operation': str(self.operation),
+            'metadata': self.metadata,
+            'asset': self.asset,
+            'version': self.version,
+        }
+        for input_ in self.inputs:
+            try:
+                # NOTE: `input_.fulfills` can be `None` and that's fine
+                fulfills = input_.fulfills.to_dict()
+            except AttributeError:
+                fulfills = None
+            tx_partial = dict(tx_template, inputs=[{
+                'owners_before': input_.owners_before,
+                'fulfills': fulfills,
+                'fulfillment': None,
+            }])
+            tx_partial['id'] = Transaction._to_hash(
+                Transaction._to_str(tx_partial))
+            yield Transaction._to_str(tx_partial)
+
+    @staticmethod
+    def sign_many(transactions, private_keys, pool=None):
+        """Signs many Transactions with the same private keys.
+
+            Note:
+                The given Transactions are left as they are, signed copies
+                are returned. The public keys of the private keys are only
+                derived once, or once per chunk of
+                :data:`SIGN_MANY_CHUNK_SIZE` Transactions signed by a worker
+                of the `pool` (e.g. a :class:`multiprocessing.pool.Pool`).
+
+            Args:
+                transactions (:obj:`list` of :class:`~bigchaindb.common.
+                    transaction.Transaction`): The Transactions to sign.
+                private_keys (:obj:`list` of :obj:`str`): A complete list of
+                    all private keys needed to sign all Fulfillments of the
+                    Transactions.
+                pool (optional): An object providing a `map` method to sign
+                    the Transactions concurrently.
+
+            Returns:
+                :obj:`list` of :class:`~bigchaindb.common.transaction.
+                Transaction`: The signed Transactions, in the order of
+                `transactions`.
+        """
+        if private_keys is None or not isinstance(private_keys, list):
+            raise TypeError('`private_keys` must be a list instance')
+
+        transactions = list(transactions)
+        if pool is None:
+            return _sign_chunk((transactions, private_keys))
+
+        chunks = [(transactions[i:i + SIGN_MANY_CHUNK_SIZE], private_keys)
+                  for i in range(0, len(transactions), SIGN_MANY_CHUNK_SIZE)]
+        return [tx for signed_chunk in pool.map(_sign_chunk, chunks)
+                for tx in signed_chunk]
+
     def _sign_input(self, input_, index, tx_serialized, key_pairs):
         """Signs a single Input with a partial Transaction as message.
 
@@ -753,6 +907,8 @@ class Transaction(object):
             raise KeypairMismatchException('Public key {} is not a pair to '
                                            'any of the private keys'
                                            .format(public_key))
+        # NOTE: The fulfillment was signed in place, so its URI changed
+        input_._fulfillment_uri = None
         self.inputs[index] = input_
 
     def _sign_threshold_signature_fulfillment(self, input_, index,
@@ -795,6 +951,8 @@ class Transaction(object):
             # cryptoconditions makes no assumptions of the encoding of the
             # message to sign or verify. It only accepts bytestrings
             subffill.sign(tx_serialized.encode(), private_key)
+        # NOTE: The fulfillment was signed in place, so its URI changed
+        input_._fulfillment_uri = None
         self.inputs[index] = input_
 
     def inputs_valid(self, outputs=None):
@@ -848,24 +1006,13 @@ class Transaction(object):
             raise ValueError('Inputs and '
                              'output_condition_uris must have the same count')
 
-        def gen_tx(input_, output, output_condition_uri=None):
-            """Splits multiple IO Transactions into partial single IO
-            Transactions.
-            """
-            tx = Transaction(self.operation, self.asset, [input_],
-                             self.outputs, self.metadata, self.version)
-            tx_dict = tx.to_dict()
-            tx_dict = Transaction._remove_signatures(tx_dict)
-            tx_serialized = Transaction._to_str(tx_dict)
-
-            return self.__class__._input_valid(input_,
-                                               self.operation,
+        partial_transactions = zip(self.inputs, self._partial_tx_messages(),
+                                   output_condition_uris)
+        return all(self.__class__._input_valid(input_, self.operation,
                                                tx_serialized,
                                                output_condition_uri)
-
-        partial_transactions = map(gen_tx, self.inputs,
-                                   self.outputs, output_condition_uris)
-        return all(partial_transactions)
+                   for input_, tx_serialized, output_condition_uri
+                   in partial_transactions)
 
     @staticmethod
     def _input_valid(input_, operation, tx_serialized, output_condition_uri=None):
@@ -888,10 +1035,14 @@ class Transaction(object):
                 bool: If the Input is valid.
         """
         ccffill = input_.fulfillment
-        try:
-            parsed_ffill = Fulfillment.from_uri(ccffill.serialize_uri())
-        except (TypeError, ValueError, ParsingError):
-            return False
+        if input_._fulfillment_uri is not None:
+            # NOTE: The fulfillment was already parsed from its URI
+            parsed_ffill = ccffill
+        else:
+            try:
+                parsed_ffill = Fulfillment.from_uri(ccffill.serialize_uri())
+            except (TypeError, ValueError, ParsingError):
+                return False
 
         if operation in (Transaction.CREATE, Transaction.GENESIS):
             # NOTE: In the case of a `CREATE` or `GENESIS` transaction, the
@@ -924,11 +1075,12 @@ class Transaction(object):
             'version': self.version,
         }
 
-        tx_no_signatures = Transaction._remove_signatures(tx)
-        tx_serialized = Transaction._to_str(tx_no_signatures)
-        tx_id = Transaction._to_hash(tx_serialized)
+        if self._id is None:
+            tx_no_signatures = Transaction._remove_signatures(tx)
+            self._id = Transaction._to_hash(
+                Transaction._to_str(tx_no_signatures))
 
-        tx['id'] = tx_id
+        tx['id'] = self._id
         return tx
 
     @staticmethod
@@ -936,6 +1088,13 @@ class Transaction(object):
     def _remove_signatures(tx_dict):
         """Takes a Transaction dictionary and removes all signatures.
 
+            Note:
+                Only the top level of `tx_dict` and its inputs are copied.
+                All other values (e.g. `asset` and `metadata`) are shared
+                with `tx_dict`, so the returned dictionary must be treated
+                as read-only. It is meant to be serialized for hashing or
+                signing.
+
             Args:
                 tx_dict (dict): The Transaction to remove all signatures from.
 
@@ -943,15 +1102,11 @@ class Transaction(object):
                 dict
 
         """
-        # NOTE: We remove the reference since we need `tx_dict` only for the
-        #       transaction's hash
-        tx_dict = deepcopy(tx_dict)
-        for input_ in tx_dict['inputs']:
-            # NOTE: Not all Cryptoconditions return a `signature` key (e.g.
-            #       ThresholdSha256Fulfillment), so setting it to `None` in any
-            #       case could yield incorrect signatures. This is why we only
-            #       set it to `None` if it's set in the dict.
-            input_['fulfillment'] = None
+        # NOTE: We copy only what we change, since large `asset` or
+        #       `metadata` payloads make a deep copy of `tx_dict` expensive.
+        tx_dict = dict(tx_dict)
+        tx_dict['inputs'] = [dict(input_, fulfillment=None)
+                             for input_ in tx_dict['inputs']]
         return tx_dict
 
     @staticmethod
@@ -963,7 +1118,9 @@ class Transaction(object):
         return self.to_hash()
 
     def to_hash(self):
-        return self.to_dict()['id']
+        if self._id is None:
+            self.to_dict()
+        return self._id
 
     @staticmethod
     def _to_str(value):
@@ -1015,14 +1172,14 @@ class Transaction(object):
             Args:
                 tx_body (dict): The Transaction to be transformed.
         """
-        # NOTE: Remove reference to avoid side effects
-        tx_body = deepcopy(tx_body)
+        # NOTE: `_remove_signatures` returns a shallow copy, so popping the
+        #       id off of it leaves `tx_body` untouched.
+        tx_body_no_signatures = Transaction._remove_signatures(tx_body)
         try:
-            proposed_tx_id = tx_body.pop('id')
+            proposed_tx_id = tx_body_no_signatures.pop('id')
         except KeyError:
             raise InvalidHash('No transaction id found!')
 
-        tx_body_no_signatures = Transaction._remove_signatures(tx_body)
         tx_body_serialized = Transaction._to_str(tx_body_no_signatures)
         valid_tx_id = Transaction._to_hash(tx_body_serialized)
 
@@ -1044,5 +1201,9 @@ class Transaction(object):
         cls.validate_structure(tx)
         inputs = [Input.from_dict(input_) for input_ in tx['inputs']]
         outputs = [Output.from_dict(output) for output in tx['outputs']]
-        return cls(tx['operation'], tx['asset'], inputs, outputs,
-                   tx['metadata'], tx['version'])
+        transaction = cls(tx['operation'], tx['asset'], inputs, outputs,
+                          tx['metadata'], tx['version'])
+        # NOTE: The id was just checked against the body of `tx`, so there
+        #       is no need to compute it again.
+        transaction._id = tx['id']
+        return transaction
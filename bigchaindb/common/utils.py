@@ -35,6 +35,39 @@ def serialize(data):
                            sort_keys=True)
 
 
+def serialize_into(data, stream):
+    """Serialize a dict into a stream, chunk by chunk.
+
+        The output is byte-identical to :func:`serialize`, but it is written
+        to `stream` in chunks instead of being built as one large string.
+
+        Args:
+            data (dict): dict to serialize
+            stream: An object providing a `write` method that accepts
+                UTF-8 encoded chunks (bytes).
+    """
+    try:
+        dump = rapidjson.dump
+    except AttributeError:
+        # NOTE: Older versions of python-rapidjson can't write to streams
+        stream.write(serialize(data).encode())
+        return
+    dump(data, _EncodingStream(stream), skipkeys=False, ensure_ascii=False,
+         sort_keys=True)
+
+
+class _EncodingStream(object):
+    """Forwards chunks to a stream, UTF-8 encoding them if necessary."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        self.stream.write(chunk)
+
+
 def deserialize(data):
     """Deserialize a JSON formatted string into a dict.
 
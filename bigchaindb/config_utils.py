@@ -135,6 +135,11 @@ def update_types(config, reference, list_sep=':'):
 
     def _coerce(current, value):
         # Coerce a value to the `current` type.
+        if isinstance(current, bool) and isinstance(value, str):
+            # NOTE: `bool('false')` is `True`, so booleans coming from
+            #       environment variables are parsed explicitly.
+            return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
         try:
             # First we try to apply current to the value, since it
             # might be a function
@@ -13,12 +13,12 @@ class BaseConsensusRules():
     """
 
     @staticmethod
-    def validate_transaction(bigchain, transaction):
+    def validate_transaction(bigchain, transaction, context=None):
         """See :meth:`bigchaindb.models.Transaction.validate`
         for documentation.
 
         """
-        return transaction.validate(bigchain)
+        return transaction.validate(bigchain, context)
 
     @staticmethod
     def validate_block(bigchain, block):
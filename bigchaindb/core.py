@@ -15,6 +15,20 @@ from bigchaindb.consensus import BaseConsensusRules
 from bigchaindb.models import Block, Transaction
 
 
+# the statuses of decided blocks, by block id, along with the voters they
+# were tallied for
+DECIDED_BLOCKS_CACHE_SIZE = 10000
+decided_blocks = utils.BoundedCache(DECIDED_BLOCKS_CACHE_SIZE)
+
+# the exceptions raised by the validation of an invalid transaction
+VALIDATION_ERRORS = (ValueError, exceptions.OperationError,
+                     exceptions.TransactionDoesNotExist,
+                     exceptions.TransactionOwnerError, exceptions.DoubleSpend,
+                     exceptions.InvalidHash, exceptions.InvalidSignature,
+                     exceptions.TransactionNotInValidBlock,
+                     exceptions.AmountError)
+
+
 class Bigchain(object):
     """Bigchain API
 
@@ -56,6 +70,7 @@ class Bigchain(object):
         self.me_private = private_key or bigchaindb.config['keypair']['private']
         self.nodes_except_me = keyring or bigchaindb.config['keyring']
         self.backlog_reassign_delay = backlog_reassign_delay or bigchaindb.config['backlog_reassign_delay']
+        self.block_validation_processes = bigchaindb.config['block_validation_processes']
         self.consensus = BaseConsensusRules
         self.connection = connection if connection else backend.connect(**bigchaindb.config['database'])
         if not self.me or not self.me_private:
@@ -73,6 +88,32 @@ class Bigchain(object):
         Returns:
             dict: database response
         """
+        # write to the backlog
+        return backend.query.write_transaction(self.connection, self._assign(signed_transaction))
+
+    def write_transactions(self, signed_transactions):
+        """Write several transactions to the backlog, in one request.
+
+        The transactions already in the backlog are ignored.
+
+        Args:
+            signed_transactions (:obj:`list` of :class:`~.models.Transaction`): transactions with the `signature`
+                included.
+
+        Returns:
+            dict: database response
+        """
+        return backend.query.write_transactions(self.connection, [self._assign(tx) for tx in signed_transactions])
+
+    def _assign(self, signed_transaction):
+        """Assign a transaction to a node of the federation.
+
+        Args:
+            signed_transaction (Transaction): the transaction.
+
+        Returns:
+            dict: the transaction, as written to the backlog.
+        """
         signed_transaction = signed_transaction.to_dict()
 
         # we will assign this transaction to `one` node. This way we make sure that there are no duplicate
@@ -85,9 +126,7 @@ class Bigchain(object):
 
         signed_transaction.update({'assignee': assignee})
         signed_transaction.update({'assignment_timestamp': time()})
-
-        # write to the backlog
-        return backend.query.write_transaction(self.connection, signed_transaction)
+        return signed_transaction
 
     def reassign_transaction(self, transaction):
         """Assign a transaction to a new node
@@ -138,20 +177,23 @@ class Bigchain(object):
 
         return backend.query.get_stale_transactions(self.connection, self.backlog_reassign_delay)
 
-    def validate_transaction(self, transaction):
+    def validate_transaction(self, transaction, context=None):
         """Validate a transaction.
 
         Args:
             transaction (Transaction): transaction to validate.
+            context (:class:`~.models.ValidationContext`, optional): the
+                context of the validation of the block the transaction is
+                part of.
 
         Returns:
             The transaction if the transaction is valid else it raises an
             exception describing the reason why the transaction is invalid.
         """
 
-        return self.consensus.validate_transaction(self, transaction)
+        return self.consensus.validate_transaction(self, transaction, context)
 
-    def is_valid_transaction(self, transaction):
+    def is_valid_transaction(self, transaction, context=None):
         """Check whether a transaction is valid or invalid.
 
         Similar to :meth:`~bigchaindb.Bigchain.validate_transaction`
@@ -161,6 +203,9 @@ class Bigchain(object):
         Args:
             transaction (:Class:`~bigchaindb.models.Transaction`): transaction
                 to check.
+            context (:class:`~.models.ValidationContext`, optional): the
+                context of the validation of the block the transaction is
+                part of.
 
         Returns:
             The :class:`~bigchaindb.models.Transaction` instance if valid,
@@ -168,12 +213,8 @@ class Bigchain(object):
         """
 
         try:
-            return self.validate_transaction(transaction)
-        except (ValueError, exceptions.OperationError,
-                exceptions.TransactionDoesNotExist,
-                exceptions.TransactionOwnerError, exceptions.DoubleSpend,
-                exceptions.InvalidHash, exceptions.InvalidSignature,
-                exceptions.TransactionNotInValidBlock, exceptions.AmountError):
+            return self.validate_transaction(transaction, context)
+        except VALIDATION_ERRORS:
             return False
 
     def get_block(self, block_id, include_status=False):
@@ -291,15 +332,10 @@ class Bigchain(object):
         """
 
         # First, get information on all blocks which contain this transaction
-        blocks = backend.query.get_blocks_status_from_transaction(self.connection, txid)
+        blocks = list(backend.query.get_blocks_status_from_transaction(self.connection, txid))
         if blocks:
             # Determine the election status of each block
-            validity = {
-                block['id']: self.block_election_status(
-                    block['id'],
-                    block['block']['voters']
-                ) for block in blocks
-            }
+            validity = self.get_blocks_status(blocks)
 
             # NOTE: If there are multiple valid blocks with this transaction,
             # something has gone wrong
@@ -317,7 +353,7 @@ class Bigchain(object):
         else:
             return None
 
-    def get_transactions_by_asset_id(self, asset_id):
+    def get_transactions_by_asset_id(self, asset_id, after=None, limit=None):
         """Retrieves valid or undecided transactions related to a particular
         asset.
 
@@ -325,21 +361,40 @@ class Bigchain(object):
         to query all the transactions related to a particular digital asset,
         knowing the id.
 
+        The ``CREATE`` transaction of the asset comes first, followed by the
+        ``TRANSFER`` transactions ordered by id. The history of an asset can
+        be read a page at a time by passing the id of the last transaction
+        of a page as the `after` of the next one.
+
         Args:
             asset_id (str): the id for this particular asset.
+            after (str, optional): the id of the last transaction of the
+                previous page.
+            limit (int, optional): the maximum number of transactions to
+                return. All of them are returned if not given.
 
         Returns:
             A list of valid or undecided transactions related to the asset.
             If no transaction exists for that asset it returns an empty list
-            `[]`
+            `[]`. A list shorter than `limit` is the last page.
         """
-        txids = backend.query.get_txids_by_asset_id(self.connection, asset_id)
         transactions = []
-        for txid in txids:
-            tx = self.get_transaction(txid)
-            if tx:
-                transactions.append(tx)
-        return transactions
+        while True:
+            page_size = limit - len(transactions) if limit else None
+            page = list(backend.query.get_transactions_by_asset_id(
+                self.connection, asset_id, after=after, limit=page_size))
+            found = self._transactions_in_blocks(
+                {'id': block['id'], 'block': {'voters': block['voters']},
+                 'transaction': doc['transaction']}
+                for doc in page for block in doc['blocks'])
+            transactions.extend(Transaction.from_dict(tx)
+                                for tx, _ in found.values())
+
+            # the transactions of invalid blocks only are made up for with
+            # the next page
+            if not limit or len(page) < page_size or len(transactions) == limit:
+                return transactions
+            after = page[-1]['id']
 
     def get_asset_by_id(self, asset_id):
         """Returns the asset associated with an asset_id.
@@ -369,33 +424,47 @@ class Bigchain(object):
             The transaction (Transaction) that used the `txid` as an input else
             `None`
         """
-        # checks if an input was already spent
-        # checks if the bigchain has any transaction with input {'txid': ...,
-        # 'output': ...}
-        transactions = list(backend.query.get_spent(self.connection, txid, output))
-
-        # a transaction_id should have been spent at most one time
-        if transactions:
-            # determine if these valid transactions appear in more than one valid block
-            num_valid_transactions = 0
-            for transaction in transactions:
-                # ignore invalid blocks
-                # FIXME: Isn't there a faster solution than doing I/O again?
-                if self.get_transaction(transaction['id']):
-                    num_valid_transactions += 1
-                if num_valid_transactions > 1:
+        return self.get_spent_outputs([TransactionLink(txid, output)]).get((txid, output))
+
+    def get_spent_outputs(self, links):
+        """Check which of several outputs were already used as inputs, all at once.
+
+        Args:
+            links (list): the outputs to check, as :class:`~.TransactionLink` s.
+
+        Returns:
+            dict: the transaction (Transaction) that used each of the spent
+            outputs as an input, by ``(txid, output)``.
+
+        Raises:
+            DoubleSpend: if an output was spent more than once.
+        """
+        if not links:
+            return {}
+
+        # a transaction spending the outputs is only considered if it is in a
+        # valid or undecided block
+        response = backend.query.get_spending_transactions(
+            self.connection, [link.to_dict() for link in links])
+        wanted = {(link.txid, link.output) for link in links}
+        spent = {}
+
+        for tx, _ in self._transactions_in_blocks(response).values():
+            for input_ in tx['inputs']:
+                if not input_['fulfills']:
+                    continue
+                key = (input_['fulfills']['txid'], input_['fulfills']['output'])
+                if key not in wanted:
+                    continue
+                # an output should have been spent at most one time
+                if key in spent and spent[key]['id'] != tx['id']:
                     raise exceptions.DoubleSpend(('`{}` was spent more than'
                                                   ' once. There is a problem'
                                                   ' with the chain')
-                                                 .format(txid))
+                                                 .format(key[0]))
+                spent[key] = tx
 
-            if num_valid_transactions:
-                return Transaction.from_dict(transactions[0])
-            else:
-                # all queried transactions were invalid
-                return None
-        else:
-            return None
+        return {key: Transaction.from_dict(tx) for key, tx in spent.items()}
 
     def get_owned_ids(self, owner):
         """Retrieve a list of ``txid`` s that can be used as inputs.
@@ -408,38 +477,103 @@ class Bigchain(object):
             pointing to another transaction's condition
         """
 
-        # get all transactions in which owner is in the `owners_after` list
+        # get all transactions in which owner is in the `owners_after` list,
+        # disregarding transactions from invalid blocks
         response = backend.query.get_owned_ids(self.connection, owner)
-        owned = []
+        transactions = self._transactions_in_blocks(response)
+
+        # NOTE: It's OK to not serialize the transaction here, as we do not
+        # use it after the execution of this function.
+        # a transaction can contain multiple outputs so we need to iterate over all of them
+        # to get a list of outputs available to spend. For transactions with multiple
+        # `public_keys` there will be several subfulfillments nested in the condition.
+        links = [TransactionLink(tx['id'], index)
+                 for tx, _ in transactions.values()
+                 for index, output in enumerate(tx['outputs'])
+                 if utils.condition_details_has_owner(output['condition']['details'], owner)]
+
+        # check which of the outputs were already spent, all at once
+        spent = self.get_spent_outputs(links)
+        return [link for link in links if (link.txid, link.output) not in spent]
+
+    def get_transactions(self, txids, include_status=False):
+        """Get several transactions (and optionally their statuses) at once.
+
+        This behaves like :meth:`get_transaction` for each of the `txids`, but
+        only needs a constant number of queries: one for the blocks containing
+        the transactions, one for the decisions on those blocks, one for the
+        votes on the blocks not decided yet and one for the backlog (see
+        :meth:`get_blocks_status`).
 
-        for tx in response:
-            # disregard transactions from invalid blocks
-            validity = self.get_blocks_status_containing_tx(tx['id'])
-            if Bigchain.BLOCK_VALID not in validity.values():
-                if Bigchain.BLOCK_UNDECIDED not in validity.values():
-                    continue
+        Args:
+            txids (list): ids of the transactions to get.
+            include_status (bool): also return the status of the transactions,
+                as ``(tx, status)`` tuples.
 
-            # NOTE: It's OK to not serialize the transaction here, as we do not
-            # use it after the execution of this function.
-            # a transaction can contain multiple outputs so we need to iterate over all of them
-            # to get a list of outputs available to spend
-            for index, output in enumerate(tx['outputs']):
-                # for simple signature conditions there are no subfulfillments
-                # check if the owner is in the condition `owners_after`
-                if len(output['public_keys']) == 1:
-                    if output['condition']['details']['public_key'] == owner:
-                        tx_link = TransactionLink(tx['id'], index)
-                else:
-                    # for transactions with multiple `public_keys` there will be several subfulfillments nested
-                    # in the condition. We need to iterate the subfulfillments to make sure there is a
-                    # subfulfillment for `owner`
-                    if utils.condition_details_has_owner(output['condition']['details'], owner):
-                        tx_link = TransactionLink(tx['id'], index)
-                # check if input was already spent
-                if not self.get_spent(tx_link.txid, tx_link.output):
-                    owned.append(tx_link)
-
-        return owned
+        Returns:
+            list: what :meth:`get_transaction` returns for each of the `txids`,
+            in the same order.
+        """
+
+        txids = list(txids)
+        if not txids:
+            return []
+
+        distinct_txids = list(set(txids))
+        response = backend.query.get_transactions(self.connection, distinct_txids)
+        found = self._transactions_in_blocks(response)
+
+        # the transactions found in invalid blocks only, or in no blocks, are
+        # looked for in the backlog table
+        in_backlog = [txid for txid in distinct_txids if txid not in found]
+        if in_backlog:
+            for tx in backend.query.get_transactions_from_backlog(self.connection, in_backlog):
+                found[tx['id']] = (tx, self.TX_IN_BACKLOG)
+
+        transactions = {txid: (Transaction.from_dict(tx), status)
+                        for txid, (tx, status) in found.items()}
+        if include_status:
+            return [transactions.get(txid, (None, None)) for txid in txids]
+        return [transactions.get(txid, (None, None))[0] for txid in txids]
+
+    def _transactions_in_blocks(self, response):
+        """Keep the transactions of valid or undecided blocks.
+
+        Args:
+            response (iterable): documents with a ``transaction`` along with
+                the ``id`` and ``block.voters`` of a block containing it, as
+                returned by :func:`backend.query.get_owned_ids`.
+
+        Returns:
+            :class:`collections.OrderedDict`: the distinct transactions, in
+            order, by id. Each with its status: :attr:`TX_VALID` if one of the
+            blocks containing it is valid, :attr:`TX_UNDECIDED` otherwise.
+
+        Raises:
+            DoubleSpend: if a transaction is in more than one valid block.
+        """
+        response = list(response)
+        block_status = self.get_blocks_status(response)
+
+        valid_in = collections.defaultdict(list)
+        transactions = collections.OrderedDict()
+
+        for doc in response:
+            block_id, tx = doc['id'], doc['transaction']
+            status = block_status[block_id]
+            if status == Bigchain.BLOCK_VALID:
+                valid_in[tx['id']].append(block_id)
+                if len(valid_in[tx['id']]) > 1:
+                    raise exceptions.DoubleSpend('Transaction {tx} is present in '
+                                                 'multiple valid blocks: '
+                                                 '{block_ids}'
+                                                 .format(tx=tx['id'],
+                                                         block_ids=valid_in[tx['id']]))
+                transactions[tx['id']] = (tx, self.TX_VALID)
+            elif status == Bigchain.BLOCK_UNDECIDED:
+                transactions.setdefault(tx['id'], (tx, self.TX_UNDECIDED))
+
+        return transactions
 
     def create_block(self, validated_transactions):
         """Creates a block given a list of `validated_transactions`.
@@ -518,6 +652,28 @@ class Bigchain(object):
 
         return backend.query.write_block(self.connection, block)
 
+    def repair_transactions_table(self, depth=10):
+        """Write again the transactions of the last blocks of this node to
+        the transactions table, if it is enabled.
+
+        A block is written before its transactions, so the transactions of
+        the last blocks may be missing from the transactions table if the
+        node stopped in between. The block pipeline writes one block at a
+        time, so only the last block of the node can be affected, the
+        others are repaired as a margin. Writing the transactions of a block
+        again doesn't change anything.
+
+        Args:
+            depth (int): the number of blocks to repair, the most recent
+                first.
+        """
+
+        if not self.connection.transactions_table:
+            return
+
+        for block in backend.query.get_last_blocks(self.connection, self.me, depth):
+            backend.query.write_block_transactions(self.connection, block)
+
     def transaction_exists(self, transaction_id):
         return backend.query.has_transaction(self.connection, transaction_id)
 
@@ -595,6 +751,10 @@ class Bigchain(object):
         """Write the vote to the database."""
         return backend.query.write_vote(self.connection, vote)
 
+    def write_votes(self, votes):
+        """Write several votes to the database, in one request."""
+        return backend.query.write_votes(self.connection, votes)
+
     def get_last_voted_block(self):
         """Returns the last block that this node voted on."""
 
@@ -611,9 +771,112 @@ class Bigchain(object):
         return backend.query.get_unvoted_blocks(self.connection, self.me)
 
     def block_election_status(self, block_id, voters):
-        """Tally the votes on a block, and return the status: valid, invalid, or undecided."""
+        """Tally the votes on a block, and return the status: valid, invalid, or undecided.
+
+        Once a block is decided its status can't change anymore, so the
+        status of decided blocks is kept in a process-local cache and the
+        votes are only tallied again for undecided blocks.
+        """
+
+        voters = tuple(voters)
+        decided = decided_blocks.get(block_id)
+        if decided and decided[1] == voters:
+            return decided[0]
+
+        status, _ = self.tally_votes(block_id, voters)
+        if status != Bigchain.BLOCK_UNDECIDED:
+            decided_blocks[block_id] = (status, voters)
+        return status
+
+    def get_blocks_status(self, blocks):
+        """Determine the election status of several blocks at once.
+
+        The statuses of decided blocks are taken from the process-local cache
+        first, then from the decisions recorded by the election pipeline,
+        fetched in a single query. The votes on the remaining blocks are
+        fetched in a single query as well, to be tallied.
+
+        Args:
+            blocks (iterable): the ``id`` and ``block.voters`` of each block,
+                as stored in the bigchain table.
+
+        Returns:
+            dict: the status of each block, by block id.
+        """
+
+        voters = {block['id']: tuple(block['block']['voters']) for block in blocks}
+        statuses = {}
+
+        for block_id, block_voters in voters.items():
+            decided = decided_blocks.get(block_id)
+            if decided and decided[1] == block_voters:
+                statuses[block_id] = decided[0]
+
+        not_cached = [block_id for block_id in voters if block_id not in statuses]
+        if not_cached:
+            for decision in backend.query.get_block_decisions(self.connection, not_cached):
+                block_id = decision['block_id']
+                statuses[block_id] = decision['status']
+                decided_blocks[block_id] = (decision['status'], voters[block_id])
+
+        not_decided = {block_id: block_voters for block_id, block_voters in voters.items()
+                       if block_id not in statuses}
+        if not_decided:
+            for block_id, (status, _) in self.tally_blocks(not_decided).items():
+                statuses[block_id] = status
+                if status != Bigchain.BLOCK_UNDECIDED:
+                    decided_blocks[block_id] = (status, not_decided[block_id])
+
+        return statuses
+
+    def write_block_decision(self, block_id, status, tally):
+        """Record the decision on a block once its election is over.
+
+        Args:
+            block_id (str): the id of the decided block.
+            status (str): :attr:`BLOCK_VALID` or :attr:`BLOCK_INVALID`.
+            tally (dict): the vote counts of the election, as returned by
+                :meth:`tally_votes`.
+        """
+
+        decision = {
+            'block_id': block_id,
+            'status': status,
+            'decided_at': gen_timestamp(),
+            'tally': tally,
+        }
+        return backend.query.write_block_decision(self.connection, decision)
+
+    def tally_votes(self, block_id, voters):
+        """Tally the votes on a block.
+
+        Returns:
+            tuple: the status of the block (valid, invalid, or undecided) and
+            the vote counts, e.g. ``{'valid': 3, 'invalid': 1, 'voters': 4}``.
+        """
 
         votes = list(backend.query.get_votes_by_block_id(self.connection, block_id))
+        return self._tally(block_id, voters, votes)
+
+    def tally_blocks(self, blocks):
+        """Tally the votes on several blocks, fetched in a single query.
+
+        Args:
+            blocks (dict): the voters of each block, by block id.
+
+        Returns:
+            dict: the status and vote counts of each block, by block id, as
+            returned by :meth:`tally_votes`.
+        """
+
+        votes = collections.defaultdict(list)
+        for vote in backend.query.get_votes_by_block_ids(self.connection, list(blocks)):
+            votes[vote['vote']['voting_for_block']].append(vote)
+
+        return {block_id: self._tally(block_id, voters, votes[block_id])
+                for block_id, voters in blocks.items()}
+
+    def _tally(self, block_id, voters, votes):
         n_voters = len(voters)
 
         voter_counts = collections.Counter([vote['node_pubkey'] for vote in votes])
@@ -655,8 +918,10 @@ class Bigchain(object):
         # and half 'valid'. In this case, the block should be marked invalid
         # to avoid a tie. In the case of an odd number of voters this is not
         # relevant, since one side must be a majority.
+        tally = {'valid': n_valid_votes, 'invalid': n_invalid_votes, 'voters': n_voters}
+
         if n_invalid_votes >= math.ceil(n_voters / 2):
-            return Bigchain.BLOCK_INVALID
+            return Bigchain.BLOCK_INVALID, tally
         elif n_valid_votes > math.floor(n_voters / 2):
             # The block could be valid, but we still need to check if votes
             # agree on the previous block.
@@ -671,8 +936,8 @@ class Bigchain(object):
             # If it's not, there is no majority agreement on the previous
             # block.
             if counts.most_common()[0][1] > math.floor(n_voters / 2):
-                return Bigchain.BLOCK_VALID
+                return Bigchain.BLOCK_VALID, tally
             else:
-                return Bigchain.BLOCK_INVALID
+                return Bigchain.BLOCK_INVALID, tally
         else:
-            return Bigchain.BLOCK_UNDECIDED
+            return Bigchain.BLOCK_UNDECIDED, tally
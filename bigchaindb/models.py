@@ -1,4 +1,7 @@
-from bigchaindb.common.crypto import hash_data, PublicKey, PrivateKey
+from io import BytesIO
+
+from bigchaindb.common.crypto import (PublicKey, PrivateKey,
+                                      serialize_and_hash)
 from bigchaindb.common.exceptions import (InvalidHash, InvalidSignature,
                                           OperationError, DoubleSpend,
                                           TransactionDoesNotExist,
@@ -7,14 +10,19 @@ from bigchaindb.common.exceptions import (InvalidHash, InvalidSignature,
 from bigchaindb.common.transaction import Transaction
 from bigchaindb.common.utils import gen_timestamp, serialize
 from bigchaindb.common.schema import validate_transaction_schema
+from bigchaindb import utils
 
 
 class Transaction(Transaction):
-    def validate(self, bigchain):
+    __slots__ = ()
+
+    def validate(self, bigchain, context=None):
         """Validate a transaction.
 
         Args:
             bigchain (Bigchain): an instantiated bigchaindb.Bigchain object.
+            context (:class:`~.ValidationContext`, optional): the context of
+                the validation of the block the transaction is part of.
 
         Returns:
             The transaction (Transaction) if the transaction is valid else it
@@ -33,6 +41,30 @@ class Transaction(Transaction):
             InvalidHash: if the hash of the transaction is wrong
             InvalidSignature: if the signature of the transaction is wrong
         """
+        input_conditions = self.validate_without_signatures(bigchain, context)
+
+        if not self.inputs_valid(input_conditions):
+            raise InvalidSignature()
+
+        return self
+
+    def validate_without_signatures(self, bigchain, context=None):
+        """Run all checks of :meth:`validate` except the verification of the
+        Inputs' signatures.
+
+        Args:
+            bigchain (Bigchain): an instantiated bigchaindb.Bigchain object.
+            context (:class:`~.ValidationContext`, optional): the context of
+                the validation of the block the transaction is part of.
+
+        Returns:
+            :obj:`list` of :class:`~bigchaindb.common.transaction.Output`:
+            The Outputs spent by the Inputs of the transaction, to verify the
+            Inputs against with :meth:`inputs_valid`.
+
+        Raises:
+            See :meth:`validate`, except for `InvalidSignature`.
+        """
         if len(self.inputs) == 0:
             raise ValueError('Transaction contains no inputs')
 
@@ -61,12 +93,20 @@ class Transaction(Transaction):
                 raise ValueError('Only `CREATE` transactions can have null '
                                  'inputs')
 
+            # look up all the inputs and their spenders at once, through the
+            # context of the block if there is one
+            lookup = context or bigchain
+            input_txids = [input_.fulfills.txid for input_ in self.inputs]
+            found_input_txs = dict(zip(input_txids, lookup.get_transactions(
+                input_txids, include_status=True)))
+            spent_outputs = lookup.get_spent_outputs(
+                [input_.fulfills for input_ in self.inputs])
+
             # store the inputs so that we can check if the asset ids match
             input_txs = []
             for input_ in self.inputs:
                 input_txid = input_.fulfills.txid
-                input_tx, status = bigchain.\
-                    get_transaction(input_txid, include_status=True)
+                input_tx, status = found_input_txs[input_txid]
 
                 if input_tx is None:
                     raise TransactionDoesNotExist("input `{}` doesn't exist"
@@ -77,11 +117,15 @@ class Transaction(Transaction):
                         'input `{}` does not exist in a valid block'.format(
                             input_txid))
 
-                spent = bigchain.get_spent(input_txid, input_.fulfills.output)
+                spent = spent_outputs.get((input_txid, input_.fulfills.output))
                 if spent and spent.id != self.id:
                     raise DoubleSpend('input `{}` was already spent'
                                       .format(input_txid))
 
+                if context and context.spent_in_block(input_.fulfills) not in (None, self.id):
+                    raise DoubleSpend('input `{}` was already spent in the block'
+                                      .format(input_txid))
+
                 output = input_tx.outputs[input_.fulfills.output]
                 input_conditions.append(output)
                 input_txs.append(input_tx)
@@ -114,10 +158,10 @@ class Transaction(Transaction):
             raise TypeError('`operation`: `{}` must be either {}.'
                             .format(self.operation, allowed_operations))
 
-        if not self.inputs_valid(input_conditions):
-            raise InvalidSignature()
+        if context:
+            context.consume(self)
 
-        return self
+        return input_conditions
 
     @classmethod
     def from_dict(cls, tx_body):
@@ -125,6 +169,173 @@ class Transaction(Transaction):
         return super().from_dict(tx_body)
 
 
+class ValidationContext(object):
+    """The state shared by the validation of the transactions of a Block.
+
+    A context lives for the validation of one Block, or of a contiguous
+    chunk of its transactions. It memoizes the input
+    transactions (and their statuses) and the spent outputs looked up by its
+    transactions, which often share their inputs, and keeps track of the
+    outputs consumed by the transactions validated so far, to detect double
+    spends within the Block.
+
+    Args:
+        bigchain (:class:`~bigchaindb.Bigchain`): An instantiated Bigchain
+            object.
+    """
+
+    def __init__(self, bigchain):
+        self.bigchain = bigchain
+        self._transactions = {}
+        self._spent = {}
+        self._consumed = {}
+
+    def prefetch(self, transactions):
+        """Look up the inputs of several transactions, all at once.
+
+        Args:
+            transactions (:obj:`list` of :class:`~.Transaction`): the
+                transactions that are going to be validated.
+        """
+        links = [input_.fulfills for tx in transactions
+                 for input_ in tx.inputs if input_.fulfills]
+        self.get_transactions([link.txid for link in links])
+        self.get_spent_outputs(links)
+
+    def get_transactions(self, txids, include_status=False):
+        """See :meth:`bigchaindb.Bigchain.get_transactions`."""
+        missing = list({txid for txid in txids
+                        if txid not in self._transactions})
+        if missing:
+            found = self.bigchain.get_transactions(missing, include_status=True)
+            self._transactions.update(zip(missing, found))
+
+        if include_status:
+            return [self._transactions[txid] for txid in txids]
+        return [self._transactions[txid][0] for txid in txids]
+
+    def get_spent_outputs(self, links):
+        """See :meth:`bigchaindb.Bigchain.get_spent_outputs`."""
+        keys = [(link.txid, link.output) for link in links]
+        missing = [link for link, key in zip(links, keys)
+                   if key not in self._spent]
+        if missing:
+            spent = self.bigchain.get_spent_outputs(missing)
+            for link in missing:
+                key = (link.txid, link.output)
+                self._spent[key] = spent.get(key)
+
+        return {key: self._spent[key] for key in keys if self._spent[key]}
+
+    def spent_in_block(self, link):
+        """Get the id of the transaction of the Block spending an output.
+
+        Args:
+            link (:class:`~bigchaindb.common.transaction.TransactionLink`):
+                the output.
+
+        Returns:
+            str: the id of the transaction, or `None` if none of the
+            transactions validated so far spends the output.
+        """
+        return self._consumed.get((link.txid, link.output))
+
+    def consume(self, transaction):
+        """Record the outputs spent by a valid transaction of the Block.
+
+        Args:
+            transaction (:class:`~.Transaction`): the transaction.
+        """
+        for input_ in transaction.inputs:
+            if input_.fulfills:
+                link = input_.fulfills
+                self._consumed[(link.txid, link.output)] = transaction.id
+
+    def validate(self, transactions):
+        """Validate transactions of the Block, in order.
+
+        Note:
+            If `bigchain.block_validation_processes` is set, the checks that
+            need the database still run sequentially, in this process, but
+            the CPU bound verification of the Inputs' signatures is run by a
+            pool of that many processes. Either way, the first invalid
+            transaction determines the exception that is raised.
+
+        Args:
+            transactions (:obj:`list` of :class:`~.Transaction`): the
+                transactions.
+
+        Raises:
+            An exception describing why the first invalid transaction is
+            invalid (see :meth:`~.Transaction.validate`).
+        """
+        bigchain = self.bigchain
+        if not bigchain.block_validation_processes:
+            for tx in transactions:
+                bigchain.validate_transaction(tx, self)
+            return
+
+        input_conditions = []
+        error = None
+        for tx in transactions:
+            try:
+                input_conditions.append(
+                    tx.validate_without_signatures(bigchain, self))
+            except Exception as exc:
+                # NOTE: The signatures of all previous transactions still
+                #       have to be verified, as one of them could be the
+                #       first invalid transaction.
+                error = exc
+                break
+
+        pool = utils.process_pool(bigchain.block_validation_processes)
+        verified = pool.imap(_inputs_valid,
+                             zip(transactions, input_conditions))
+        if not all(verified):
+            raise InvalidSignature()
+
+        if error is not None:
+            raise error
+
+    def consumed_outputs(self):
+        """Get the outputs spent by the transactions validated so far.
+
+        Returns:
+            :obj:`list` of :obj:`tuple`: The id of the transaction and the
+            index of each output.
+        """
+        return list(self._consumed)
+
+
+def _inputs_valid(tx_and_input_conditions):
+    """Verify the Inputs' signatures of a transaction in a worker process.
+
+    Args:
+        tx_and_input_conditions (tuple): A :class:`~.Transaction` and the
+            Outputs its Inputs spend.
+
+    Returns:
+        bool: If all Inputs are valid.
+    """
+    tx, input_conditions = tx_and_input_conditions
+    return tx.inputs_valid(input_conditions)
+
+
+def _serialize_block(block):
+    """Serialize and hash the body of a block in a single pass.
+
+    Args:
+        block (dict): The body of a block.
+
+    Returns:
+        tuple: The UTF-8 encoded serialization (bytes) and the hash (str) of
+        `block`.
+    """
+    buffer = BytesIO()
+    block_id = serialize_and_hash(block, buffer)
+    return buffer.getvalue(), block_id
+
+
 class Block(object):
     """Bundle a list of Transactions in a Block. Nodes vote on its validity.
 
@@ -140,6 +351,9 @@ class Block(object):
             integrity and validity of the creator of a Block.
     """
 
+    __slots__ = ('transactions', 'node_pubkey', 'timestamp', 'voters',
+                 'signature', '_serialized', '_id')
+
     def __init__(self, transactions=None, node_pubkey=None, timestamp=None,
                  voters=None, signature=None):
         """The Block model is mainly used for (de)serialization and integrity
@@ -174,6 +388,56 @@ class Block(object):
         self.node_pubkey = node_pubkey
         self.signature = signature
 
+    def __setattr__(self, name, value):
+        # NOTE: The signature is not part of the Block's body, so only
+        #       reassigning one of the body's attributes unseals the Block.
+        if name in ('transactions', 'node_pubkey', 'timestamp', 'voters'):
+            self._unseal()
+        super().__setattr__(name, value)
+
+    def _unseal(self):
+        """Drop the memoized serialization and id of the Block's body."""
+        self._serialized = None
+        self._id = None
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in Block.__slots__}
+
+    def __setstate__(self, state):
+        # NOTE: Restoring the attributes with `__setattr__` would unseal the
+        #       Block.
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def _seal(self):
+        """Serialize and hash the Block's body once.
+
+        Note:
+            A sealed Block reuses its serialization for `id`, `sign` and
+            `is_signature_valid` until one of its body's attributes is
+            reassigned. Mutating `transactions` in place is not tracked.
+
+        Returns:
+            bytes: The UTF-8 encoded serialization of the Block's body.
+
+        Raises:
+            OperationError: If the Block doesn't contain any transactions.
+        """
+        if self._serialized is None:
+            self._serialized, self._id = _serialize_block(self._body())
+        return self._serialized
+
+    def _body(self):
+        if len(self.transactions) == 0:
+            raise OperationError('Empty block creation is not allowed')
+
+        return {
+            'timestamp': self.timestamp,
+            'transactions': [tx.to_dict() for tx in self.transactions],
+            'node_pubkey': self.node_pubkey,
+            'voters': self.voters,
+        }
+
     def __eq__(self, other):
         try:
             other = other.to_dict()
@@ -202,7 +466,29 @@ class Block(object):
         if bigchain.has_previous_vote(self.id, self.voters):
             return self
 
-        # Check if the block was created by a federation node
+        self.validate_creator(bigchain)
+
+        # Finally: Tentative assumption that every blockchain will want to
+        # validate all transactions in each block. The inputs of all of them
+        # are looked up at once.
+        context = ValidationContext(bigchain)
+        context.prefetch(self.transactions)
+        context.validate(self.transactions)
+
+        return self
+
+    def validate_creator(self, bigchain):
+        """Validate that the Block was created and signed by a federation
+        node, without validating its transactions.
+
+        Args:
+            bigchain (:class:`~bigchaindb.Bigchain`): An instantiated Bigchain
+                object.
+
+        Raises:
+            OperationError: If a non-federation node signed the Block.
+            InvalidSignature: If a Block's signature is invalid.
+        """
         possible_voters = (bigchain.nodes_except_me + [bigchain.me])
         if self.node_pubkey not in possible_voters:
             raise OperationError('Only federation nodes can create blocks')
@@ -210,15 +496,6 @@ class Block(object):
         if not self.is_signature_valid():
             raise InvalidSignature('Block signature invalid')
 
-        # Finally: Tentative assumption that every blockchain will want to
-        # validate all transactions in each block
-        for tx in self.transactions:
-            # NOTE: If a transaction is not valid, `is_valid` will throw an
-            #       an exception and block validation will be canceled.
-            bigchain.validate_transaction(tx)
-
-        return self
-
     def sign(self, private_key):
         """Create a signature for the Block and overwrite `self.signature`.
 
@@ -229,10 +506,9 @@ class Block(object):
         Returns:
             :class:`~.Block`
         """
-        block_body = self.to_dict()
-        block_serialized = serialize(block_body['block'])
+        block_serialized = self._seal()
         private_key = PrivateKey(private_key)
-        self.signature = private_key.sign(block_serialized.encode()).decode()
+        self.signature = private_key.sign(block_serialized).decode()
         return self
 
     def is_signature_valid(self):
@@ -241,10 +517,9 @@ class Block(object):
         Returns:
             bool: Stating the validity of the Block's signature.
         """
-        block = self.to_dict()['block']
         # cc only accepts bytestring messages
-        block_serialized = serialize(block).encode()
-        public_key = PublicKey(block['node_pubkey'])
+        block_serialized = self._seal()
+        public_key = PublicKey(self.node_pubkey)
         try:
             # NOTE: CC throws a `ValueError` on some wrong signatures
             #       https://github.com/bigchaindb/cryptoconditions/issues/27
@@ -253,11 +528,14 @@ class Block(object):
             return False
 
     @classmethod
-    def from_dict(cls, block_body):
+    def from_dict(cls, block_body, tx_construct=Transaction.from_dict):
         """Transform a Python dictionary to a Block object.
 
         Args:
             block_body (dict): A block dictionary to be transformed.
+            tx_construct (callable): The function building the Block's
+                transactions from their dictionaries. It can be used to
+                defer the costly deserialization of the transactions.
 
         Returns:
             :class:`~Block`
@@ -270,8 +548,7 @@ class Block(object):
         """
         # TODO: Reuse `is_signature_valid` method here.
         block = block_body['block']
-        block_serialized = serialize(block)
-        block_id = hash_data(block_serialized)
+        block_serialized, block_id = _serialize_block(block)
         public_key = PublicKey(block['node_pubkey'])
 
         try:
@@ -287,21 +564,26 @@ class Block(object):
             #       https://github.com/bigchaindb/cryptoconditions/issues/27
             try:
                 signature_valid = public_key\
-                        .verify(block_serialized.encode(), signature)
+                        .verify(block_serialized, signature)
             except ValueError:
                 signature_valid = False
             if signature_valid is False:
                 raise InvalidSignature('Invalid block signature')
 
-        transactions = [Transaction.from_dict(tx) for tx
-                        in block['transactions']]
+        transactions = [tx_construct(tx) for tx in block['transactions']]
 
-        return cls(transactions, block['node_pubkey'],
-                   block['timestamp'], block['voters'], signature)
+        block = cls(transactions, block['node_pubkey'], block['timestamp'],
+                    block['voters'], signature)
+        # NOTE: The serialization was just checked against the block's id, so
+        #       the Block can be sealed without serializing it again.
+        block._serialized = block_serialized
+        block._id = block_id
+        return block
 
     @property
     def id(self):
-        return self.to_dict()['id']
+        self._seal()
+        return self._id
 
     def to_dict(self):
         """Transform the Block to a Python dictionary.
@@ -312,20 +594,12 @@ class Block(object):
         Raises:
             OperationError: If the Block doesn't contain any transactions.
         """
-        if len(self.transactions) == 0:
-            raise OperationError('Empty block creation is not allowed')
-
-        block = {
-            'timestamp': self.timestamp,
-            'transactions': [tx.to_dict() for tx in self.transactions],
-            'node_pubkey': self.node_pubkey,
-            'voters': self.voters,
-        }
-        block_serialized = serialize(block)
-        block_id = hash_data(block_serialized)
+        block = self._body()
+        if self._serialized is None:
+            self._serialized, self._id = _serialize_block(block)
 
         return {
-            'id': block_id,
+            'id': self._id,
             'block': block,
             'signature': self.signature,
         }
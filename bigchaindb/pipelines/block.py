@@ -6,18 +6,25 @@ function.
 """
 
 import logging
+import time
 
 from multipipes import Pipeline, Node, Pipe
 
 import bigchaindb
-from bigchaindb import backend
+from bigchaindb import backend, utils
 from bigchaindb.backend.changefeed import ChangeFeed
+from bigchaindb.common.utils import serialize
 from bigchaindb.models import Transaction
+from bigchaindb.monitor import Monitor
 from bigchaindb import Bigchain
 
 
 logger = logging.getLogger(__name__)
 
+# the weight of the arrival rate of the transactions of the last block in the
+# estimated arrival rate, when the size of the blocks is adapted
+ARRIVAL_RATE_WEIGHT = 0.5
+
 
 class BlockPipeline:
     """This class encapsulates the logic to create blocks.
@@ -29,7 +36,28 @@ class BlockPipeline:
     def __init__(self):
         """Initialize the BlockPipeline creator"""
         self.bigchain = Bigchain()
+        self.monitor = Monitor()
         self.txs = []
+        self.txs_bytes = 0
+        # the outputs spent by the transactions of the next block
+        self.consumed = set()
+
+        config = bigchaindb.config['block']
+        self.max_transactions = config['max_transactions']
+        self.max_bytes = config['max_bytes']
+        self.timeout = config['timeout']
+        self.target_latency = config['target_latency']
+        self.committed_txids_capacity = config['committed_txids_capacity']
+
+        # the number of transactions a block is created with, adapted to the
+        # arrival rate of the transactions if there is a target latency
+        self.block_size = self.max_transactions
+        self.arrival_rate = None
+        self.first_tx_time = None
+        self.last_block_time = time.time()
+        # the ids of the transactions already in a block, shared by the
+        # processes of the pipeline
+        self.committed_txids = utils.BloomFilter(self.committed_txids_capacity)
 
     def filter_tx(self, tx):
         """Filter a transaction.
@@ -46,7 +74,23 @@ class BlockPipeline:
             tx.pop('assignment_timestamp')
             return tx
 
-    def validate_tx(self, tx):
+    def filter_txs(self, txs):
+        """Filter a batch of transactions.
+
+        Args:
+            txs (list): the transactions to process. A single transaction
+                (dict) is accepted too, as the changefeed does not batch
+                the transactions if ``block.batch_size`` is ``0``.
+
+        Returns:
+            list: The transactions assigned to the current node, or
+            ``None`` if there is none.
+        """
+        if isinstance(txs, dict):
+            txs = [txs]
+        return [tx for tx in txs if self.filter_tx(tx)] or None
+
+    def validate_tx(self, tx, committed=None):
         """Validate a transaction.
 
         Also checks if the transaction already exists in the blockchain. If it
@@ -54,19 +98,24 @@ class BlockPipeline:
 
         Args:
             tx (dict): the transaction to validate.
+            committed (set, optional): the ids of the transactions of the
+                batch already in a block, as returned by
+                :meth:`committed_among`. Looked up if not given.
 
         Returns:
             :class:`~bigchaindb.models.Transaction`: The transaction if valid,
             ``None`` otherwise.
         """
         tx = Transaction.from_dict(tx)
-        if self.bigchain.transaction_exists(tx.id):
+        if committed is None:
+            committed = self.committed_among([tx.id])
+        if tx.id in committed:
             # if the transaction already exists, we must check whether
             # it's in a valid or undecided block
-            tx, status = self.bigchain.get_transaction(tx.id,
-                                                       include_status=True)
-            if status == self.bigchain.TX_VALID \
-               or status == self.bigchain.TX_UNDECIDED:
+            blocks_status = self.bigchain.get_blocks_status_containing_tx(tx.id)
+            if blocks_status and (
+                    self.bigchain.BLOCK_VALID in blocks_status.values() or
+                    self.bigchain.BLOCK_UNDECIDED in blocks_status.values()):
                 # if the tx is already in a valid or undecided block,
                 # then it no longer should be in the backlog, or added
                 # to a new block. We can delete and drop it.
@@ -82,30 +131,190 @@ class BlockPipeline:
             self.bigchain.delete_transaction(tx.id)
             return None
 
-    def create(self, tx, timeout=False):
+    def validate_txs(self, txs):
+        """Validate a batch of transactions.
+
+        The size of the valid transactions is computed here too, as this
+        node runs in several processes.
+
+        Args:
+            txs (list): the transactions to validate.
+
+        Returns:
+            list: The valid transactions, as
+            :class:`~bigchaindb.models.Transaction` instances along with
+            their size (see :meth:`tx_bytes`), or ``None`` if there is none.
+        """
+        committed = self.committed_among([tx['id'] for tx in txs])
+        valid = (self.validate_tx(tx, committed) for tx in txs)
+        return [(tx, self.tx_bytes(tx)) for tx in valid if tx] or None
+
+    def committed_among(self, txids):
+        """Get which of several transactions are already in a block.
+
+        Note:
+            The transactions whose id is in :attr:`committed_txids` are
+            assumed to be in a block, their statuses are checked later on.
+            As the filter only learns about the blocks of the other nodes
+            through a changefeed, which may lag, the other ids are looked up
+            in the bigchain, all at once.
+
+        Args:
+            txids (list): the ids of the transactions.
+
+        Returns:
+            set: The ids of the transactions that may be in a block.
+        """
+        committed = {txid for txid in txids if txid in self.committed_txids}
+        missing = [txid for txid in txids if txid not in committed]
+        if missing:
+            found = set(backend.query.get_txids_in_blocks(
+                self.bigchain.connection, missing))
+            self.add_committed_txids(found)
+            committed |= found
+        return committed
+
+    def tx_bytes(self, tx):
+        """Get the size of a transaction once serialized.
+
+        Args:
+            tx (:class:`~bigchaindb.models.Transaction`): the transaction.
+
+        Returns:
+            int: The size in bytes, or ``0`` if the size of the blocks is
+            not limited by :attr:`max_bytes`.
+        """
+        if not self.max_bytes:
+            return 0
+        return len(serialize(tx.to_dict()).encode())
+
+    def create(self, tx, timeout=False, tx_bytes=None):
         """Create a block.
 
         This method accumulates transactions to put in a block and outputs
         a block when one of the following conditions is true:
-        - the size limit of the block has been reached, or
+        - the block has :attr:`block_size` transactions, or
+        - the next transaction would make it bigger than :attr:`max_bytes`
+          once serialized, or
+        - the first of its transactions has been waiting for
+          :attr:`target_latency` seconds, if there is one, or
         - a timeout happened.
 
+        A transaction spending an output already spent by a transaction of
+        the next block is a double spend: it is dropped and deleted from the
+        backlog, otherwise the whole block would be voted invalid.
+
         Args:
             tx (:class:`~bigchaindb.models.Transaction`): the transaction
                 to validate, might be None if a timeout happens.
             timeout (bool): ``True`` if a timeout happened
                 (Default: ``False``).
+            tx_bytes (int): the size of the transaction (see
+                :meth:`tx_bytes`), computed if not given.
 
         Returns:
             :class:`~bigchaindb.models.Block`: The block,
             if a block is ready, or ``None``.
         """
+        block = None
+        if tx and self._spends_consumed_output(tx):
+            self.bigchain.delete_transaction(tx.id)
+            tx = None
+
         if tx:
+            if tx_bytes is None:
+                tx_bytes = self.tx_bytes(tx)
+            if self.txs and self.max_bytes and \
+               self.txs_bytes + tx_bytes > self.max_bytes:
+                block = self._create_block()
+            if not self.txs:
+                self.first_tx_time = time.time()
             self.txs.append(tx)
-        if len(self.txs) == 1000 or (timeout and self.txs):
-            block = self.bigchain.create_block(self.txs)
-            self.txs = []
-            return block
+            self.txs_bytes += tx_bytes
+            self.consumed.update(self._spent_outputs(tx))
+
+        if not block and self.txs and (
+                len(self.txs) >= self.block_size or timeout or
+                self.target_latency and
+                time.time() - self.first_tx_time >= self.target_latency):
+            block = self._create_block()
+        return block
+
+    def create_blocks(self, txs=None, timeout=False):
+        """Create blocks from a batch of transactions.
+
+        See :meth:`create`, a batch can fill several blocks.
+
+        Args:
+            txs (list): the valid transactions along with their size, as
+                returned by :meth:`validate_txs`, might be None if a timeout
+                happens.
+            timeout (bool): ``True`` if a timeout happened
+                (Default: ``False``).
+
+        Yields:
+            :class:`~bigchaindb.models.Block`: The blocks that are ready.
+        """
+        for tx, tx_bytes in txs or []:
+            block = self.create(tx, tx_bytes=tx_bytes)
+            if block:
+                yield block
+
+        block = self.create(None, timeout=timeout)
+        if block:
+            yield block
+
+    def _create_block(self):
+        """Create a block with the accumulated transactions."""
+        now = time.time()
+        if self.target_latency:
+            self._adapt_block_size(now)
+        self.last_block_time = now
+
+        self.monitor.gauge('block.transactions', len(self.txs))
+        if self.max_bytes:
+            self.monitor.gauge('block.bytes', self.txs_bytes)
+
+        block = self.bigchain.create_block(self.txs)
+        self.txs = []
+        self.txs_bytes = 0
+        self.consumed = set()
+        return block
+
+    @staticmethod
+    def _spent_outputs(tx):
+        """The outputs spent by a transaction, as (txid, output) pairs."""
+        return [(input_.fulfills.txid, input_.fulfills.output)
+                for input_ in tx.inputs if input_.fulfills]
+
+    def _spends_consumed_output(self, tx):
+        """Check whether a transaction spends an output already spent by a
+        transaction of the next block."""
+        return any(output in self.consumed
+                   for output in self._spent_outputs(tx))
+
+    def _adapt_block_size(self, now):
+        """Size the next blocks to hold the transactions arriving during
+        :attr:`target_latency` seconds.
+
+        The arrival rate of the transactions is estimated from the
+        transactions received since the previous block, weighted with the
+        previous estimations.
+        """
+        elapsed = now - self.last_block_time
+        if elapsed <= 0:
+            return
+
+        rate = len(self.txs) / elapsed
+        if self.arrival_rate is None:
+            self.arrival_rate = rate
+        else:
+            self.arrival_rate = (ARRIVAL_RATE_WEIGHT * rate +
+                                 (1 - ARRIVAL_RATE_WEIGHT) * self.arrival_rate)
+
+        block_size = int(self.arrival_rate * self.target_latency)
+        self.block_size = min(self.max_transactions, max(1, block_size))
+        self.monitor.gauge('block.target_size', self.block_size)
 
     def write(self, block):
         """Write the block to the Database.
@@ -119,9 +328,29 @@ class BlockPipeline:
         """
         logger.info('Write new block %s with %s transactions',
                     block.id, len(block.transactions))
+        self.add_committed_txids(tx.id for tx in block.transactions)
         self.bigchain.write_block(block)
         return block
 
+    def add_committed_txids(self, txids):
+        """Add the ids of transactions written in a block to
+        :attr:`committed_txids`.
+
+        Args:
+            txids (iterable): the ids of the transactions.
+        """
+        for txid in txids:
+            self.committed_txids.add(txid)
+
+    def add_committed_block(self, block):
+        """Add the ids of the transactions of a block written by any node to
+        :attr:`committed_txids`.
+
+        Args:
+            block (dict): the block, as written in the bigchain table.
+        """
+        self.add_committed_txids(tx['id'] for tx in block['block']['transactions'])
+
     def delete_tx(self, block):
         """Delete transactions.
 
@@ -136,17 +365,17 @@ class BlockPipeline:
         return block
 
 
-def create_pipeline():
+def create_pipeline(block_pipeline=None):
     """Create and return the pipeline of operations to be distributed
     on different processes."""
 
-    block_pipeline = BlockPipeline()
+    block_pipeline = block_pipeline or BlockPipeline()
 
     pipeline = Pipeline([
         Pipe(maxsize=1000),
-        Node(block_pipeline.filter_tx),
-        Node(block_pipeline.validate_tx, fraction_of_cores=1),
-        Node(block_pipeline.create, timeout=1),
+        Node(block_pipeline.filter_txs),
+        Node(block_pipeline.validate_txs, fraction_of_cores=1),
+        Node(block_pipeline.create_blocks, timeout=block_pipeline.timeout),
         Node(block_pipeline.write),
         Node(block_pipeline.delete_tx),
     ])
@@ -154,15 +383,49 @@ def create_pipeline():
     return pipeline
 
 
+def create_committed_pipeline(block_pipeline):
+    """Create and return the pipeline adding the transactions of the blocks
+    written by any node to the committed transactions of `block_pipeline`."""
+
+    return Pipeline([
+        Node(block_pipeline.add_committed_block),
+    ])
+
+
 def get_changefeed():
     connection = backend.connect(**bigchaindb.config['database'])
+    config = bigchaindb.config['block']
     return backend.get_changefeed(connection, 'backlog',
-                                  ChangeFeed.INSERT | ChangeFeed.UPDATE)
+                                  ChangeFeed.INSERT | ChangeFeed.UPDATE,
+                                  batch_size=config['batch_size'],
+                                  batch_timeout=config['batch_timeout'])
+
+
+def get_committed_changefeed():
+    connection = backend.connect(**bigchaindb.config['database'])
+    return backend.get_changefeed(connection, 'bigchain', ChangeFeed.INSERT)
 
 
 def start():
-    """Create, start, and return the block pipeline."""
-    pipeline = create_pipeline()
+    """Create, start, and return the block pipeline.
+
+    The pipeline following the blocks written by any node is available as
+    the ``committed_pipeline`` attribute of the returned pipeline.
+    """
+    block_pipeline = BlockPipeline()
+    block_pipeline.bigchain.repair_transactions_table()
+
+    # the new blocks are followed before the transactions of the existing
+    # ones are read, so that no block is missed in between. The block
+    # pipeline only starts once all of them were read.
+    committed_pipeline = create_committed_pipeline(block_pipeline)
+    committed_pipeline.setup(indata=get_committed_changefeed())
+    committed_pipeline.start()
+    block_pipeline.add_committed_txids(
+        backend.query.get_txids_in_blocks(block_pipeline.bigchain.connection))
+
+    pipeline = create_pipeline(block_pipeline)
     pipeline.setup(indata=get_changefeed())
     pipeline.start()
+    pipeline.committed_pipeline = committed_pipeline
     return pipeline
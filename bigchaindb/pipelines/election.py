@@ -28,6 +28,9 @@ class Election:
         """
         Checks if block has enough invalid votes to make a decision
 
+        Once the block is decided, the decision is recorded so that the votes
+        don't need to be tallied again when looking up its status.
+
         Args:
             next_vote: The next vote.
 
@@ -35,8 +38,11 @@ class Election:
         next_block = self.bigchain.get_block(
             next_vote['vote']['voting_for_block'])
 
-        block_status = self.bigchain.block_election_status(next_block['id'],
-                                                           next_block['block']['voters'])
+        block_status, tally = self.bigchain.tally_votes(next_block['id'],
+                                                        next_block['block']['voters'])
+        if block_status != self.bigchain.BLOCK_UNDECIDED:
+            self.bigchain.write_block_decision(next_block['id'], block_status, tally)
+
         if block_status == self.bigchain.BLOCK_INVALID:
             return Block.from_dict(next_block)
 
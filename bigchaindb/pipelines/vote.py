@@ -6,6 +6,9 @@ function.
 """
 
 import logging
+import math
+import multiprocessing as mp
+import time
 from collections import Counter
 
 from multipipes import Pipeline, Node
@@ -13,14 +16,19 @@ from multipipes import Pipeline, Node
 import bigchaindb
 from bigchaindb import Bigchain
 from bigchaindb import backend
+from bigchaindb.core import VALIDATION_ERRORS
 from bigchaindb.backend.changefeed import ChangeFeed
-from bigchaindb.consensus import BaseConsensusRules
-from bigchaindb.models import Transaction, Block
+from bigchaindb.models import Transaction, Block, ValidationContext
 from bigchaindb.common import exceptions
 
 
 logger = logging.getLogger(__name__)
 
+# the number of chunks the transactions of a block are split into, for each
+# process validating them. A few chunks per process balance the load when
+# some transactions take longer to validate than others.
+CHUNKS_PER_PROCESS = 2
+
 
 class Vote:
     """This class encapsulates the logic to vote on blocks.
@@ -32,115 +40,169 @@ class Vote:
     def __init__(self):
         """Initialize the Block voter."""
 
-        # Since cannot share a connection to RethinkDB using multiprocessing,
-        # we need to create a temporary instance of BigchainDB that we use
-        # only to query RethinkDB
-        self.consensus = BaseConsensusRules
-
         # This is the Bigchain instance that will be "shared" (aka: copied)
         # by all the subprocesses
         self.bigchain = Bigchain()
         self.last_voted_id = Bigchain().get_last_voted_block().id
 
         self.counters = Counter()
-        self.validity = {}
-
-        self.invalid_dummy_tx = Transaction.create([self.bigchain.me],
-                                                   [([self.bigchain.me], 1)])
-
-    def validate_block(self, block):
-        if not self.bigchain.has_previous_vote(block['id'],
-                                               block['block']['voters']):
-            try:
-                block = Block.from_dict(block)
-            except (exceptions.InvalidHash, exceptions.InvalidSignature):
-                # XXX: if a block is invalid we should skip the `validate_tx`
-                # step, but since we are in a pipeline we cannot just jump to
-                # another function. Hackish solution: generate an invalid
-                # transaction and propagate it to the next steps of the
-                # pipeline.
-                return block['id'], [self.invalid_dummy_tx]
-            try:
-                self.consensus.validate_block(self.bigchain, block)
-            except (exceptions.InvalidHash,
-                    exceptions.OperationError,
-                    exceptions.InvalidSignature):
-                # XXX: if a block is invalid we should skip the `validate_tx`
-                # step, but since we are in a pipeline we cannot just jump to
-                # another function. Hackish solution: generate an invalid
-                # transaction and propagate it to the next steps of the
-                # pipeline.
-                return block.id, [self.invalid_dummy_tx]
-            return block.id, block.transactions
-
-    def ungroup(self, block_id, transactions):
-        """Given a block, ungroup the transactions in it.
+        self.consumed = {}
+        self.voted = set()
 
-        Args:
-            block_id (str): the id of the block in progress.
-            transactions (list(Transaction)): transactions of the block in
-                progress.
+        self.num_chunks = CHUNKS_PER_PROCESS * mp.cpu_count()
 
-        Returns:
-            ``None`` if the block has been already voted, an iterator that
-            yields a transaction, block id, and the total number of
-            transactions contained in the block otherwise.
-        """
+        config = bigchaindb.config['vote']
+        self.batch_size = config['batch_size']
+        self.batch_timeout = config['batch_timeout']
+        self.votes = []
+        self.first_vote_time = None
 
-        num_tx = len(transactions)
-        for tx in transactions:
-            yield tx, block_id, num_tx
+    def validate_block(self, block_dict):
+        """Validate a block, without its transactions, and split them into
+        contiguous chunks.
 
-    def validate_tx(self, tx, block_id, num_tx):
-        """Validate a transaction.
+        The transactions are not deserialized here: each chunk is
+        deserialized and validated by :meth:`validate_chunk`, in parallel.
 
         Args:
-            tx (dict): the transaction to validate
-            block_id (str): the id of block containing the transaction
-            num_tx (int): the total number of transactions to process
+            block_dict (dict): the block to validate.
 
-        Returns:
-            Three values are returned, the validity of the transaction,
-            ``block_id``, ``num_tx``.
+        Yields:
+            Nothing if the block has been already voted, otherwise the block
+            id, the number of chunks and a chunk of transactions, for each
+            chunk. If the block itself is invalid, its only chunk is
+            ``None``.
         """
-        return bool(self.bigchain.is_valid_transaction(tx)), block_id, num_tx
+        if self.bigchain.has_previous_vote(block_dict['id'],
+                                           block_dict['block']['voters']):
+            return
+
+        try:
+            block = Block.from_dict(block_dict, tx_construct=lambda tx: tx)
+            block.validate_creator(self.bigchain)
+        except (exceptions.InvalidHash,
+                exceptions.OperationError,
+                exceptions.InvalidSignature):
+            yield block_dict['id'], 1, None
+            return
+
+        transactions = block.transactions
+        if not transactions:
+            yield block.id, 1, None
+            return
+
+        chunk_size = max(1, math.ceil(len(transactions) / self.num_chunks))
+        num_chunks = math.ceil(len(transactions) / chunk_size)
+        for i in range(0, len(transactions), chunk_size):
+            yield block.id, num_chunks, transactions[i:i + chunk_size]
+
+    def validate_chunk(self, block_id, num_chunks, transactions):
+        """Validate a chunk of the transactions of a block.
+
+        The transactions share a
+        :class:`~bigchaindb.models.ValidationContext`, and the validation
+        stops at the first invalid one.
+
+        Args:
+            block_id (str): the id of block containing the transactions.
+            num_chunks (int): the total number of chunks of the block.
+            transactions (list): the transactions to validate, as dicts, or
+                ``None`` if the block itself is invalid.
 
-    def vote(self, tx_validity, block_id, num_tx):
-        """Collect the validity of transactions and cast a vote when ready.
+        Returns:
+            Four values are returned: ``block_id``, ``num_chunks``, the
+            validity of the chunk and the outputs spent by its transactions.
+        """
+        if transactions is None:
+            return block_id, num_chunks, False, []
+
+        try:
+            transactions = [Transaction.from_dict(tx) for tx in transactions]
+        except (exceptions.ValidationError, exceptions.InvalidSignature):
+            return block_id, num_chunks, False, []
+
+        context = ValidationContext(self.bigchain)
+        try:
+            # NOTE: prefetching fails e.g. if two transactions of the
+            #       bigchain, maybe of this very block, spend the same output
+            context.prefetch(transactions)
+            context.validate(transactions)
+        except VALIDATION_ERRORS:
+            return block_id, num_chunks, False, []
+        return block_id, num_chunks, True, context.consumed_outputs()
+
+    def vote(self, block_id, num_chunks, chunk_validity, consumed):
+        """Collect the validity of the chunks of a block and cast a vote
+        when ready.
+
+        The block is voted invalid as soon as one of its chunks is invalid,
+        or spends an output already spent by another chunk. The chunks of
+        the block validated afterwards are ignored.
 
         Args:
-            tx_validity (bool): the validity of the transaction
-            block_id (str): the id of block containing the transaction
-            num_tx (int): the total number of transactions to process
+            block_id (str): the id of block containing the chunk.
+            num_chunks (int): the total number of chunks of the block.
+            chunk_validity (bool): the validity of the chunk.
+            consumed (list): the outputs spent by the transactions of the
+                chunk.
 
         Returns:
             None, or a vote if a decision has been reached.
         """
-
         self.counters[block_id] += 1
-        self.validity[block_id] = tx_validity and self.validity.get(block_id,
-                                                                    True)
-
-        if self.counters[block_id] == num_tx:
-            vote = self.bigchain.vote(block_id,
-                                      self.last_voted_id,
-                                      self.validity[block_id])
-            self.last_voted_id = block_id
+        done = self.counters[block_id] == num_chunks
+
+        vote = None
+        if block_id not in self.voted:
+            outputs = self.consumed.setdefault(block_id, set())
+            valid = chunk_validity and outputs.isdisjoint(consumed)
+            outputs.update(consumed)
+            if done or not valid:
+                vote = self.bigchain.vote(block_id, self.last_voted_id, valid)
+                self.last_voted_id = block_id
+                self.voted.add(block_id)
+
+        if done:
             del self.counters[block_id]
-            del self.validity[block_id]
-            return vote
+            self.consumed.pop(block_id, None)
+            self.voted.discard(block_id)
+        return vote
 
-    def write_vote(self, vote):
-        """Write vote to the database.
+    def write_vote(self, vote=None, timeout=False):
+        """Write votes to the database, in batches.
+
+        The votes are written once :attr:`batch_size` of them are pending,
+        once the first of them has been waiting for :attr:`batch_timeout`
+        seconds, or when a timeout happens. A batch is only written once the
+        previous one has been, so a vote is never written before the votes
+        of the previous batches it was chained to. Within a batch, the
+        ordering depends on the backend (see
+        :func:`~bigchaindb.backend.query.write_votes`).
 
         Args:
-            vote: the vote to write.
+            vote: the vote to write, might be None if a timeout happens.
+            timeout (bool): ``True`` if a timeout happened
+                (Default: ``False``).
+
+        Returns:
+            list: The votes written, or ``None`` if none was.
         """
-        validity = 'valid' if vote['vote']['is_block_valid'] else 'invalid'
-        logger.info("Voting '%s' for block %s", validity,
-                    vote['vote']['voting_for_block'])
-        self.bigchain.write_vote(vote)
-        return vote
+        if vote:
+            if not self.votes:
+                self.first_vote_time = time.time()
+            self.votes.append(vote)
+
+        if self.votes and (
+                len(self.votes) >= self.batch_size or timeout or
+                time.time() - self.first_vote_time >= self.batch_timeout):
+            votes, self.votes = self.votes, []
+            for vote in votes:
+                validity = ('valid' if vote['vote']['is_block_valid']
+                            else 'invalid')
+                logger.info("Voting '%s' for block %s", validity,
+                            vote['vote']['voting_for_block'])
+            self.bigchain.write_votes(votes)
+            return votes
 
 
 def initial():
@@ -158,10 +220,9 @@ def create_pipeline():
 
     vote_pipeline = Pipeline([
         Node(voter.validate_block),
-        Node(voter.ungroup),
-        Node(voter.validate_tx, fraction_of_cores=1),
+        Node(voter.validate_chunk, fraction_of_cores=1),
         Node(voter.vote),
-        Node(voter.write_vote)
+        Node(voter.write_vote, timeout=voter.batch_timeout)
     ])
 
     return vote_pipeline
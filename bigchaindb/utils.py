@@ -1,7 +1,11 @@
+import collections
 import contextlib
+import hashlib
+import math
 import threading
 import queue
 import multiprocessing as mp
+import os
 
 from bigchaindb.common import crypto
 from bigchaindb.common.utils import serialize
@@ -84,6 +88,103 @@ def pool(builder, size, timeout=None):
     return pooled
 
 
+_process_pools = {}
+
+
+def process_pool(processes):
+    """Return a process pool with `processes` workers.
+
+    The pool is created on first use and then reused by the calling process.
+    Since a pool can't be used from a forked child, every process gets a pool
+    of its own.
+
+    Args:
+        processes (int): the number of worker processes.
+
+    Returns:
+        :class:`multiprocessing.pool.Pool`
+    """
+    key = (os.getpid(), processes)
+    if key not in _process_pools:
+        _process_pools[key] = mp.Pool(processes)
+    return _process_pools[key]
+
+
+class BoundedCache(object):
+    """A thread-safe mapping holding at most `size` entries.
+
+    When full, the least recently used entry is dropped to make room for a
+    new one.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class BloomFilter(object):
+    """A set of strings that can tell for sure that a string was never
+    added to it, within a fixed amount of memory.
+
+    The bits of the filter are allocated in shared memory, so that the
+    strings added by any of the processes forked after its creation are seen
+    by all of them.
+
+    Args:
+        capacity (int): the number of strings the filter is sized for. More
+            strings can be added, at the cost of more false positives.
+        error_rate (float): the rate of false positives of the filter, once
+            `capacity` strings were added to it.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = mp.RawArray('B', (self.size + 7) // 8)
+        self._lock = mp.Lock()
+
+    def _positions(self, item):
+        # the positions of the bits of `item` are derived from two hashes
+        # of it (Kirsch-Mitzenmacher)
+        digest = hashlib.sha256(item.encode()).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big')
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        # the bits are only ever set, so they can be read without the lock
+        with self._lock:
+            for position in self._positions(item):
+                self._bits[position // 8] |= 1 << position % 8
+
+    def __contains__(self, item):
+        return all(self._bits[position // 8] & 1 << position % 8
+                   for position in self._positions(item))
+
+
 # TODO: Rename this function, it's handling fulfillments not conditions
 def condition_details_has_owner(condition_details, owner):
     """
@@ -4,27 +4,26 @@ For more information please refer to the documentation on ReadTheDocs:
  - https://docs.bigchaindb.com/projects/server/en/latest/drivers-clients/
    http-client-server-api.html
 """
+import json
+
 from flask import current_app, request
 from flask_restful import Resource
 
 from bigchaindb.common.exceptions import (
-    AmountError,
-    DoubleSpend,
-    InvalidHash,
     InvalidSignature,
     SchemaValidationError,
-    OperationError,
-    TransactionDoesNotExist,
-    TransactionOwnerError,
-    TransactionNotInValidBlock,
     ValidationError,
 )
 
 import bigchaindb
-from bigchaindb.models import Transaction
+from bigchaindb.core import VALIDATION_ERRORS
+from bigchaindb.models import Transaction, ValidationContext
 from bigchaindb.web.views.base import make_error
 
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
 class TransactionApi(Resource):
     def get(self, tx_id):
         """API endpoint to get details about a transaction.
@@ -50,49 +49,123 @@ class TransactionListApi(Resource):
     def post(self):
         """API endpoint to push transactions to the Federation.
 
+        The body is either a transaction, a JSON array of transactions, or
+        transactions separated by newlines (NDJSON, with the
+        ``application/x-ndjson`` content type).
+
         Return:
-            A ``dict`` containing the data about the transaction.
+            A ``dict`` containing the data about the transaction, or a
+            ``list`` with the result of each of the transactions.
         """
-        pool = current_app.config['bigchain_pool']
-        monitor = current_app.config['monitor']
+        if request.mimetype == NDJSON_MIMETYPE:
+            lines = request.get_data(as_text=True).splitlines()
+            return self.post_batch([line for line in lines if line.strip()])
 
         # `force` will try to format the body of the POST request even if the
         # `content-type` header is not set to `application/json`
         tx = request.get_json(force=True)
+        if isinstance(tx, list):
+            return self.post_batch(tx)
+
+        pool = current_app.config['bigchain_pool']
+        monitor = current_app.config['monitor']
 
         try:
             tx_obj = Transaction.from_dict(tx)
-        except SchemaValidationError as e:
-            return make_error(
-                400,
-                message='Invalid transaction schema: {}'.format(
-                    e.__cause__.message)
-            )
         except (ValidationError, InvalidSignature) as e:
-            return make_error(
-                400,
-                'Invalid transaction ({}): {}'.format(type(e).__name__, e)
-            )
+            return make_error(400, _invalid_transaction_message(e))
 
         with pool() as bigchain:
             try:
                 bigchain.validate_transaction(tx_obj)
-            except (ValueError,
-                    OperationError,
-                    TransactionDoesNotExist,
-                    TransactionOwnerError,
-                    DoubleSpend,
-                    InvalidHash,
-                    InvalidSignature,
-                    TransactionNotInValidBlock,
-                    AmountError) as e:
-                return make_error(
-                    400,
-                    'Invalid transaction ({}): {}'.format(type(e).__name__, e)
-                )
+            except VALIDATION_ERRORS as e:
+                return make_error(400, _invalid_transaction_message(e))
             else:
                 rate = bigchaindb.config['statsd']['rate']
                 with monitor.timer('write_transaction', rate=rate):
                     bigchain.write_transaction(tx_obj)
 
         return tx
+
+    def post_batch(self, txs):
+        """Push a batch of transactions to the Federation.
+
+        The inputs of the transactions are looked up all at once, and the
+        valid transactions are written to the backlog in one request.
+
+        Args:
+            txs (list): the transactions, as dicts, or as the JSON strings
+                of the lines of a NDJSON body.
+
+        Return:
+            A ``list`` with, for each transaction, its id and the ``200``
+            status if it was accepted, or the ``400`` status and the reason
+            why it was rejected. Batches of more than
+            ``server.max_batch_size`` transactions are rejected.
+        """
+        max_batch_size = bigchaindb.config['server']['max_batch_size']
+        if len(txs) > max_batch_size:
+            return make_error(
+                413,
+                'Too many transactions: at most {} can be pushed at once'
+                .format(max_batch_size)
+            )
+
+        pool = current_app.config['bigchain_pool']
+        monitor = current_app.config['monitor']
+
+        results = [None] * len(txs)
+        tx_objs = []
+        for i, tx in enumerate(txs):
+            if isinstance(tx, str):
+                try:
+                    tx = json.loads(tx)
+                except ValueError as e:
+                    results[i] = {'status': 400,
+                                  'message': 'Invalid JSON: {}'.format(e)}
+                    continue
+            try:
+                tx_objs.append((i, Transaction.from_dict(tx)))
+            except (ValidationError, InvalidSignature) as e:
+                results[i] = {'status': 400,
+                              'message': _invalid_transaction_message(e)}
+
+        with pool() as bigchain:
+            # the transactions of the batch cannot spend the same outputs
+            context = ValidationContext(bigchain)
+            try:
+                context.prefetch([tx_obj for _, tx_obj in tx_objs])
+            except VALIDATION_ERRORS:
+                # an output is already spent twice: the inputs are looked up
+                # along with each transaction instead, to find the invalid
+                # ones
+                pass
+
+            valid_txs = []
+            for i, tx_obj in tx_objs:
+                try:
+                    bigchain.validate_transaction(tx_obj, context)
+                except VALIDATION_ERRORS as e:
+                    results[i] = {'status': 400,
+                                  'message': _invalid_transaction_message(e)}
+                else:
+                    results[i] = {'status': 200, 'id': tx_obj.id}
+                    valid_txs.append(tx_obj)
+
+            if valid_txs:
+                rate = bigchaindb.config['statsd']['rate']
+                with monitor.timer('write_transactions', rate=rate):
+                    bigchain.write_transactions(valid_txs)
+
+        return results
+
+
+def _invalid_transaction_message(exc):
+    """Return the message of the error response for an invalid transaction.
+
+    Args:
+        exc (Exception): the exception raised by the transaction.
+    """
+    if isinstance(exc, SchemaValidationError):
+        return 'Invalid transaction schema: {}'.format(exc.__cause__.message)
+    return 'Invalid transaction ({}): {}'.format(type(exc).__name__, exc)
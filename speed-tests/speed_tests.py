@@ -89,9 +89,65 @@ def speedtest_deserialize_block_rapidjson():
     print('speedtest_deserialize_block_rapidjson: {} s'.format(time_elapsed))
 
 
+def speedtest_validate_transaction_schema():
+    import jsonschema
+    from bigchaindb.common.schema import TX_SCHEMA, validate_transaction_schema
+    from bigchaindb.models import Transaction
+
+    # create a transaction
+    b = bigchaindb.Bigchain()
+    tx = Transaction.create([b.me], [([b.me], 1)])
+    tx_dict = tx.sign([b.me_private]).to_dict()
+
+    time_start = time.time()
+    for _ in range(1000):
+        jsonschema.validate(tx_dict, TX_SCHEMA)
+    time_elapsed = time.time() - time_start
+
+    print('speedtest_validate_transaction_schema (jsonschema.validate): '
+          '{} ms/tx'.format(time_elapsed))
+
+    time_start = time.time()
+    for _ in range(1000):
+        validate_transaction_schema(tx_dict)
+    time_elapsed = time.time() - time_start
+
+    print('speedtest_validate_transaction_schema (prebuilt validator): '
+          '{} ms/tx'.format(time_elapsed))
+
+
+def speedtest_block_memory_and_pickle_size():
+    import pickle
+    import tracemalloc
+    from bigchaindb.models import Transaction
+
+    b = bigchaindb.Bigchain()
+
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    txs = [Transaction.create([b.me], [([b.me], 1)], metadata={'i': i})
+           for i in range(1000)]
+    txs = Transaction.sign_many(txs, [b.me_private])
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    memory = sum(stat.size_diff for stat
+                 in snapshot_end.compare_to(snapshot_start, 'filename'))
+
+    block = b.create_block(txs)
+
+    print('speedtest_block_memory_and_pickle_size (1000 tx objects): '
+          '{} bytes in memory'.format(memory))
+    print('speedtest_block_memory_and_pickle_size (1000 pickled txs): '
+          '{} bytes'.format(sum(len(pickle.dumps(tx)) for tx in txs)))
+    print('speedtest_block_memory_and_pickle_size (pickled block): '
+          '{} bytes'.format(len(pickle.dumps(block))))
+
+
 if __name__ == '__main__':
     speedtest_validate_transaction()
     speedtest_serialize_block_json()
     speedtest_serialize_block_rapidjson()
     speedtest_deserialize_block_json()
     speedtest_deserialize_block_rapidjson()
+    speedtest_validate_transaction_schema()
+    speedtest_block_memory_and_pickle_size()
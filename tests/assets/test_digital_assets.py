@@ -155,6 +155,43 @@ def test_get_transactions_by_asset_id_with_invalid_block(b, user_pk, user_sk):
     assert len(txs) == 1
 
 
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_get_transactions_by_asset_id_paginated(b, user_pk, user_sk,
+                                                monkeypatch):
+    from bigchaindb.models import Transaction
+
+    tx_create = b.get_owned_ids(user_pk).pop()
+    tx_create = b.get_transaction(tx_create.txid)
+    asset_id = tx_create.id
+
+    transfers = [Transaction.transfer(tx_create.to_inputs(), [([user_pk], 1)],
+                                      tx_create.id, metadata={'i': i})
+                 .sign([user_sk]) for i in range(6)]
+    # half of the transfers are in an invalid block
+    for i, valid in enumerate((False, True)):
+        monkeypatch.setattr('time.time', lambda: 1000000000 + i)
+        block = b.create_block(transfers[i::2])
+        b.write_block(block)
+        vote = b.vote(block.id, b.get_last_voted_block().id, valid)
+        b.write_vote(vote)
+
+    valid_ids = sorted(tx.id for tx in transfers[1::2])
+    history = b.get_transactions_by_asset_id(asset_id)
+    assert [tx.id for tx in history] == [asset_id] + valid_ids
+
+    pages = []
+    after = None
+    while True:
+        page = b.get_transactions_by_asset_id(asset_id, after=after, limit=2)
+        pages.append([tx.id for tx in page])
+        if len(page) < 2:
+            break
+        after = page[-1].id
+
+    assert pages == [[asset_id, valid_ids[0]], valid_ids[1:], []]
+
+
 @pytest.mark.bdb
 @pytest.mark.usefixtures('inputs')
 def test_get_asset_by_id(b, user_pk, user_sk):
@@ -150,6 +150,36 @@ def test_changefeed_prefeed(mock_cursor_next, mock_cursor_alive,
     assert outpipe.qsize() == 4
 
 
+@pytest.mark.bdb
+@mock.patch('pymongo.cursor.Cursor.alive', new_callable=mock.PropertyMock)
+@mock.patch('pymongo.cursor.Cursor.next')
+def test_changefeed_batches(mock_cursor_next, mock_cursor_alive,
+                            mock_changefeed_data):
+    from bigchaindb.backend import get_changefeed, connect
+    from bigchaindb.backend.changefeed import ChangeFeed
+
+    conn = connect()
+    mock_cursor_alive.side_effect = [mock.DEFAULT, mock.DEFAULT,
+                                     mock.DEFAULT, mock.DEFAULT, False]
+    mock_cursor_next.side_effect = [mock.DEFAULT] + mock_changefeed_data
+
+    outpipe = Pipe()
+    changefeed = get_changefeed(conn, 'backlog',
+                                ChangeFeed.INSERT | ChangeFeed.DELETE,
+                                prefeed=[1, 2, 3], batch_size=2,
+                                batch_timeout=10)
+    changefeed.outqueue = outpipe
+    changefeed.run_forever()
+
+    assert outpipe.get() == [1, 2]
+    assert outpipe.get() == [3]
+    assert [doc['msg'] for doc in outpipe.get()] == [
+        'seems like we have an insert here',
+        'seems like we have a delete here',
+    ]
+    assert outpipe.qsize() == 0
+
+
 @pytest.mark.bdb
 @mock.patch('pymongo.cursor.Cursor.alive', new_callable=mock.PropertyMock)
 @mock.patch('bigchaindb.backend.mongodb.changefeed.MongoDBChangeFeed.run_changefeed')  # noqa
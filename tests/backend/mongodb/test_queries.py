@@ -17,6 +17,22 @@ def test_write_transaction(signed_create_tx):
     assert tx_db == signed_create_tx.to_dict()
 
 
+def test_write_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    # a transaction already in the backlog doesn't prevent the others from
+    # being written
+    query.write_transaction(conn, signed_create_tx.to_dict())
+    query.write_transactions(conn, [signed_create_tx.to_dict(),
+                                    signed_transfer_tx.to_dict()])
+
+    txs_db = list(conn.db.backlog.find({}, {'_id': False}).sort('id'))
+    assert txs_db == sorted([signed_create_tx.to_dict(),
+                             signed_transfer_tx.to_dict()],
+                            key=lambda tx: tx['id'])
+
+
 def test_update_transaction(signed_create_tx):
     from bigchaindb.backend import connect, query
     conn = connect()
@@ -93,6 +109,43 @@ def test_get_transaction_from_block(user_pk):
     assert query.get_transaction_from_block(conn, 'aaa', block.id) is None
 
 
+def test_get_transactions(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Transaction, Block
+    conn = connect()
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], metadata={'i': i})
+           for i in range(3)]
+    block = Block(transactions=txs)
+    conn.db.bigchain.insert_one(block.to_dict())
+
+    found = list(query.get_transactions(conn, [txs[0].id, txs[2].id, 'aaa']))
+
+    assert sorted(found, key=lambda doc: doc['transaction']['id']) == sorted([
+        {'id': block.id, 'block': {'voters': block.voters},
+         'transaction': tx.to_dict()} for tx in (txs[0], txs[2])
+    ], key=lambda doc: doc['transaction']['id'])
+
+
+def test_get_transactions_from_backlog(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Transaction
+    conn = connect()
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], metadata={'i': i})
+           for i in range(3)]
+    for tx in txs:
+        tx_dict = tx.to_dict()
+        tx_dict.update({'assignee': 'aaa', 'assignment_timestamp': 1})
+        conn.db.backlog.insert_one(tx_dict)
+
+    found = list(query.get_transactions_from_backlog(
+        conn, [txs[0].id, txs[1].id, 'aaa']))
+
+    assert sorted(found, key=lambda tx: tx['id']) == \
+        sorted([txs[0].to_dict(), txs[1].to_dict()], key=lambda tx: tx['id'])
+
+
 def test_get_transaction_from_backlog(create_tx):
     from bigchaindb.backend import connect, query
     conn = connect()
@@ -143,6 +196,107 @@ def test_get_txids_by_asset_id(signed_create_tx, signed_transfer_tx):
     assert txids == [signed_create_tx.id, signed_transfer_tx.id]
 
 
+@pytest.mark.parametrize('transactions_table', [False, True])
+def test_get_transactions_by_asset_id(signed_create_tx, user_pk, user_sk,
+                                      transactions_table):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect(transactions_table=transactions_table)
+
+    transfers = [
+        Transaction.transfer(signed_create_tx.to_inputs(), [([user_pk], 1)],
+                             asset_id=signed_create_tx.id,
+                             metadata={'i': i}).sign([user_sk])
+        for i in range(3)
+    ]
+    create_block = Block(transactions=[signed_create_tx])
+    transfer_blocks = [Block(transactions=transfers, voters=[voter])
+                       for voter in ('aaa', 'bbb')]
+    for block in [create_block] + transfer_blocks:
+        query.write_block(conn, block)
+
+    def page(after=None, limit=None):
+        return list(query.get_transactions_by_asset_id(
+            conn, signed_create_tx.id, after=after, limit=limit))
+
+    transfer_ids = sorted(tx.id for tx in transfers)
+    history = page()
+    assert [doc['id'] for doc in history] == \
+        [signed_create_tx.id] + transfer_ids
+    assert history[0] == {
+        'id': signed_create_tx.id,
+        'transaction': signed_create_tx.to_dict(),
+        'blocks': [{'id': create_block.id, 'voters': create_block.voters}],
+    }
+    assert all(sorted(block['id'] for block in doc['blocks']) ==
+               sorted(block.id for block in transfer_blocks)
+               for doc in history[1:])
+
+    assert page(limit=2) == history[:2]
+    assert page(after=signed_create_tx.id, limit=2) == history[1:3]
+    assert page(after=transfer_ids[1]) == history[3:]
+    assert page(after=transfer_ids[2]) == []
+
+
+@pytest.mark.parametrize('transactions_table', [False, True])
+def test_get_transactions_by_asset_id_applies_cursor_first(transactions_table):
+    from unittest.mock import patch
+    from bigchaindb.backend import connect, query
+    conn = connect(transactions_table=transactions_table)
+
+    with patch('pymongo.collection.Collection.aggregate') as aggregate:
+        query.get_transactions_by_asset_id(conn, 'asset', after='tx', limit=2)
+    pipeline = aggregate.call_args[0][0]
+
+    # the transactions before the cursor are dropped before being grouped
+    # or projected
+    stages = [next(iter(stage)) for stage in pipeline]
+    cursor_match = next(index for index, stage in enumerate(pipeline)
+                        if '$gt' in str(stage.get('$match')))
+    assert cursor_match < stages.index('$project')
+    if not transactions_table:
+        assert cursor_match < stages.index('$group')
+
+
+def test_get_transactions_by_asset_id_uses_asset_id_index(signed_create_tx):
+    from bigchaindb.backend import connect
+    conn = connect()
+
+    plan = conn.db.command('aggregate', 'bigchain', explain=True, pipeline=[
+        {'$match': {'block.transactions.asset.id': signed_create_tx.id}},
+    ])
+    assert 'asset_id' in str(plan)
+
+
+def test_get_txids_in_blocks(user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Transaction, Block
+    conn = connect()
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], metadata={'i': i})
+           for i in range(3)]
+    conn.db.bigchain.insert_one(Block(transactions=txs[:2]).to_dict())
+    conn.db.bigchain.insert_one(Block(transactions=txs[2:]).to_dict())
+
+    assert sorted(query.get_txids_in_blocks(conn)) == \
+        sorted(tx.id for tx in txs)
+
+
+@pytest.mark.parametrize('transactions_table', [False, True])
+def test_get_txids_in_blocks_among_txids(user_pk, transactions_table):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Transaction, Block
+    conn = connect(transactions_table=transactions_table)
+
+    txs = [Transaction.create([user_pk], [([user_pk], 1)], metadata={'i': i})
+           for i in range(3)]
+    query.write_block(conn, Block(transactions=txs[:2]))
+
+    assert list(query.get_txids_in_blocks(conn, [txs[0].id, txs[2].id])) == \
+        [txs[0].id]
+    assert list(query.get_txids_in_blocks(conn, [])) == []
+
+
 def test_get_asset_by_id(create_tx):
     from bigchaindb.backend import connect, query
     from bigchaindb.models import Block
@@ -177,6 +331,27 @@ def test_get_spent(signed_create_tx, signed_transfer_tx):
     assert spents[0] == signed_transfer_tx.to_dict()
 
 
+def test_get_spent_uses_inputs_index(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    block = Block(transactions=[signed_create_tx])
+    conn.db.bigchain.insert_one(block.to_dict())
+    block = Block(transactions=[signed_transfer_tx])
+    conn.db.bigchain.insert_one(block.to_dict())
+
+    plan = conn.db.command('aggregate', 'bigchain', explain=True, pipeline=[
+        {'$match': {'block.transactions.inputs': {
+            '$elemMatch': {'fulfills.txid': signed_create_tx.id,
+                           'fulfills.output': 0}}}},
+    ])
+    assert 'inputs' in str(plan)
+
+    # the create transaction of the first block does not spend anything
+    assert list(query.get_spent(conn, signed_transfer_tx.id, 0)) == []
+
+
 def test_get_owned_ids(signed_create_tx, user_pk):
     from bigchaindb.backend import connect, query
     from bigchaindb.models import Block
@@ -189,7 +364,47 @@ def test_get_owned_ids(signed_create_tx, user_pk):
     owned_ids = list(query.get_owned_ids(conn, user_pk))
 
     assert len(owned_ids) == 1
-    assert owned_ids[0] == signed_create_tx.to_dict()
+    assert owned_ids[0] == {
+        'id': block.id,
+        'block': {'voters': block.voters},
+        'transaction': signed_create_tx.to_dict(),
+    }
+
+
+def test_get_owned_ids_nested_in_threshold_conditions(user_pk, user2_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block, Transaction
+    conn = connect()
+
+    tx = Transaction.create([user_pk], [([user_pk, [user_pk, user2_pk]], 1)])
+    block = Block(transactions=[tx])
+    conn.db.bigchain.insert_one(block.to_dict())
+
+    owned_ids = list(query.get_owned_ids(conn, user2_pk))
+
+    assert len(owned_ids) == 1
+    assert owned_ids[0]['transaction'] == tx.to_dict()
+
+
+def test_get_spending_transactions(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    block = Block(transactions=[signed_create_tx])
+    conn.db.bigchain.insert_one(block.to_dict())
+    block = Block(transactions=[signed_transfer_tx])
+    conn.db.bigchain.insert_one(block.to_dict())
+
+    inputs = [{'txid': signed_create_tx.id, 'output': 0},
+              {'txid': signed_transfer_tx.id, 'output': 0}]
+    spending = list(query.get_spending_transactions(conn, inputs))
+
+    assert spending == [{
+        'id': block.id,
+        'block': {'voters': block.voters},
+        'transaction': signed_transfer_tx.to_dict(),
+    }]
 
 
 def test_get_votes_by_block_id(signed_create_tx, structurally_valid_vote):
@@ -214,6 +429,24 @@ def test_get_votes_by_block_id(signed_create_tx, structurally_valid_vote):
     assert votes[1]['vote']['voting_for_block'] == block.id
 
 
+def test_get_votes_by_block_ids(structurally_valid_vote):
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    # insert votes for three blocks
+    for block_id in ('a', 'b', 'c'):
+        vote = dict(structurally_valid_vote,
+                    vote=dict(structurally_valid_vote['vote'],
+                              voting_for_block=block_id))
+        conn.db.votes.insert_one(vote)
+
+    votes = list(query.get_votes_by_block_ids(conn, ['a', 'c']))
+
+    assert sorted(vote['vote']['voting_for_block'] for vote in votes) == \
+        ['a', 'c']
+    assert all('_id' not in vote for vote in votes)
+
+
 def test_get_votes_by_block_id_and_voter(signed_create_tx,
                                          structurally_valid_vote):
     from bigchaindb.backend import connect, query
@@ -252,6 +485,134 @@ def test_write_block(signed_create_tx):
     assert block_db == block.to_dict()
 
 
+def test_write_block_with_transactions_table(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect(transactions_table=True)
+
+    # the same transaction is written with two blocks
+    blocks = [Block(transactions=[signed_create_tx], voters=[voter])
+              for voter in ('aaa', 'bbb')]
+    for block in blocks:
+        query.write_block(conn, block)
+
+    assert conn.db.bigchain.count() == 2
+    tx_db = conn.db.transactions.find_one({'id': signed_create_tx.id},
+                                          {'_id': False})
+    assert tx_db == {
+        'id': signed_create_tx.id,
+        'transaction': signed_create_tx.to_dict(),
+        'blocks': [{'id': block.id, 'voters': block.voters}
+                   for block in blocks],
+    }
+
+
+def test_write_block_with_transactions_table_writes_the_block_first(
+        signed_create_tx):
+    from unittest.mock import patch
+    from pymongo.errors import AutoReconnect
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect(transactions_table=True)
+
+    block = Block(transactions=[signed_create_tx])
+    with patch('pymongo.collection.Collection.insert_one',
+               side_effect=AutoReconnect):
+        with pytest.raises(AutoReconnect):
+            query.write_block(conn, block)
+
+    # the transactions do not refer to a block missing from the bigchain
+    assert conn.db.transactions.count() == 0
+
+
+def test_write_block_transactions(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect(transactions_table=True)
+
+    block = Block(transactions=[signed_create_tx], voters=['aaa'])
+    query.write_block(conn, block)
+    conn.db.transactions.delete_many({})
+
+    # writing the transactions again is harmless
+    for _ in range(2):
+        query.write_block_transactions(conn, block.to_dict())
+
+    tx_db = conn.db.transactions.find_one({'id': signed_create_tx.id},
+                                          {'_id': False})
+    assert tx_db == {
+        'id': signed_create_tx.id,
+        'transaction': signed_create_tx.to_dict(),
+        'blocks': [{'id': block.id, 'voters': block.voters}],
+    }
+
+
+def test_get_last_blocks(signed_create_tx):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect()
+
+    blocks = [Block(transactions=[signed_create_tx], node_pubkey=node_pubkey,
+                    timestamp=str(timestamp))
+              for timestamp, node_pubkey in ((1, 'aaa'), (2, 'bbb'),
+                                             (3, 'aaa'), (4, 'aaa'))]
+    for block in blocks:
+        conn.db.bigchain.insert_one(block.to_dict())
+
+    last_blocks = list(query.get_last_blocks(conn, 'aaa', 2))
+    assert last_blocks == [blocks[3].to_dict(), blocks[2].to_dict()]
+
+
+def test_transaction_lookups_with_transactions_table(signed_create_tx,
+                                                     signed_transfer_tx,
+                                                     user_pk):
+    from bigchaindb.backend import connect, query
+    from bigchaindb.models import Block
+    conn = connect(transactions_table=True)
+
+    create_block = Block(transactions=[signed_create_tx])
+    transfer_block = Block(transactions=[signed_transfer_tx])
+    query.write_block(conn, create_block)
+    query.write_block(conn, transfer_block)
+
+    # the lookups do not go through the blocks anymore
+    conn.db.bigchain.delete_many({})
+
+    assert query.has_transaction(conn, signed_create_tx.id)
+    assert query.has_transaction(conn, 'aaa') is False
+    assert query.get_transaction_from_block(
+        conn, signed_create_tx.id, create_block.id) == signed_create_tx.to_dict()
+    assert query.get_transaction_from_block(
+        conn, signed_create_tx.id, transfer_block.id) is None
+
+    found = list(query.get_transactions(conn, [signed_transfer_tx.id, 'aaa']))
+    assert found == [{
+        'id': transfer_block.id,
+        'block': {'voters': transfer_block.voters},
+        'transaction': signed_transfer_tx.to_dict(),
+    }]
+    assert list(query.get_blocks_status_from_transaction(
+        conn, signed_create_tx.id)) == [
+            {'id': create_block.id, 'block': {'voters': create_block.voters}}]
+
+    assert sorted(query.get_txids_by_asset_id(conn, signed_create_tx.id)) == \
+        sorted([signed_create_tx.id, signed_transfer_tx.id])
+    assert list(query.get_asset_by_id(conn, signed_create_tx.id)) == \
+        [{'asset': signed_create_tx.to_dict()['asset']}]
+
+    assert list(query.get_spent(conn, signed_create_tx.id, 0)) == \
+        [signed_transfer_tx.to_dict()]
+    spending = list(query.get_spending_transactions(
+        conn, [{'txid': signed_create_tx.id, 'output': 0}]))
+    assert [doc['transaction'] for doc in spending] == \
+        [signed_transfer_tx.to_dict()]
+
+    # both transactions have an output owned by `user_pk`
+    owned = list(query.get_owned_ids(conn, user_pk))
+    assert sorted(doc['transaction']['id'] for doc in owned) == \
+        sorted([signed_create_tx.id, signed_transfer_tx.id])
+
+
 def test_get_block(signed_create_tx):
     from bigchaindb.backend import connect, query
     from bigchaindb.models import Block
@@ -318,6 +679,53 @@ def test_write_vote(structurally_valid_vote):
     assert vote_db == structurally_valid_vote
 
 
+def test_write_votes(structurally_valid_vote):
+    from copy import deepcopy
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    votes = []
+    for block_id in ('a', 'b', 'c'):
+        vote = deepcopy(structurally_valid_vote)
+        vote['vote']['voting_for_block'] = block_id
+        votes.append(vote)
+
+    query.write_votes(conn, votes)
+
+    votes_db = conn.db.votes.find(
+        {'node_pubkey': structurally_valid_vote['node_pubkey']}
+    ).sort('vote.voting_for_block')
+    assert list(votes_db) == votes
+
+
+def test_write_block_decision():
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    decision = {'block_id': 'a', 'status': 'valid', 'decided_at': '1',
+                'tally': {'valid': 1, 'invalid': 0, 'voters': 1}}
+    query.write_block_decision(conn, dict(decision))
+    # the first decision is kept
+    query.write_block_decision(conn, dict(decision, decided_at='2'))
+
+    decisions = list(conn.db.decisions.find({}, {'_id': False}))
+    assert decisions == [decision]
+
+
+def test_get_block_decisions():
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    decisions = [{'block_id': block_id, 'status': 'invalid', 'decided_at': '1',
+                  'tally': {'valid': 0, 'invalid': 1, 'voters': 1}}
+                 for block_id in ('a', 'b', 'c')]
+    conn.db.decisions.insert_many([dict(decision) for decision in decisions])
+
+    found = list(query.get_block_decisions(conn, ['a', 'c', 'd']))
+    assert sorted(found, key=lambda d: d['block_id']) == \
+        [decisions[0], decisions[2]]
+
+
 def test_get_genesis_block(genesis_block):
     from bigchaindb.backend import connect, query
     conn = connect()
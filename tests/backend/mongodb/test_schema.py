@@ -22,11 +22,13 @@ def test_init_creates_db_tables_and_indexes():
     init_database()
 
     collection_names = conn.conn[dbname].collection_names()
-    assert sorted(collection_names) == ['backlog', 'bigchain', 'votes']
+    assert sorted(collection_names) == ['backlog', 'bigchain', 'decisions',
+                                        'transactions', 'votes']
 
     indexes = conn.conn[dbname]['bigchain'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'asset_id', 'block_timestamp',
-                               'transaction_id']
+                               'inputs', 'outputs_0', 'outputs_1',
+                               'outputs_2', 'transaction_id']
 
     indexes = conn.conn[dbname]['backlog'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'assignee__transaction_timestamp',
@@ -35,6 +37,13 @@ def test_init_creates_db_tables_and_indexes():
     indexes = conn.conn[dbname]['votes'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'block_and_voter']
 
+    indexes = conn.conn[dbname]['decisions'].index_information().keys()
+    assert sorted(indexes) == ['_id_', 'block_id']
+
+    indexes = conn.conn[dbname]['transactions'].index_information().keys()
+    assert sorted(indexes) == ['_id_', 'asset_id', 'inputs', 'outputs_0',
+                               'outputs_1', 'outputs_2', 'transaction_id']
+
 
 def test_init_database_fails_if_db_exists():
     import bigchaindb
@@ -66,7 +75,8 @@ def test_create_tables():
     schema.create_tables(conn, dbname)
 
     collection_names = conn.conn[dbname].collection_names()
-    assert sorted(collection_names) == ['backlog', 'bigchain', 'votes']
+    assert sorted(collection_names) == ['backlog', 'bigchain', 'decisions',
+                                        'transactions', 'votes']
 
 
 def test_create_secondary_indexes():
@@ -86,7 +96,8 @@ def test_create_secondary_indexes():
     # Bigchain table
     indexes = conn.conn[dbname]['bigchain'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'asset_id', 'block_timestamp',
-                               'transaction_id']
+                               'inputs', 'outputs_0', 'outputs_1',
+                               'outputs_2', 'transaction_id']
 
     # Backlog table
     indexes = conn.conn[dbname]['backlog'].index_information().keys()
@@ -97,6 +108,15 @@ def test_create_secondary_indexes():
     indexes = conn.conn[dbname]['votes'].index_information().keys()
     assert sorted(indexes) == ['_id_', 'block_and_voter']
 
+    # Decisions table
+    indexes = conn.conn[dbname]['decisions'].index_information().keys()
+    assert sorted(indexes) == ['_id_', 'block_id']
+
+    # Transactions table
+    indexes = conn.conn[dbname]['transactions'].index_information().keys()
+    assert sorted(indexes) == ['_id_', 'asset_id', 'inputs', 'outputs_0',
+                               'outputs_1', 'outputs_2', 'transaction_id']
+
 
 def test_drop(dummy_db):
     from bigchaindb import backend
@@ -93,3 +93,31 @@ def test_changefeed_prefeed(mock_changefeed_connection):
     changefeed.outqueue = outpipe
     changefeed.run_forever()
     assert outpipe.qsize() == 4
+
+
+def test_changefeed_batches(mock_changefeed_connection):
+    import rethinkdb as r
+    from bigchaindb.backend import get_changefeed
+    from bigchaindb.backend.changefeed import ChangeFeed
+
+    inserts = [{'new_val': i, 'old_val': None} for i in range(4)]
+    cursor = Mock()
+    cursor.next.side_effect = inserts[:3] + [
+        r.ReqlTimeoutError('timeout'),
+        inserts[3],
+        r.ReqlCursorEmpty(),
+    ]
+    mock_changefeed_connection.run.return_value = cursor
+
+    outpipe = Pipe()
+    changefeed = get_changefeed(mock_changefeed_connection, 'backlog',
+                                ChangeFeed.INSERT, prefeed=['a'],
+                                batch_size=2, batch_timeout=10)
+    changefeed.outqueue = outpipe
+    changefeed.run_forever()
+
+    assert outpipe.get() == ['a']
+    assert outpipe.get() == [0, 1]
+    assert outpipe.get() == [2]
+    assert outpipe.get() == [3]
+    assert outpipe.qsize() == 0
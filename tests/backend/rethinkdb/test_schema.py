@@ -63,7 +63,10 @@ def test_create_tables():
     assert conn.run(r.db(dbname).table_list().contains('bigchain')) is True
     assert conn.run(r.db(dbname).table_list().contains('backlog')) is True
     assert conn.run(r.db(dbname).table_list().contains('votes')) is True
-    assert len(conn.run(r.db(dbname).table_list())) == 3
+    assert conn.run(r.db(dbname).table_list().contains('decisions')) is True
+    assert conn.run(r.db(dbname).table_list().contains('transactions')) is True
+    assert len(conn.run(r.db(dbname).table_list())) == 5
+    assert conn.run(r.db(dbname).table('decisions').info()['primary_key']) == 'block_id'
 
 
 @pytest.mark.bdb
@@ -85,6 +88,10 @@ def test_create_secondary_indexes():
         'transaction_id')) is True
     assert conn.run(r.db(dbname).table('bigchain').index_list().contains(
         'asset_id')) is True
+    assert conn.run(r.db(dbname).table('bigchain').index_list().contains(
+        'inputs')) is True
+    assert conn.run(r.db(dbname).table('bigchain').index_list().contains(
+        'outputs')) is True
 
     # Backlog table
     assert conn.run(r.db(dbname).table('backlog').index_list().contains(
@@ -94,6 +101,10 @@ def test_create_secondary_indexes():
     assert conn.run(r.db(dbname).table('votes').index_list().contains(
         'block_and_voter')) is True
 
+    # Transactions table
+    assert conn.run(r.db(dbname).table('transactions').index_list().contains(
+        'asset_id', 'inputs', 'outputs')) is True
+
 
 def test_drop(dummy_db):
     conn = backend.connect()
@@ -19,6 +19,7 @@ def test_schema(schema_func_name, args_qty):
 
 @mark.parametrize('query_func_name,args_qty', (
     ('write_transaction', 1),
+    ('write_transactions', 1),
     ('count_blocks', 0),
     ('count_backlog', 0),
     ('get_genesis_block', 0),
@@ -26,14 +27,25 @@ def test_schema(schema_func_name, args_qty):
     ('get_stale_transactions', 1),
     ('get_blocks_status_from_transaction', 1),
     ('get_transaction_from_backlog', 1),
+    ('get_transactions_from_backlog', 1),
+    ('get_transactions', 1),
     ('get_txids_by_asset_id', 1),
+    ('get_transactions_by_asset_id', 1),
+    ('get_txids_in_blocks', 0),
     ('get_asset_by_id', 1),
     ('get_owned_ids', 1),
+    ('get_spending_transactions', 1),
     ('get_votes_by_block_id', 1),
+    ('get_votes_by_block_ids', 1),
     ('write_block', 1),
+    ('write_block_transactions', 1),
+    ('get_last_blocks', 2),
     ('get_block', 1),
     ('has_transaction', 1),
     ('write_vote', 1),
+    ('write_votes', 1),
+    ('write_block_decision', 1),
+    ('get_block_decisions', 1),
     ('get_last_voted_block', 1),
     ('get_unvoted_blocks', 1),
     ('get_spent', 2),
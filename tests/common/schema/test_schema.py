@@ -1,3 +1,6 @@
+from pytest import raises
+
+from bigchaindb.common.exceptions import SchemaValidationError
 from bigchaindb.common.schema import (
     TX_SCHEMA, VOTE_SCHEMA, drop_schema_descriptions)
 
@@ -67,3 +70,21 @@ def test_drop_descriptions():
     }
     drop_schema_descriptions(node)
     assert node == expected
+
+
+def test_schema_validators_are_prebuilt(monkeypatch):
+    import jsonschema
+    from bigchaindb.common.schema import (
+        TX_SCHEMA_VALIDATOR, VOTE_SCHEMA_VALIDATOR,
+        validate_vote_schema)
+
+    assert TX_SCHEMA_VALIDATOR.schema is TX_SCHEMA
+    assert VOTE_SCHEMA_VALIDATOR.schema is VOTE_SCHEMA
+
+    def check_schema(schema):
+        raise AssertionError('schema must not be checked again')
+
+    monkeypatch.setattr(jsonschema.Draft4Validator, 'check_schema',
+                        staticmethod(check_schema))
+    with raises(SchemaValidationError):
+        validate_vote_schema({})
@@ -1,3 +1,4 @@
+import pytest
 from pytest import raises
 
 
@@ -69,6 +70,21 @@ def test_input_deserialization_with_unsigned_fulfillment(ffill_uri, user_pub):
     assert input == expected
 
 
+def test_input_deserialization_does_not_keep_fulfillment_object_as_uri(
+        ffill_uri, user_pub):
+    from bigchaindb.common.transaction import Input
+    from cryptoconditions import Fulfillment
+
+    ffill = {
+        'owners_before': [user_pub],
+        'fulfillment': Fulfillment.from_uri(ffill_uri),
+        'fulfills': None,
+    }
+    input = Input.from_dict(ffill)
+
+    assert input.to_dict()['fulfillment'] == ffill_uri
+
+
 def test_output_serialization(user_Ed25519, user_pub):
     from bigchaindb.common.transaction import Output
 
@@ -637,8 +653,9 @@ def test_validate_inputs_of_transfer_tx_with_invalid_params(
 
     invalid_out = Output(Ed25519Fulfillment.from_uri('cf:0:'), ['invalid'])
     assert transfer_tx.inputs_valid([invalid_out]) is False
+    # NOTE: Only the condition of an Output is checked, not its public keys
     invalid_out = utx.outputs[0]
-    invalid_out.public_key = 'invalid'
+    invalid_out.public_keys = ['invalid']
     assert transfer_tx.inputs_valid([invalid_out]) is True
 
     with raises(TypeError):
@@ -974,3 +991,174 @@ def test_validate_version(utx):
     utx.version = '1.0.0'
     with raises(SchemaValidationError):
         validate_transaction_model(utx)
+
+
+def test_transaction_id_is_memoized(utx, monkeypatch):
+    from bigchaindb.common.transaction import Transaction
+
+    tx_id = utx.id
+    monkeypatch.setattr(Transaction, '_to_hash', staticmethod(
+        lambda value: pytest.fail('id must not be recomputed')))
+    assert utx.id == tx_id
+    assert utx.to_dict()['id'] == tx_id
+
+
+def test_transaction_id_cache_invalidation(utx, user_output, user_priv):
+    tx_id = utx.id
+
+    utx.metadata = {'msg': 'changed'}
+    assert utx.id != tx_id
+
+    tx_id = utx.id
+    utx.add_output(user_output)
+    assert utx.id != tx_id
+
+    tx_id = utx.id
+    utx.sign([user_priv])
+    assert utx.id == tx_id
+
+
+def test_validate_structure_does_not_modify_tx_body(utx, user_priv):
+    from copy import deepcopy
+    from bigchaindb.common.transaction import Transaction
+
+    tx_body = utx.sign([user_priv]).to_dict()
+    expected = deepcopy(tx_body)
+
+    Transaction.validate_structure(tx_body)
+    assert tx_body == expected
+
+
+def test_remove_signatures_shares_payloads(tx):
+    from bigchaindb.common.transaction import Transaction
+
+    tx_dict = tx.to_dict()
+    tx_no_signatures = Transaction._remove_signatures(tx_dict)
+
+    assert tx_no_signatures['asset'] is tx_dict['asset']
+    assert all(input_['fulfillment'] is None
+               for input_ in tx_no_signatures['inputs'])
+    assert all(input_['fulfillment'] is not None
+               for input_ in tx_dict['inputs'])
+
+
+def test_partial_tx_messages(user_input, user_output, asset_definition):
+    from copy import deepcopy
+    from bigchaindb.common.transaction import Transaction
+
+    tx = Transaction(Transaction.CREATE, asset_definition,
+                     [user_input, deepcopy(user_input)], [user_output])
+    expected = []
+    for input_ in tx.inputs:
+        tx_partial = deepcopy(tx)
+        tx_partial.inputs = [input_]
+        expected.append(str(tx_partial))
+
+    assert list(tx._partial_tx_messages()) == expected
+
+
+def test_inputs_valid_checks_every_input(user_input, user_output, user_priv,
+                                         asset_definition):
+    from copy import deepcopy
+    from bigchaindb.common.transaction import Transaction
+
+    tx = Transaction(Transaction.CREATE, asset_definition,
+                     [user_input, deepcopy(user_input)], [user_output])
+    tx.sign([user_priv])
+    assert tx.inputs_valid() is True
+
+    # NOTE: The transaction has more inputs than outputs, the last input must
+    #       still be verified
+    tx.inputs[1].owners_before = ['invalid']
+    assert tx.inputs_valid() is False
+
+
+def test_input_from_dict_keeps_fulfillment_uri(tx, monkeypatch):
+    from cryptoconditions import Fulfillment
+    from bigchaindb.common.transaction import Input
+
+    input_dict = tx.inputs[0].to_dict()
+    input_ = Input.from_dict(input_dict)
+
+    def from_uri(uri):
+        raise AssertionError('fulfillment must not be parsed again')
+
+    monkeypatch.setattr(Fulfillment, 'from_uri', staticmethod(from_uri))
+    monkeypatch.setattr(type(input_.fulfillment), 'serialize_uri',
+                        lambda self: pytest.fail('must not be serialized'))
+    assert input_.to_dict() == input_dict
+
+    tx.inputs[0] = input_
+    assert tx.inputs_valid() is True
+
+
+def test_input_fulfillment_uri_reset(tx, user_Ed25519):
+    from bigchaindb.common.transaction import Input
+
+    input_ = Input.from_dict(tx.inputs[0].to_dict())
+    input_.fulfillment = user_Ed25519
+
+    assert input_.to_dict()['fulfillment'] == user_Ed25519.to_dict()
+
+
+def test_sign_many(user_input, user_output, user_priv, asset_definition,
+                   monkeypatch):
+    from bigchaindb.common import transaction
+    from bigchaindb.common.transaction import Transaction
+
+    txs = [Transaction(Transaction.CREATE, asset_definition, [user_input],
+                       [user_output], metadata={'index': i})
+           for i in range(3)]
+    unsigned = [tx.to_dict() for tx in txs]
+
+    key_pairs_calls = []
+    key_pairs = transaction._key_pairs
+    monkeypatch.setattr(transaction, '_key_pairs',
+                        lambda private_keys: key_pairs_calls.append(1) or
+                        key_pairs(private_keys))
+    signed_txs = Transaction.sign_many(txs, [user_priv])
+
+    # the key pairs are derived once for all the transactions
+    assert len(key_pairs_calls) == 1
+    assert [tx.id for tx in signed_txs] == [tx.id for tx in txs]
+    assert all(tx.inputs_valid() for tx in signed_txs)
+    # the given transactions are left unsigned
+    assert [tx.to_dict() for tx in txs] == unsigned
+
+
+def test_sign_many_with_pool(user_input, user_output, user_priv,
+                             asset_definition, monkeypatch):
+    from multiprocessing.dummy import Pool
+    from bigchaindb.common import transaction
+    from bigchaindb.common.transaction import Transaction
+
+    monkeypatch.setattr(transaction, 'SIGN_MANY_CHUNK_SIZE', 2)
+    txs = [Transaction(Transaction.CREATE, asset_definition, [user_input],
+                       [user_output], metadata={'index': i})
+           for i in range(5)]
+    unsigned = [tx.to_dict() for tx in txs]
+    with Pool(2) as pool:
+        signed_txs = Transaction.sign_many(txs, [user_priv], pool=pool)
+
+    assert [tx.id for tx in signed_txs] == [tx.id for tx in txs]
+    assert all(tx.inputs_valid() for tx in signed_txs)
+    # the given transactions are left unsigned, as without a pool
+    assert [tx.to_dict() for tx in txs] == unsigned
+
+
+def test_transaction_models_have_no_instance_dict(tx):
+    for obj in (tx, tx.inputs[0], tx.outputs[0], tx.to_inputs()[0].fulfills):
+        assert not hasattr(obj, '__dict__')
+
+
+def test_pickled_transaction_keeps_id(tx, monkeypatch):
+    import pickle
+    from bigchaindb.common.transaction import Transaction
+
+    tx_id = tx.id
+    unpickled = pickle.loads(pickle.dumps(tx))
+    monkeypatch.setattr(Transaction, '_to_hash', staticmethod(
+        lambda value: pytest.fail('id must not be recomputed')))
+
+    assert unpickled.id == tx_id
+    assert unpickled.to_dict() == tx.to_dict()
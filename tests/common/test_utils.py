@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.fixture
+def data():
+    return {
+        'b': [1, 2, {'d': None, 'c': True}],
+        'a': 'ünïcödé "quoted" \n',
+        'e': {'filler': 'x' * 10**5},
+    }
+
+
+def test_serialize_into(data):
+    from io import BytesIO
+    from bigchaindb.common.utils import serialize, serialize_into
+
+    buffer = BytesIO()
+    serialize_into(data, buffer)
+
+    assert buffer.getvalue() == serialize(data).encode()
+
+
+def test_serialize_and_hash(data):
+    from io import BytesIO
+    from bigchaindb.common.crypto import hash_data, serialize_and_hash
+    from bigchaindb.common.utils import serialize
+
+    assert serialize_and_hash(data) == hash_data(serialize(data))
+
+    buffer = BytesIO()
+    assert serialize_and_hash(data, buffer) == hash_data(serialize(data))
+    assert buffer.getvalue() == serialize(data).encode()
@@ -78,6 +78,13 @@ def _genesis_marker(request):
         request.getfixturevalue('_genesis')
 
 
+@pytest.fixture(autouse=True)
+def _clear_decided_blocks():
+    from bigchaindb.core import decided_blocks
+    yield
+    decided_blocks.clear()
+
+
 @pytest.fixture(autouse=True)
 def _restore_config(_configure_bigchaindb):
     from bigchaindb import config, config_utils
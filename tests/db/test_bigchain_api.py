@@ -125,10 +125,15 @@ class TestBigchainApi(object):
             b.get_spent(tx.id, 0)
 
     @pytest.mark.genesis
-    def test_get_block_status_for_tx_with_double_spend(self, b, monkeypatch):
+    @pytest.mark.parametrize('transactions_table', [False, True])
+    def test_get_block_status_for_tx_with_double_spend(self, b, monkeypatch,
+                                                       transactions_table):
         from bigchaindb.common.exceptions import DoubleSpend
         from bigchaindb.models import Transaction
 
+        monkeypatch.setattr(b.connection, 'transactions_table',
+                            transactions_table)
+
         tx = Transaction.create([b.me], [([b.me], 1)])
         tx = tx.sign([b.me_private])
 
@@ -149,6 +154,65 @@ class TestBigchainApi(object):
         with pytest.raises(DoubleSpend):
             b.get_blocks_status_containing_tx(tx.id)
 
+    @pytest.mark.genesis
+    def test_get_votes_by_block_ids_without_block_ids(self, b):
+        from bigchaindb.backend import query
+
+        assert list(query.get_votes_by_block_ids(b.connection, [])) == []
+
+    @pytest.mark.genesis
+    def test_repair_transactions_table(self, b, monkeypatch):
+        from bigchaindb.models import Transaction
+
+        tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+        # the node stopped after writing the block, before its transactions
+        b.write_block(b.create_block([tx]))
+        monkeypatch.setattr(b.connection, 'transactions_table', True)
+        assert b.get_transaction(tx.id) is None
+
+        b.repair_transactions_table()
+        assert b.get_transaction(tx.id) == tx
+
+    @pytest.mark.genesis
+    @pytest.mark.parametrize('transactions_table', [False, True])
+    def test_get_transactions(self, b, monkeypatch, transactions_table):
+        from bigchaindb.models import Transaction
+
+        monkeypatch.setattr(b.connection, 'transactions_table',
+                            transactions_table)
+
+        txs = [Transaction.create([b.me], [([b.me], 1)],
+                                  metadata={'msg': random.random()})
+               .sign([b.me_private]) for _ in range(4)]
+
+        monkeypatch.setattr('time.time', lambda: 1000000000)
+        valid_block = b.create_block(txs[:1])
+        b.write_block(valid_block)
+        b.write_vote(b.vote(valid_block.id, b.get_last_voted_block().id, True))
+
+        monkeypatch.setattr('time.time', lambda: 1000000020)
+        invalid_block = b.create_block(txs[1:2])
+        b.write_block(invalid_block)
+        b.write_vote(b.vote(invalid_block.id, b.get_last_voted_block().id,
+                            False))
+
+        undecided_block = b.create_block(txs[2:3])
+        b.write_block(undecided_block)
+        b.write_transaction(txs[3])
+
+        txids = [tx.id for tx in txs] + [txs[0].id, 'aaa']
+        assert b.get_transactions(txids, include_status=True) == [
+            (txs[0], b.TX_VALID),
+            (None, None),
+            (txs[2], b.TX_UNDECIDED),
+            (txs[3], b.TX_IN_BACKLOG),
+            (txs[0], b.TX_VALID),
+            (None, None),
+        ]
+        assert b.get_transactions(txids) == [
+            txs[0], None, txs[2], txs[3], txs[0], None]
+        assert b.get_transactions([]) == []
+
     @pytest.mark.genesis
     def test_get_transaction_in_invalid_and_valid_block(self, monkeypatch, b):
         from bigchaindb.models import Transaction
@@ -178,6 +242,26 @@ class TestBigchainApi(object):
         assert b.get_transaction(tx1.id) is None
         assert b.get_transaction(tx2.id) == tx2
 
+    def test_get_blocks_status_reads_decisions(self, b, monkeypatch):
+        from bigchaindb.models import Transaction
+
+        tx = Transaction.create([b.me], [([b.me], 1)])
+        tx = tx.sign([b.me_private])
+        block = b.create_block([tx])
+        b.write_block(block)
+        b.write_block_decision(block.id, b.BLOCK_INVALID,
+                               {'valid': 0, 'invalid': 1, 'voters': 1})
+
+        def get_votes(connection, block_ids):
+            raise AssertionError('votes of a decided block were read')
+
+        monkeypatch.setattr('bigchaindb.backend.query.get_votes_by_block_id',
+                            get_votes)
+        monkeypatch.setattr('bigchaindb.backend.query.get_votes_by_block_ids',
+                            get_votes)
+        assert b.get_blocks_status_containing_tx(tx.id) == \
+            {block.id: b.BLOCK_INVALID}
+
     @pytest.mark.usefixtures('inputs')
     def test_write_transaction(self, b, user_pk, user_sk):
         from bigchaindb import Bigchain
@@ -196,6 +280,26 @@ class TestBigchainApi(object):
         assert tx_from_db.to_dict() == tx.to_dict()
         assert status == Bigchain.TX_IN_BACKLOG
 
+    @pytest.mark.usefixtures('inputs')
+    def test_write_transactions(self, b, user_pk, user_sk):
+        from bigchaindb import Bigchain
+        from bigchaindb.models import Transaction
+
+        txs = []
+        for input_ in b.get_owned_ids(user_pk)[:3]:
+            input_tx = b.get_transaction(input_.txid)
+            tx = Transaction.transfer(input_tx.to_inputs(), [([user_pk], 1)],
+                                      asset_id=input_tx.id)
+            txs.append(tx.sign([user_sk]))
+
+        b.write_transaction(txs[0])
+        b.write_transactions(txs)
+
+        for tx in txs:
+            tx_from_db, status = b.get_transaction(tx.id, include_status=True)
+            assert tx_from_db.to_dict() == tx.to_dict()
+            assert status == Bigchain.TX_IN_BACKLOG
+
     @pytest.mark.usefixtures('inputs')
     def test_read_transaction(self, b, user_pk, user_sk):
         from bigchaindb.models import Transaction
@@ -428,6 +532,47 @@ class TestBigchainApi(object):
 
         assert retrieved_block_1 == retrieved_block_2
 
+    def test_decided_block_status_is_cached(self, b, genesis_block,
+                                            monkeypatch):
+        block = dummy_block()
+        b.write_block(block)
+        assert b.block_election_status(block.id, block.voters) == \
+            b.BLOCK_UNDECIDED
+
+        # undecided blocks are tallied again
+        b.write_vote(b.vote(block.id, genesis_block.id, False))
+        assert b.block_election_status(block.id, block.voters) == \
+            b.BLOCK_INVALID
+
+        def get_votes_by_block_id(connection, block_id):
+            raise AssertionError('votes of a decided block were read')
+
+        monkeypatch.setattr('bigchaindb.backend.query.get_votes_by_block_id',
+                            get_votes_by_block_id)
+        assert b.block_election_status(block.id, block.voters) == \
+            b.BLOCK_INVALID
+
+    def test_tally_blocks(self, b, genesis_block):
+        from bigchaindb.models import Transaction
+
+        blocks = [b.create_block([Transaction.create([b.me], [([b.me], 1)],
+                                                     metadata={'i': i})
+                                  .sign([b.me_private])])
+                  for i in range(3)]
+        for block in blocks:
+            b.write_block(block)
+
+        b.write_vote(b.vote(blocks[0].id, genesis_block.id, True))
+        b.write_vote(b.vote(blocks[1].id, genesis_block.id, False))
+
+        tallies = b.tally_blocks({block.id: block.voters for block in blocks})
+
+        assert tallies == {
+            blocks[0].id: (b.BLOCK_VALID, {'valid': 1, 'invalid': 0, 'voters': 1}),
+            blocks[1].id: (b.BLOCK_INVALID, {'valid': 0, 'invalid': 1, 'voters': 1}),
+            blocks[2].id: (b.BLOCK_UNDECIDED, {'valid': 0, 'invalid': 0, 'voters': 1}),
+        }
+
     @pytest.mark.genesis
     def test_more_votes_than_voters(self, b):
         from bigchaindb.common.exceptions import MultipleVotesError
@@ -585,6 +730,28 @@ class TestTransactionValidation(object):
         with pytest.raises(TransactionDoesNotExist):
             b.validate_transaction(signed_transfer_tx)
 
+    def test_transfer_looks_up_inputs_at_once(self, b, user_pk, user_sk,
+                                              monkeypatch):
+        from bigchaindb.models import Transaction
+
+        tx_create = Transaction.create([b.me], [([user_pk], 1), ([user_pk], 1)])
+        tx_create = tx_create.sign([b.me_private])
+        block = b.create_block([tx_create])
+        b.write_block(block)
+        b.write_vote(b.vote(block.id, b.get_last_voted_block().id, True))
+
+        tx_transfer = Transaction.transfer(tx_create.to_inputs(),
+                                           [([user_pk], 2)],
+                                           asset_id=tx_create.id)
+        tx_transfer = tx_transfer.sign([user_sk])
+
+        def lookup_one_by_one(*args, **kwargs):
+            raise AssertionError('inputs were looked up one by one')
+
+        monkeypatch.setattr(b, 'get_transaction', lookup_one_by_one)
+        monkeypatch.setattr(b, 'get_spent', lookup_one_by_one)
+        assert b.validate_transaction(tx_transfer) == tx_transfer
+
     @pytest.mark.usefixtures('inputs')
     def test_non_create_valid_input_wrong_owner(self, b, user_pk):
         from bigchaindb.common.crypto import generate_key_pair
@@ -762,6 +929,99 @@ class TestBlockValidation(object):
         with pytest.raises(OperationError):
             b.validate_block(block)
 
+    def test_validate_block_in_parallel(self, b, monkeypatch):
+        monkeypatch.setattr(b, 'block_validation_processes', 2)
+        block = b.create_block([dummy_tx() for _ in range(10)])
+
+        assert b.validate_block(block) == block
+
+    def test_validate_block_in_parallel_invalid_tx_signature(self, b,
+                                                             monkeypatch):
+        from bigchaindb.common.exceptions import InvalidSignature
+        from bigchaindb.models import Transaction
+
+        monkeypatch.setattr(b, 'block_validation_processes', 2)
+        # NOTE: The transaction is not signed
+        unsigned_tx = Transaction.create([b.me], [([b.me], 1)])
+        block = b.create_block([dummy_tx(), unsigned_tx, dummy_tx()])
+
+        with pytest.raises(InvalidSignature):
+            b.validate_block(block)
+
+    def test_validate_block_in_parallel_raises_first_error(self, b,
+                                                           monkeypatch):
+        from bigchaindb.common.exceptions import InvalidSignature
+        from bigchaindb.common.transaction import TransactionLink
+        from bigchaindb.models import Transaction
+
+        monkeypatch.setattr(b, 'block_validation_processes', 2)
+        unsigned_tx = Transaction.create([b.me], [([b.me], 1)])
+        invalid_tx = dummy_tx()
+        invalid_tx.inputs[0].fulfills = TransactionLink('abc', 0)
+        block = b.create_block([unsigned_tx, invalid_tx])
+
+        # NOTE: The unsigned transaction comes first in the block
+        with pytest.raises(InvalidSignature):
+            b.validate_block(block)
+
+        block = b.create_block([invalid_tx, unsigned_tx])
+        with pytest.raises(ValueError):
+            b.validate_block(block)
+
+    @pytest.mark.parametrize('processes', [0, 2])
+    @pytest.mark.usefixtures('inputs')
+    def test_double_spend_within_block(self, b, user_pk, user_sk,
+                                       monkeypatch, processes):
+        from bigchaindb.common import crypto
+        from bigchaindb.common.exceptions import DoubleSpend
+        from bigchaindb.models import Transaction
+
+        monkeypatch.setattr(b, 'block_validation_processes', processes)
+        tx_link = b.get_owned_ids(user_pk).pop()
+        input_tx = b.get_transaction(tx_link.txid)
+
+        transfers = []
+        for _ in range(2):
+            _, recipient_pk = crypto.generate_key_pair()
+            transfer_tx = Transaction.transfer(input_tx.to_inputs(),
+                                               [([recipient_pk], 1)],
+                                               asset_id=input_tx.id)
+            transfers.append(transfer_tx.sign([user_sk]))
+
+        # each of the transfers is valid on its own
+        assert b.validate_block(b.create_block(transfers[:1]))
+        assert b.validate_block(b.create_block(transfers[1:]))
+
+        with pytest.raises(DoubleSpend):
+            b.validate_block(b.create_block(transfers))
+
+    @pytest.mark.usefixtures('inputs')
+    def test_block_inputs_are_looked_up_once(self, b, user_pk, user_sk,
+                                             monkeypatch):
+        from bigchaindb.models import Transaction
+
+        transfers = []
+        for tx_link in b.get_owned_ids(user_pk)[:3]:
+            input_tx = b.get_transaction(tx_link.txid)
+            transfer_tx = Transaction.transfer(input_tx.to_inputs(),
+                                               [([user_pk], 1)],
+                                               asset_id=input_tx.id)
+            transfers.append(transfer_tx.sign([user_sk]))
+        block = b.create_block(transfers)
+
+        get_transactions_calls = []
+        get_transactions = b.get_transactions
+
+        def count_calls(txids, include_status=False):
+            get_transactions_calls.append(txids)
+            return get_transactions(txids, include_status)
+
+        monkeypatch.setattr(b, 'get_transactions', count_calls)
+        assert b.validate_block(block) == block
+        assert len(get_transactions_calls) == 1
+        assert (sorted(get_transactions_calls[0]) ==
+                sorted(tx.inputs[0].fulfills.txid for tx in transfers))
+
 
 class TestMultipleInputs(object):
     def test_transfer_single_owner_single_input(self, b, inputs, user_pk,
@@ -1008,6 +1268,49 @@ class TestMultipleInputs(object):
         assert owned_inputs_user1 == owned_inputs_user2
         assert owned_inputs_user1 == []
 
+    def test_get_owned_ids_nested_threshold(self, b, user_pk):
+        from bigchaindb.common import crypto
+        from bigchaindb.common.transaction import TransactionLink
+        from bigchaindb.models import Transaction
+
+        user2_sk, user2_pk = crypto.generate_key_pair()
+        user3_sk, user3_pk = crypto.generate_key_pair()
+
+        tx = Transaction.create([b.me], [([user_pk, [user2_pk, user3_pk]], 1)])
+        tx = tx.sign([b.me_private])
+        block = b.create_block([tx])
+        b.write_block(block)
+
+        assert b.get_owned_ids(user3_pk) == [TransactionLink(tx.id, 0)]
+
+    def test_get_owned_ids_decides_each_block_once(self, b, user_pk,
+                                                   monkeypatch):
+        from bigchaindb.backend import query
+        from bigchaindb.common.transaction import TransactionLink
+        from bigchaindb.models import Transaction
+
+        txs = [Transaction.create([b.me], [([user_pk], 1)], metadata={'i': i})
+               .sign([b.me_private]) for i in range(3)]
+        block = b.create_block(txs)
+        b.write_block(block)
+
+        get_votes_by_block_ids = query.get_votes_by_block_ids
+        calls = []
+
+        def counting_get_votes_by_block_ids(connection, block_ids):
+            calls.append(block_ids)
+            return get_votes_by_block_ids(connection, block_ids)
+
+        monkeypatch.setattr('bigchaindb.backend.query.get_votes_by_block_ids',
+                            counting_get_votes_by_block_ids)
+
+        owned = b.get_owned_ids(user_pk)
+
+        assert sorted(owned, key=lambda link: link.txid) == sorted(
+            (TransactionLink(tx.id, 0) for tx in txs),
+            key=lambda link: link.txid)
+        assert calls == [[block.id]]
+
     def test_get_spent_single_tx_single_output(self, b, user_sk, user_pk):
         from bigchaindb.common import crypto
         from bigchaindb.models import Transaction
@@ -1,6 +1,6 @@
 import random
 import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from multipipes import Pipe
 import pytest
@@ -27,6 +27,25 @@ def test_filter_by_assignee(b, signed_create_tx):
     assert block_maker.filter_tx(tx) is None
 
 
+def test_filter_batch_by_assignee(b, signed_create_tx):
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    block_maker = BlockPipeline()
+
+    mine = signed_create_tx.to_dict()
+    mine.update({'assignee': b.me, 'assignment_timestamp': 111})
+    others = signed_create_tx.to_dict()
+    others.update({'assignee': 'nobody', 'assignment_timestamp': 111})
+
+    assert block_maker.filter_txs([mine, others]) == [mine]
+    assert block_maker.filter_txs([others]) is None
+
+    # the transactions are not batched if `block.batch_size` is `0`
+    assert block_maker.filter_txs(dict(signed_create_tx.to_dict(),
+                                       assignee=b.me,
+                                       assignment_timestamp=111)) == [mine]
+
+
 @pytest.mark.bdb
 def test_validate_transaction(b, create_tx):
     from bigchaindb.pipelines.block import BlockPipeline
@@ -39,6 +58,19 @@ def test_validate_transaction(b, create_tx):
     assert block_maker.validate_tx(valid_tx.to_dict()) == valid_tx
 
 
+@pytest.mark.bdb
+def test_validate_batch_of_transactions(b, create_tx):
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    block_maker = BlockPipeline()
+
+    valid_tx = create_tx.sign([b.me_private])
+    assert block_maker.validate_txs(
+        [create_tx.to_dict(), valid_tx.to_dict()]) == [
+            (valid_tx, block_maker.tx_bytes(valid_tx))]
+    assert block_maker.validate_txs([create_tx.to_dict()]) is None
+
+
 def test_create_block(b, user_pk):
     from bigchaindb.models import Transaction
     from bigchaindb.pipelines.block import BlockPipeline
@@ -57,6 +89,160 @@ def test_create_block(b, user_pk):
     assert len(block_doc.transactions) == 100
 
 
+def test_create_block_max_transactions(b, user_pk, monkeypatch):
+    import bigchaindb
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    monkeypatch.setitem(bigchaindb.config['block'], 'max_transactions', 10)
+    block_maker = BlockPipeline()
+
+    blocks = []
+    for _ in range(25):
+        tx = Transaction.create([b.me], [([user_pk], 1)],
+                                metadata={'msg': random.random()})
+        blocks.append(block_maker.create(tx.sign([b.me_private])))
+    blocks.append(block_maker.create(None, timeout=True))
+
+    blocks = [block for block in blocks if block]
+    assert [len(block.transactions) for block in blocks] == [10, 10, 5]
+
+
+def test_create_blocks_from_batches(b, user_pk, monkeypatch):
+    import bigchaindb
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    monkeypatch.setitem(bigchaindb.config['block'], 'max_transactions', 10)
+    block_maker = BlockPipeline()
+
+    txs = [Transaction.create([b.me], [([user_pk], 1)],
+                              metadata={'msg': i}).sign([b.me_private])
+           for i in range(25)]
+
+    blocks = list(block_maker.create_blocks([(tx, 0) for tx in txs]))
+    assert [block.transactions for block in blocks] == [txs[:10], txs[10:20]]
+
+    blocks = list(block_maker.create_blocks(timeout=True))
+    assert [block.transactions for block in blocks] == [txs[20:]]
+    assert list(block_maker.create_blocks(timeout=True)) == []
+
+
+def test_create_block_max_bytes(b, user_pk, monkeypatch):
+    import bigchaindb
+    from bigchaindb.common.utils import serialize
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    txs = [Transaction.create([b.me], [([user_pk], 1)],
+                              metadata={'msg': i}).sign([b.me_private])
+           for i in range(5)]
+    tx_bytes = len(serialize(txs[0].to_dict()).encode())
+    monkeypatch.setitem(bigchaindb.config['block'], 'max_bytes',
+                        2 * tx_bytes)
+    block_maker = BlockPipeline()
+    assert block_maker.tx_bytes(txs[0]) == tx_bytes
+
+    blocks = [block_maker.create(tx) for tx in txs]
+    blocks.append(block_maker.create(None, timeout=True))
+
+    blocks = [block for block in blocks if block]
+    assert [len(block.transactions) for block in blocks] == [2, 2, 1]
+    assert [tx for block in blocks for tx in block.transactions] == txs
+
+
+def test_tx_bytes(b, user_pk, monkeypatch):
+    import bigchaindb
+    from bigchaindb.common.utils import serialize
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    tx = Transaction.create([b.me], [([user_pk], 1)],
+                            metadata={'msg': 'h\u00e9llo'}).sign([b.me_private])
+
+    monkeypatch.setitem(bigchaindb.config['block'], 'max_bytes', 0)
+    assert BlockPipeline().tx_bytes(tx) == 0
+
+    # the size is the number of bytes, not of characters
+    monkeypatch.setitem(bigchaindb.config['block'], 'max_bytes', 1000)
+    tx_bytes = BlockPipeline().tx_bytes(tx)
+    serialized = serialize(tx.to_dict())
+    assert tx_bytes == len(serialized.encode())
+    assert tx_bytes > len(serialized)
+
+
+def test_create_block_adapts_to_arrival_rate(b, user_pk, monkeypatch):
+    import bigchaindb
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    now = [0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+    monkeypatch.setitem(bigchaindb.config['block'], 'target_latency', 5)
+    block_maker = BlockPipeline()
+    block_maker.monitor = Mock()
+
+    def create(count, interval):
+        blocks = []
+        for _ in range(count):
+            now[0] += interval
+            tx = Transaction.create([b.me], [([user_pk], 1)],
+                                    metadata={'msg': random.random()})
+            blocks.append(block_maker.create(tx.sign([b.me_private])))
+        return [block for block in blocks if block]
+
+    # one transaction per second: the first block is cut by the target
+    # latency, and the next ones are sized to hold 5 seconds of transactions
+    blocks = create(6, 1)
+    assert [len(block.transactions) for block in blocks] == [6]
+    assert block_maker.block_size == 5
+    block_maker.monitor.gauge.assert_any_call('block.target_size', 5)
+
+    blocks = create(5, 1)
+    assert [len(block.transactions) for block in blocks] == [5]
+    assert block_maker.block_size == 5
+
+
+def test_create_block_drops_double_spend(b, user_pk, monkeypatch):
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+    transfer_txs = [
+        Transaction.transfer(tx.to_inputs(), [([user_pk], 1)],
+                             asset_id=tx.id,
+                             metadata={'msg': i}).sign([b.me_private])
+        for i in range(2)
+    ]
+
+    block_maker = BlockPipeline()
+    deleted = []
+    monkeypatch.setattr(block_maker.bigchain, 'delete_transaction',
+                        deleted.append)
+
+    blocks = list(block_maker.create_blocks(
+        [(tx, 0) for tx in transfer_txs], timeout=True))
+    assert [block.transactions for block in blocks] == [transfer_txs[:1]]
+    assert deleted == [transfer_txs[1].id]
+
+    # the output is not spent by the transactions of the next block anymore
+    blocks = list(block_maker.create_blocks([(transfer_txs[1], 0)],
+                                            timeout=True))
+    assert [block.transactions for block in blocks] == [transfer_txs[1:]]
+
+
+def test_committed_txids_capacity(monkeypatch):
+    import bigchaindb
+    from bigchaindb.pipelines.block import BlockPipeline
+
+    monkeypatch.setitem(bigchaindb.config['block'],
+                        'committed_txids_capacity', 1000)
+    block_maker = BlockPipeline()
+
+    # 1% of false positives, with about 9.6 bits per transaction id
+    assert block_maker.committed_txids.size == 9586
+
+
 @pytest.mark.bdb
 def test_write_block(b, user_pk):
     from bigchaindb.models import Block, Transaction
@@ -112,6 +298,69 @@ def test_duplicate_transaction(b, user_pk):
     assert status != b.TX_IN_BACKLOG
 
 
+@pytest.mark.bdb
+def test_validate_tx_does_not_look_up_uncommitted_tx(b, signed_create_tx,
+                                                     monkeypatch):
+    from bigchaindb.pipelines.block import BlockPipeline
+    block_maker = BlockPipeline()
+
+    def get_blocks_status_containing_tx(txid):
+        raise AssertionError('an uncommitted transaction was looked up')
+
+    monkeypatch.setattr(block_maker.bigchain,
+                        'get_blocks_status_containing_tx',
+                        get_blocks_status_containing_tx)
+
+    assert signed_create_tx.id not in block_maker.committed_txids
+    assert (block_maker.validate_tx(signed_create_tx.to_dict()) ==
+            signed_create_tx)
+
+
+@pytest.mark.bdb
+def test_duplicate_transaction_in_block_of_other_node(b, user_pk):
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines import block
+    block_maker = block.BlockPipeline()
+
+    tx = Transaction.create([b.me], [([user_pk], 1)],
+                            metadata={'msg': random.random()})
+    tx = tx.sign([b.me_private])
+
+    # the block is written by another node, and seen through the changefeed
+    block_doc = b.create_block([tx])
+    b.write_block(block_doc)
+    block_maker.add_committed_block(block_doc.to_dict())
+
+    b.write_transaction(tx)
+    assert block_maker.validate_tx(tx.to_dict()) is None
+
+    response, status = b.get_transaction(tx.id, include_status=True)
+    assert status != b.TX_IN_BACKLOG
+
+
+@pytest.mark.bdb
+def test_duplicate_transaction_in_block_not_seen_yet(b, user_pk):
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines import block
+    block_maker = block.BlockPipeline()
+
+    tx = Transaction.create([b.me], [([user_pk], 1)],
+                            metadata={'msg': random.random()})
+    tx = tx.sign([b.me_private])
+
+    # the block is written by another node, but not seen through the
+    # changefeed yet
+    b.write_block(b.create_block([tx]))
+    assert tx.id not in block_maker.committed_txids
+
+    b.write_transaction(tx)
+    assert block_maker.validate_txs([tx.to_dict()]) is None
+    assert tx.id in block_maker.committed_txids
+
+    response, status = b.get_transaction(tx.id, include_status=True)
+    assert status != b.TX_IN_BACKLOG
+
+
 @pytest.mark.bdb
 def test_delete_tx(b, user_pk):
     from bigchaindb.models import Transaction
@@ -141,16 +390,28 @@ def test_delete_tx(b, user_pk):
         assert status != b.TX_IN_BACKLOG
 
 
+@patch('bigchaindb.pipelines.block.create_committed_pipeline')
 @patch('bigchaindb.pipelines.block.create_pipeline')
 @pytest.mark.bdb
-def test_start(create_pipeline):
+def test_start(create_pipeline, create_committed_pipeline, b):
+    from bigchaindb.models import Transaction
     from bigchaindb.pipelines import block
 
+    tx = Transaction.create([b.me], [([b.me], 1)]).sign([b.me_private])
+    b.write_block(b.create_block([tx]))
+
     pipeline = block.start()
     assert create_pipeline.called
     assert create_pipeline.return_value.setup.called
     assert create_pipeline.return_value.start.called
     assert pipeline == create_pipeline.return_value
+    assert create_committed_pipeline.return_value.setup.called
+    assert create_committed_pipeline.return_value.start.called
+    assert pipeline.committed_pipeline == create_committed_pipeline.return_value
+
+    # the transactions of the existing blocks are known to be committed
+    block_pipeline = create_pipeline.call_args[0][0]
+    assert tx.id in block_pipeline.committed_txids
 
 
 @pytest.mark.bdb
@@ -167,6 +428,7 @@ def test_full_pipeline(b, user_pk):
     # include myself here, so that some tx are actually assigned to me
     b.nodes_except_me = [b.me, 'aaa', 'bbb', 'ccc']
     number_assigned_to_others = 0
+    batch = []
     for i in range(100):
         tx = Transaction.create([b.me], [([user_pk], 1)],
                                 metadata={'msg': random.random()})
@@ -179,9 +441,12 @@ def test_full_pipeline(b, user_pk):
         if tx['assignee'] != b.me:
             number_assigned_to_others += 1
         tx['assignment_timestamp'] = time.time()
-        inpipe.put(tx)
+        batch.append(tx)
+        if len(batch) == 10:
+            inpipe.put(batch)
+            batch = []
 
-    assert inpipe.qsize() == 100
+    assert inpipe.qsize() == 10
 
     pipeline.start()
 
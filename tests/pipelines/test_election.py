@@ -112,6 +112,45 @@ def test_check_for_quorum_valid(b, user_pk):
     assert e.check_for_quorum(votes[-1]) is None
 
 
+@pytest.mark.bdb
+def test_check_for_quorum_records_decision(b, user_pk):
+    from bigchaindb.backend import query
+    from bigchaindb.models import Transaction
+
+    e = election.Election()
+
+    tx1 = Transaction.create([b.me], [([user_pk], 1)])
+    test_block = b.create_block([tx1])
+
+    # simulate a federation with three voters
+    key_pairs = [crypto.generate_key_pair() for _ in range(3)]
+    test_federation = [
+        Bigchain(public_key=key_pair[1], private_key=key_pair[0])
+        for key_pair in key_pairs
+    ]
+
+    test_block.voters = [key_pair[1] for key_pair in key_pairs]
+    test_block = test_block.sign(b.me_private)
+    b.write_block(test_block)
+
+    # one vote is not enough to decide
+    votes = [member.vote(test_block.id, 'a' * 64, True)
+             for member in test_federation]
+    b.write_vote(votes[0])
+    e.check_for_quorum(votes[0])
+    assert list(query.get_block_decisions(b.connection, [test_block.id])) == []
+
+    for vote in votes[1:]:
+        b.write_vote(vote)
+        e.check_for_quorum(vote)
+
+    decisions = list(query.get_block_decisions(b.connection, [test_block.id]))
+    assert len(decisions) == 1
+    assert decisions[0]['status'] == b.BLOCK_VALID
+    # the decision is recorded when the quorum is reached
+    assert decisions[0]['tally'] == {'valid': 2, 'invalid': 0, 'voters': 3}
+
+
 @pytest.mark.bdb
 def test_check_requeue_transaction(b, user_pk):
     from bigchaindb.models import Transaction
@@ -63,14 +63,18 @@ def test_vote_creation_invalid(b):
 
 
 @pytest.mark.genesis
-def test_vote_ungroup_returns_a_set_of_results(b):
+def test_vote_validate_block_splits_it_into_chunks(b):
     from bigchaindb.pipelines import vote
 
     block = dummy_block(b)
     vote_obj = vote.Vote()
-    txs = list(vote_obj.ungroup(block.id, block.transactions))
+    vote_obj.num_chunks = 3
+    chunks = list(vote_obj.validate_block(block.to_dict()))
 
-    assert len(txs) == 10
+    assert [(block_id, num_chunks) for block_id, num_chunks, _ in chunks] == \
+        [(block.id, 3)] * 3
+    assert [tx for _, _, chunk in chunks for tx in chunk] == \
+        [tx.to_dict() for tx in block.transactions]
 
 
 @pytest.mark.genesis
@@ -81,20 +85,16 @@ def test_vote_validate_block(b):
     block = b.create_block([tx])
 
     vote_obj = vote.Vote()
-    validation = vote_obj.validate_block(block.to_dict())
-    assert validation[0] == block.id
-    for tx1, tx2 in zip(validation[1], block.transactions):
-        assert tx1 == tx2
+    validation = list(vote_obj.validate_block(block.to_dict()))
+    assert validation == [(block.id, 1, [tx.to_dict()])]
 
     block = b.create_block([tx])
     # NOTE: Setting a blocks signature to `None` invalidates it.
     block.signature = None
 
     vote_obj = vote.Vote()
-    validation = vote_obj.validate_block(block.to_dict())
-    assert validation[0] == block.id
-    for tx1, tx2 in zip(validation[1], [vote_obj.invalid_dummy_tx]):
-        assert tx1 == tx2
+    validation = list(vote_obj.validate_block(block.to_dict()))
+    assert validation == [(block.id, 1, None)]
 
 
 @pytest.mark.genesis
@@ -106,9 +106,8 @@ def test_validate_block_with_invalid_id(b):
     block['id'] = 'an invalid id'
 
     vote_obj = vote.Vote()
-    block_id, invalid_dummy_tx = vote_obj.validate_block(block)
-    assert block_id == block['id']
-    assert invalid_dummy_tx == [vote_obj.invalid_dummy_tx]
+    validation = list(vote_obj.validate_block(block))
+    assert validation == [(block['id'], 1, None)]
 
 
 @pytest.mark.genesis
@@ -120,43 +119,126 @@ def test_validate_block_with_invalid_signature(b):
     block['signature'] = 'an invalid signature'
 
     vote_obj = vote.Vote()
-    block_id, invalid_dummy_tx = vote_obj.validate_block(block)
-    assert block_id == block['id']
-    assert invalid_dummy_tx == [vote_obj.invalid_dummy_tx]
+    validation = list(vote_obj.validate_block(block))
+    assert validation == [(block['id'], 1, None)]
 
 
 @pytest.mark.genesis
-def test_vote_validate_transaction(b):
+@pytest.mark.parametrize('processes', [0, 2])
+def test_vote_validate_chunk(b, monkeypatch, processes):
     from bigchaindb.pipelines import vote
     from bigchaindb.models import Transaction
 
     tx = dummy_tx(b)
     vote_obj = vote.Vote()
-    validation = vote_obj.validate_tx(tx, 123, 1)
-    assert validation == (True, 123, 1)
+    monkeypatch.setattr(vote_obj.bigchain, 'block_validation_processes',
+                        processes)
+    validation = vote_obj.validate_chunk(123, 1, [tx.to_dict()])
+    assert validation == (123, 1, True, [])
 
-    # NOTE: Submit unsigned transaction to `validate_tx` yields `False`.
-    tx = Transaction.create([b.me], [([b.me], 1)])
-    validation = vote_obj.validate_tx(tx, 456, 10)
-    assert validation == (False, 456, 10)
+    # NOTE: Submit unsigned transaction to `validate_chunk` yields `False`.
+    unsigned_tx = Transaction.create([b.me], [([b.me], 1)])
+    validation = vote_obj.validate_chunk(
+        456, 10, [tx.to_dict(), unsigned_tx.to_dict()])
+    assert validation == (456, 10, False, [])
+
+    tx_dict = tx.to_dict()
+    tx_dict['id'] = 'an invalid tx id'
+    validation = vote_obj.validate_chunk(789, 2, [tx_dict])
+    assert validation == (789, 2, False, [])
+
+    assert vote_obj.validate_chunk(123, 1, None) == (123, 1, False, [])
+
+
+@pytest.mark.genesis
+def test_vote_validate_chunk_returns_the_spent_outputs(b, user_pk):
+    from bigchaindb.pipelines import vote
+    from bigchaindb.models import Transaction
+
+    tx = dummy_tx(b)
+    block = b.create_block([tx])
+    b.write_block(block)
+    b.write_vote(b.vote(block.id, b.get_last_voted_block().id, True))
+    transfer_tx = Transaction.transfer(tx.to_inputs(), [([user_pk], 1)],
+                                       asset_id=tx.id)
+    transfer_tx = transfer_tx.sign([b.me_private])
+
+    vote_obj = vote.Vote()
+    validation = vote_obj.validate_chunk(123, 1, [transfer_tx.to_dict()])
+    assert validation == (123, 1, True, [(tx.id, 0)])
+
+
+@pytest.mark.genesis
+def test_vote_on_written_block_with_double_spend(b, user_pk):
+    from bigchaindb.models import Transaction
+    from bigchaindb.pipelines import vote
+
+    tx = dummy_tx(b)
+    block = b.create_block([tx])
+    b.write_block(block)
+    b.write_vote(b.vote(block.id, b.get_last_voted_block().id, True))
+
+    transfer_txs = [
+        Transaction.transfer(tx.to_inputs(), [([user_pk], 1)],
+                             asset_id=tx.id,
+                             metadata={'msg': i}).sign([b.me_private])
+        for i in range(2)
+    ]
+    # the block spending the output twice is in the bigchain when it is
+    # voted on, so looking up the spent outputs finds both transactions
+    double_spend_block = b.create_block(transfer_txs)
+    b.write_block(double_spend_block)
+
+    vote_obj = vote.Vote()
+    votes = [vote_obj.vote(*vote_obj.validate_chunk(*chunk))
+             for chunk in vote_obj.validate_block(double_spend_block.to_dict())]
+
+    votes = [vote_doc for vote_doc in votes if vote_doc]
+    assert len(votes) == 1
+    assert votes[0]['vote']['voting_for_block'] == double_spend_block.id
+    assert votes[0]['vote']['is_block_valid'] is False
 
 
 @pytest.mark.genesis
-def test_vote_accumulates_transactions(b):
+def test_vote_accumulates_chunks(b):
     from bigchaindb.pipelines import vote
 
     vote_obj = vote.Vote()
 
-    for _ in range(10):
-        tx = dummy_tx(b)
+    assert vote_obj.vote('block1', 2, True, [('a', 0)]) is None
+    vote_doc = vote_obj.vote('block1', 2, True, [('b', 0)])
+    assert vote_doc['vote']['voting_for_block'] == 'block1'
+    assert vote_doc['vote']['is_block_valid'] is True
+    assert not vote_obj.counters
+
+
+@pytest.mark.genesis
+def test_vote_short_circuits_on_invalid_chunk(b):
+    from bigchaindb.pipelines import vote
+
+    vote_obj = vote.Vote()
 
-    tx = tx
-    validation = vote_obj.validate_tx(tx, 123, 1)
-    assert validation == (True, 123, 1)
+    assert vote_obj.vote('block1', 3, True, [('a', 0)]) is None
+    vote_doc = vote_obj.vote('block1', 3, False, [])
+    assert vote_doc['vote']['voting_for_block'] == 'block1'
+    assert vote_doc['vote']['is_block_valid'] is False
 
-    tx.inputs[0].fulfillment.signature = None
-    validation = vote_obj.validate_tx(tx, 456, 10)
-    assert validation == (False, 456, 10)
+    # the remaining chunk of the block is ignored
+    assert vote_obj.vote('block1', 3, True, [('b', 0)]) is None
+    assert not vote_obj.counters
+    assert not vote_obj.voted
+
+
+@pytest.mark.genesis
+def test_vote_on_double_spend_across_chunks(b):
+    from bigchaindb.pipelines import vote
+
+    vote_obj = vote.Vote()
+
+    assert vote_obj.vote('block1', 3, True, [('a', 0)]) is None
+    vote_doc = vote_obj.vote('block1', 3, True, [('b', 0), ('a', 0)])
+    assert vote_doc['vote']['is_block_valid'] is False
+    assert vote_obj.vote('block1', 3, True, [('c', 0)]) is None
 
 
 @pytest.mark.bdb
@@ -169,11 +251,11 @@ def test_valid_block_voting_sequential(b, genesis_block, monkeypatch):
     vote_obj = vote.Vote()
     block = dummy_block(b)
 
-    for tx, block_id, num_tx in vote_obj.ungroup(block.id, block.transactions):
-        last_vote = vote_obj.vote(*vote_obj.validate_tx(tx, block_id, num_tx))
+    for chunk in vote_obj.validate_block(block.to_dict()):
+        last_vote = vote_obj.vote(*vote_obj.validate_chunk(*chunk))
 
-    vote_obj.write_vote(last_vote)
-    vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block_id, b.me)
+    assert vote_obj.write_vote(last_vote) == [last_vote]
+    vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block.id, b.me)
     vote_doc = vote_rs.next()
 
     assert vote_doc['vote'] == {'voting_for_block': block.id,
@@ -188,6 +270,50 @@ def test_valid_block_voting_sequential(b, genesis_block, monkeypatch):
                                          vote_doc['signature']) is True
 
 
+@pytest.mark.genesis
+def test_vote_writes_votes_in_batches(b, monkeypatch):
+    from bigchaindb.backend import query
+    from bigchaindb.pipelines import vote
+
+    now = [0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+    vote_obj = vote.Vote()
+    vote_obj.batch_size = 3
+    vote_obj.batch_timeout = 5
+
+    blocks = [dummy_block(b) for _ in range(6)]
+    votes = []
+    for block in blocks:
+        votes.append(vote_obj.vote(
+            *vote_obj.validate_chunk(block.id, 1, block.to_dict()['block']
+                                     ['transactions'])))
+
+    def written():
+        return [
+            block.id for block in blocks
+            if list(query.get_votes_by_block_id_and_voter(
+                b.connection, block.id, b.me))
+        ]
+
+    # the votes are written once there are enough of them
+    assert vote_obj.write_vote(votes[0]) is None
+    assert vote_obj.write_vote(votes[1]) is None
+    assert written() == []
+    assert vote_obj.write_vote(votes[2]) == votes[:3]
+    assert written() == [block.id for block in blocks[:3]]
+
+    # or once the first of them has been waiting for long enough
+    assert vote_obj.write_vote(votes[3]) is None
+    now[0] += 5
+    assert vote_obj.write_vote(votes[4]) == votes[3:5]
+    assert written() == [block.id for block in blocks[:5]]
+
+    # or on timeout
+    assert vote_obj.write_vote(votes[5]) is None
+    assert vote_obj.write_vote(timeout=True) == votes[5:]
+    assert written() == [block.id for block in blocks]
+
+
 @pytest.mark.bdb
 def test_valid_block_voting_multiprocessing(b, genesis_block, monkeypatch):
     from bigchaindb.backend import query
@@ -205,7 +331,7 @@ def test_valid_block_voting_multiprocessing(b, genesis_block, monkeypatch):
 
     inpipe.put(block.to_dict())
     vote_pipeline.start()
-    vote_out = outpipe.get()
+    [vote_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block.id, b.me)
@@ -223,6 +349,35 @@ def test_valid_block_voting_multiprocessing(b, genesis_block, monkeypatch):
                                          vote_doc['signature']) is True
 
 
+@pytest.mark.bdb
+def test_vote_pipeline_writes_votes_without_outdata(b, genesis_block):
+    from bigchaindb.backend import query
+    from bigchaindb.pipelines import vote
+
+    inpipe = Pipe()
+
+    # the last node of the pipeline has no outqueue, like in `vote.start`
+    vote_pipeline = vote.create_pipeline()
+    vote_pipeline.setup(indata=inpipe)
+
+    block = dummy_block(b)
+
+    inpipe.put(block.to_dict())
+    vote_pipeline.start()
+    for _ in range(50):
+        votes = list(query.get_votes_by_block_id_and_voter(
+            b.connection, block.id, b.me))
+        if votes:
+            break
+        time.sleep(0.1)
+    vote_pipeline.terminate()
+
+    assert len(votes) == 1
+    assert votes[0]['vote']['voting_for_block'] == block.id
+    assert votes[0]['vote']['previous_block'] == genesis_block.id
+    assert votes[0]['vote']['is_block_valid'] is True
+
+
 @pytest.mark.bdb
 def test_valid_block_voting_with_create_transaction(b,
                                                     genesis_block,
@@ -248,7 +403,7 @@ def test_valid_block_voting_with_create_transaction(b,
 
     inpipe.put(block.to_dict())
     vote_pipeline.start()
-    vote_out = outpipe.get()
+    [vote_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block.id, b.me)
@@ -303,8 +458,8 @@ def test_valid_block_voting_with_transfer_transactions(monkeypatch,
     inpipe.put(block.to_dict())
     time.sleep(1)
     inpipe.put(block2.to_dict())
-    vote_out = outpipe.get()
-    vote2_out = outpipe.get()
+    [vote_out] = outpipe.get()
+    [vote2_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block.id, b.me)
@@ -356,7 +511,7 @@ def test_unsigned_tx_in_block_voting(monkeypatch, b, user_pk, genesis_block):
 
     inpipe.put(block.to_dict())
     vote_pipeline.start()
-    vote_out = outpipe.get()
+    [vote_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block.id, b.me)
@@ -396,7 +551,7 @@ def test_invalid_id_tx_in_block_voting(monkeypatch, b, user_pk, genesis_block):
 
     inpipe.put(block)
     vote_pipeline.start()
-    vote_out = outpipe.get()
+    [vote_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block['id'], b.me)
@@ -437,7 +592,7 @@ def test_invalid_content_in_tx_in_block_voting(monkeypatch, b,
 
     inpipe.put(block)
     vote_pipeline.start()
-    vote_out = outpipe.get()
+    [vote_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block['id'], b.me)
@@ -473,7 +628,7 @@ def test_invalid_block_voting(monkeypatch, b, user_pk, genesis_block):
 
     inpipe.put(block)
     vote_pipeline.start()
-    vote_out = outpipe.get()
+    [vote_out] = outpipe.get()
     vote_pipeline.terminate()
 
     vote_rs = query.get_votes_by_block_id_and_voter(b.connection, block['id'], b.me)
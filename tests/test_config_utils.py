@@ -88,6 +88,28 @@ def test_update_types():
     assert result == reference
 
 
+@pytest.mark.parametrize('value,expected', [
+    ('true', True), ('True', True), ('1', True), ('yes', True),
+    ('false', False), ('False', False), ('0', False), ('', False),
+])
+def test_update_types_parses_booleans(value, expected):
+    from bigchaindb import config_utils
+
+    result = config_utils.update_types({'a_bool': value}, {'a_bool': False})
+    assert result == {'a_bool': expected}
+
+
+def test_autoconfigure_transactions_table_from_env(monkeypatch):
+    monkeypatch.setattr('bigchaindb.config_utils.file_config', lambda *args, **kwargs: {})
+    monkeypatch.setattr('os.environ', {'BIGCHAINDB_DATABASE_TRANSACTIONS_TABLE': 'false'})
+
+    import bigchaindb
+    from bigchaindb import config_utils
+    config_utils.autoconfigure()
+
+    assert bigchaindb.config['database']['transactions_table'] is False
+
+
 def test_env_config(monkeypatch):
     monkeypatch.setattr('os.environ', {'BIGCHAINDB_DATABASE_HOST': 'test-host',
                                        'BIGCHAINDB_DATABASE_PORT': 'test-port'})
@@ -124,12 +146,14 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request):
             'bind': '1.2.3.4:56',
             'workers': None,
             'threads': None,
+            'max_batch_size': 1000,
         },
         'database': {
             'backend': request.config.getoption('--database-backend'),
             'host': 'test-host',
             'port': 4242,
             'name': 'test-dbname',
+            'transactions_table': False,
         },
         'keypair': {
             'public': None,
@@ -141,7 +165,21 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request):
             'port': 8125,
             'rate': 0.01,
         },
-        'backlog_reassign_delay': 5
+        'backlog_reassign_delay': 5,
+        'block_validation_processes': 0,
+        'block': {
+            'max_transactions': 1000,
+            'max_bytes': 10 * 2**20,
+            'timeout': 1.0,
+            'target_latency': 0.0,
+            'batch_size': 1,
+            'batch_timeout': 0.05,
+            'committed_txids_capacity': 10 ** 7,
+        },
+        'vote': {
+            'batch_size': 1,
+            'batch_timeout': 0.05,
+        },
     }
 
 
@@ -9,6 +9,7 @@ def config(request, monkeypatch):
             'host': 'host',
             'port': 28015,
             'name': 'bigchain',
+            'transactions_table': False,
         },
         'keypair': {
             'public': 'pubkey',
@@ -16,7 +17,8 @@ def config(request, monkeypatch):
         },
         'keyring': [],
         'CONFIGURED': True,
-        'backlog_reassign_delay': 30
+        'backlog_reassign_delay': 30,
+        'block_validation_processes': 0,
     }
 
     monkeypatch.setattr('bigchaindb.config', config)
@@ -33,6 +35,8 @@ def test_bigchain_class_default_initialization(config):
     assert bigchain.connection.host == config['database']['host']
     assert bigchain.connection.port == config['database']['port']
     assert bigchain.connection.dbname == config['database']['name']
+    assert (bigchain.connection.transactions_table ==
+            config['database']['transactions_table'])
     assert bigchain.me == config['keypair']['public']
     assert bigchain.me_private == config['keypair']['private']
     assert bigchain.nodes_except_me == config['keyring']
@@ -176,3 +176,56 @@ class TestBlockModel(object):
         monkeypatch.setattr(b, 'has_previous_vote', has_previous_vote)
         assert block == block.validate(b)
         assert has_previous_vote.called is True
+
+    def test_block_id_is_memoized(self, b, monkeypatch):
+        from bigchaindb.models import Block, Transaction
+
+        transactions = [Transaction.create([b.me], [([b.me], 1)])]
+        block = Block(transactions, b.me).sign(b.me_private)
+        block_id = block.id
+
+        monkeypatch.setattr('bigchaindb.models.serialize_and_hash',
+                            lambda data, buffer=None: None)
+        assert block.id == block_id
+        assert block.is_signature_valid()
+
+    def test_block_is_unsealed_when_body_changes(self, b):
+        from bigchaindb.models import Block, Transaction
+
+        transactions = [Transaction.create([b.me], [([b.me], 1)])]
+        block = Block(transactions, b.me, voters=['Qaaa'])
+        block_id = block.id
+
+        block.signature = 'a signature'
+        assert block.id == block_id
+
+        block.voters = ['Qaaa', 'Qbbb']
+        assert block.id != block_id
+
+    def test_block_deserialization_is_sealed(self, b, monkeypatch):
+        from bigchaindb.models import Block, Transaction
+
+        transactions = [Transaction.create([b.me], [([b.me], 1)])]
+        block = Block(transactions, b.me).sign(b.me_private)
+        block_dict = block.to_dict()
+
+        deserialized = Block.from_dict(block_dict)
+        monkeypatch.setattr('bigchaindb.models.serialize_and_hash',
+                            lambda data, buffer=None: None)
+        assert deserialized.id == block_dict['id']
+        assert deserialized.is_signature_valid()
+
+    def test_pickled_block_stays_sealed(self, b, monkeypatch):
+        import pickle
+        from bigchaindb.models import Block, Transaction
+
+        transactions = [Transaction.create([b.me], [([b.me], 1)])]
+        block = Block(transactions, b.me).sign(b.me_private)
+        block_id = block.id
+
+        unpickled = pickle.loads(pickle.dumps(block))
+        monkeypatch.setattr('bigchaindb.models.serialize_and_hash',
+                            lambda data, buffer=None: None)
+        assert not hasattr(unpickled, '__dict__')
+        assert unpickled.id == block_id
+        assert unpickled.is_signature_valid()
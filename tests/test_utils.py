@@ -137,3 +137,56 @@ def test_is_genesis_block_returns_true_if_genesis(b):
     from bigchaindb.utils import is_genesis_block
     genesis_block = b.prepare_genesis_block()
     assert is_genesis_block(genesis_block)
+
+
+def test_bounded_cache_drops_least_recently_used():
+    from bigchaindb.utils import BoundedCache
+
+    cache = BoundedCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+
+    cache['c'] = 3
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+    cache.clear()
+    assert cache.get('a', 'default') == 'default'
+
+
+def test_bloom_filter():
+    from bigchaindb.utils import BloomFilter
+
+    bloom_filter = BloomFilter(100)
+    for i in range(100):
+        bloom_filter.add('a{}'.format(i))
+
+    assert all('a{}'.format(i) in bloom_filter for i in range(100))
+    false_positives = sum('b{}'.format(i) in bloom_filter for i in range(1000))
+    assert false_positives < 50
+
+
+def test_bloom_filter_is_shared_with_child_processes():
+    import multiprocessing as mp
+    from bigchaindb.utils import BloomFilter
+
+    bloom_filter = BloomFilter(100)
+    process = mp.Process(target=bloom_filter.add, args=('a',))
+    process.start()
+    process.join()
+
+    assert 'a' in bloom_filter
+
+
+@patch('multiprocessing.Pool')
+def test_process_pool_is_reused(mock_pool, monkeypatch):
+    from bigchaindb.utils import process_pool
+    monkeypatch.setattr('bigchaindb.utils._process_pools', {})
+
+    pool = process_pool(3)
+
+    assert process_pool(3) is pool
+    mock_pool.assert_called_once_with(3)
@@ -32,6 +32,8 @@ def flush_rethink_db(connection, dbname):
         connection.run(r.db(dbname).table('bigchain').delete())
         connection.run(r.db(dbname).table('backlog').delete())
         connection.run(r.db(dbname).table('votes').delete())
+        connection.run(r.db(dbname).table('decisions').delete())
+        connection.run(r.db(dbname).table('transactions').delete())
     except r.ReqlOpFailedError:
         pass
 
@@ -41,6 +43,8 @@ def flush_mongo_db(connection, dbname):
     connection.conn[dbname].bigchain.delete_many({})
     connection.conn[dbname].backlog.delete_many({})
     connection.conn[dbname].votes.delete_many({})
+    connection.conn[dbname].decisions.delete_many({})
+    connection.conn[dbname].transactions.delete_many({})
 
 
 @singledispatch
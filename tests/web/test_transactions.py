@@ -158,3 +158,115 @@ def test_post_invalid_transfer_transaction_returns_400(b, client, user_pk, user_
 
     res = client.post(TX_ENDPOINT, data=json.dumps(transfer_tx.to_dict()))
     assert res.status_code == 400
+
+
+@pytest.mark.bdb
+def test_post_batch_of_transactions(b, client):
+    from bigchaindb import Bigchain
+    from bigchaindb.models import Transaction
+    user_priv, user_pub = crypto.generate_key_pair()
+
+    valid_tx = Transaction.create([user_pub], [([user_pub], 1)])
+    valid_tx = valid_tx.sign([user_priv])
+    unsigned_tx = Transaction.create([user_pub], [([user_pub], 1)],
+                                     metadata={'msg': 'unsigned'})
+    invalid_id_tx = valid_tx.to_dict()
+    invalid_id_tx['id'] = 'abcd' * 16
+
+    res = client.post(TX_ENDPOINT, data=json.dumps([
+        valid_tx.to_dict(), invalid_id_tx, unsigned_tx.to_dict()]))
+
+    assert res.status_code == 200
+    assert res.json[0] == {'status': 200, 'id': valid_tx.id}
+    assert res.json[1]['status'] == 400
+    assert res.json[1]['message'].startswith('Invalid transaction (InvalidHash)')
+    assert res.json[2]['status'] == 400
+    assert res.json[2]['message'].startswith('Invalid transaction')
+
+    _, status = b.get_transaction(valid_tx.id, include_status=True)
+    assert status == Bigchain.TX_IN_BACKLOG
+    assert b.get_transaction(unsigned_tx.id) is None
+
+
+@pytest.mark.bdb
+def test_post_ndjson_transactions(b, client):
+    from bigchaindb.models import Transaction
+    user_priv, user_pub = crypto.generate_key_pair()
+
+    txs = [Transaction.create([user_pub], [([user_pub], 1)],
+                              metadata={'msg': i}).sign([user_priv])
+           for i in range(2)]
+    body = '\n'.join([json.dumps(tx.to_dict()) for tx in txs] + ['{', ''])
+
+    res = client.post(TX_ENDPOINT, data=body,
+                      content_type='application/x-ndjson')
+
+    assert res.status_code == 200
+    assert res.json[:2] == [{'status': 200, 'id': tx.id} for tx in txs]
+    assert res.json[2]['status'] == 400
+    assert res.json[2]['message'].startswith('Invalid JSON')
+    assert len(res.json) == 3
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_post_batch_with_double_spend(b, client, user_pk, user_sk):
+    from bigchaindb.models import Transaction
+
+    input_valid = b.get_owned_ids(user_pk).pop()
+    create_tx = b.get_transaction(input_valid.txid)
+    transfer_txs = [
+        Transaction.transfer(create_tx.to_inputs(), [([user_pk], 1)],
+                             asset_id=create_tx.id,
+                             metadata={'msg': i}).sign([user_sk])
+        for i in range(2)
+    ]
+
+    res = client.post(TX_ENDPOINT, data=json.dumps(
+        [tx.to_dict() for tx in transfer_txs]))
+
+    assert res.json[0] == {'status': 200, 'id': transfer_txs[0].id}
+    assert res.json[1]['status'] == 400
+    assert res.json[1]['message'].startswith('Invalid transaction (DoubleSpend)')
+
+
+@pytest.mark.bdb
+@pytest.mark.usefixtures('inputs')
+def test_post_batch_spending_an_output_spent_twice(b, client, user_pk,
+                                                   user_sk):
+    from bigchaindb.models import Transaction
+    user_priv, user_pub = crypto.generate_key_pair()
+
+    input_valid = b.get_owned_ids(user_pk).pop()
+    create_tx = b.get_transaction(input_valid.txid)
+    transfer_txs = [
+        Transaction.transfer(create_tx.to_inputs(), [([user_pk], 1)],
+                             asset_id=create_tx.id,
+                             metadata={'msg': i}).sign([user_sk])
+        for i in range(3)
+    ]
+    # the output is already spent twice in undecided blocks
+    for tx in transfer_txs[:2]:
+        b.write_block(b.create_block([tx]))
+
+    valid_tx = Transaction.create([user_pub], [([user_pub], 1)])
+    valid_tx = valid_tx.sign([user_priv])
+
+    res = client.post(TX_ENDPOINT, data=json.dumps(
+        [valid_tx.to_dict(), transfer_txs[2].to_dict()]))
+
+    assert res.status_code == 200
+    assert res.json[0] == {'status': 200, 'id': valid_tx.id}
+    assert res.json[1]['status'] == 400
+    assert res.json[1]['message'].startswith('Invalid transaction (DoubleSpend)')
+
+
+def test_post_too_big_batch(client, monkeypatch):
+    import bigchaindb
+
+    monkeypatch.setitem(bigchaindb.config['server'], 'max_batch_size', 2)
+    res = client.post(TX_ENDPOINT, data=json.dumps([{}, {}, {}]))
+
+    assert res.status_code == 413
+    assert res.json['message'] == (
+        'Too many transactions: at most 2 can be pushed at once')